@@ -0,0 +1,99 @@
+import os
+
+import pygame
+from PIL import Image
+
+from src.masks import MaskRegistry
+
+
+def decode_gif(path):
+    """
+    Decode all frames of a GIF file into raw RGBA buffers.
+    Only PIL is used, so this is safe to call from a worker thread.
+    """
+    pil_img = Image.open(path)
+    frames = []
+    try:
+        while True:
+            frame = pil_img.copy().convert('RGBA')
+            frames.append((frame.tobytes(), frame.size, frame.mode))
+            pil_img.seek(pil_img.tell() + 1)
+    except EOFError:
+        pass
+    return frames
+
+
+def gif_surfaces(frames):
+    """
+    Turn frames from decode_gif into a list of display-format pygame.Surface.
+    """
+    return [
+        pygame.image.fromstring(data, size, mode).convert_alpha()
+        for data, size, mode in frames
+    ]
+
+
+class Animation:
+    """
+    The frames of one GIF in both facings. right holds the frames as
+    drawn, left the mirrored copies; both lists are built once and shared
+    by every sprite using the animation, so they must not be modified.
+    right_masks and left_masks hold the collision mask of each frame.
+    """
+
+    def __init__(self, frames: list):
+        self.right = frames
+        self.left = [pygame.transform.flip(f, True, False) for f in frames]
+        self.right_masks = [MaskRegistry.get(f) for f in self.right]
+        self.left_masks = [MaskRegistry.get(f) for f in self.left]
+
+    def __len__(self):
+        return len(self.right)
+
+    def frames(self, facing: int) -> list:
+        """ The frame set for facing: +1 for right, -1 for left """
+        return self.left if facing < 0 else self.right
+
+    def masks(self, facing: int) -> list:
+        """ Collision masks matching frames(facing), index for index """
+        return self.left_masks if facing < 0 else self.right_masks
+
+
+class AnimationLibrary:
+    """
+    Process-wide cache of Animations keyed by GIF path.
+    Each GIF is decoded once; later requests return the same object.
+    """
+
+    _animations = {}
+
+    @staticmethod
+    def _norm(path: str) -> str:
+        return os.path.normpath(path)
+
+    @classmethod
+    def get(cls, path: str) -> Animation:
+        key = cls._norm(path)
+        animation = cls._animations.get(key)
+        if animation is None:
+            animation = cls.add(key, decode_gif(key))
+        return animation
+
+    @classmethod
+    def has(cls, path: str) -> bool:
+        return cls._norm(path) in cls._animations
+
+    @classmethod
+    def add(cls, path: str, decoded: list) -> Animation:
+        """
+        Register frames already decoded with decode_gif (e.g. by a worker
+        thread). Must run on the main thread, as it converts surfaces.
+        """
+        key = cls._norm(path)
+        if key not in cls._animations:
+            cls._animations[key] = Animation(gif_surfaces(decoded))
+        return cls._animations[key]
+
+    @classmethod
+    def clear(cls):
+        cls._animations.clear()
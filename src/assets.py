@@ -0,0 +1,117 @@
+import os
+from collections import OrderedDict
+
+import pygame
+
+from src.config import ASSET_CACHE_BUDGET
+
+
+class AssetManager:
+    """
+    Process-wide cache of decoded, display-converted surfaces.
+
+    Each image file is decoded and converted once; flipped and scaled
+    variants are derived from that copy and cached too, so repeated
+    requests cost a dict lookup. Callers may keep the returned surfaces
+    but must not draw onto them, since they are shared.
+
+    Paths pinned with acquire() (and all of their variants) stay cached
+    until a matching release(). Unpinned entries are evicted least
+    recently used first once the cache grows past ASSET_CACHE_BUDGET bytes.
+    """
+
+    budget = ASSET_CACHE_BUDGET
+
+    _cache = OrderedDict()
+    _sizes = {}
+    _pins = {}
+    _bytes = 0
+
+    @staticmethod
+    def _norm(path: str) -> str:
+        return os.path.normpath(path)
+
+    @classmethod
+    def image(cls, path: str, alpha: bool = True) -> pygame.Surface:
+        """ The whole image, converted with per-pixel alpha unless alpha is False """
+        key = (cls._norm(path), "image", alpha)
+        surf = cls._lookup(key)
+        if surf is None:
+            surf = pygame.image.load(key[0])
+            surf = surf.convert_alpha() if alpha else surf.convert()
+            cls._store(key, surf)
+        return surf
+
+    @classmethod
+    def flipped(cls, path: str, flip_x: bool = True, flip_y: bool = False,
+                alpha: bool = True) -> pygame.Surface:
+        key = (cls._norm(path), "flip", flip_x, flip_y, alpha)
+        surf = cls._lookup(key)
+        if surf is None:
+            surf = pygame.transform.flip(cls.image(path, alpha), flip_x, flip_y)
+            cls._store(key, surf)
+        return surf
+
+    @classmethod
+    def scaled(cls, path: str, size, smooth: bool = True,
+               alpha: bool = True) -> pygame.Surface:
+        """ The image resized to size, with smoothscale unless smooth is False """
+        size = (int(size[0]), int(size[1]))
+        key = (cls._norm(path), "scale", size, smooth, alpha)
+        surf = cls._lookup(key)
+        if surf is None:
+            scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+            surf = scale(cls.image(path, alpha), size)
+            cls._store(key, surf)
+        return surf
+
+    @classmethod
+    def acquire(cls, *paths: str):
+        """ Pin paths so none of their cached variants are evicted """
+        for path in paths:
+            path = cls._norm(path)
+            cls._pins[path] = cls._pins.get(path, 0) + 1
+
+    @classmethod
+    def release(cls, *paths: str):
+        for path in paths:
+            path = cls._norm(path)
+            count = cls._pins.get(path, 0) - 1
+            if count > 0:
+                cls._pins[path] = count
+            else:
+                cls._pins.pop(path, None)
+        cls._evict()
+
+    @classmethod
+    def clear(cls):
+        cls._cache.clear()
+        cls._sizes.clear()
+        cls._bytes = 0
+
+    @classmethod
+    def _lookup(cls, key):
+        surf = cls._cache.get(key)
+        if surf is not None:
+            cls._cache.move_to_end(key)
+        return surf
+
+    @classmethod
+    def _store(cls, key, surf: pygame.Surface):
+        size = surf.get_bytesize() * surf.get_width() * surf.get_height()
+        cls._cache[key] = surf
+        cls._sizes[key] = size
+        cls._bytes += size
+        cls._evict()
+
+    @classmethod
+    def _evict(cls):
+        if cls._bytes <= cls.budget:
+            return
+        for key in list(cls._cache):
+            if cls._bytes <= cls.budget:
+                break
+            if key[0] in cls._pins:
+                continue
+            del cls._cache[key]
+            cls._bytes -= cls._sizes.pop(key)
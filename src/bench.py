@@ -0,0 +1,387 @@
+"""
+Headless micro-benchmarks of the per-tick hot paths, for catching
+performance regressions:
+
+    python -m src.bench --json bench.json
+    python -m src.bench --save-baseline benchmarks/baseline.json
+    python -m src.bench --baseline benchmarks/baseline.json
+
+Every benchmark runs in each scenario. Scenarios scale the tile count
+(the level is repeated side by side, or a map is generated with
+src.level.generator), enemies, boxes, flying arrows and arrows stuck in
+walls. Each round starts from a freshly built scene and times `number`
+calls; the median round is reported in microseconds per call.
+load_level_cold and load_level_warm instead time one full
+LevelManager.load_level of the scenario's source TMX (the shipped level
+or the generated map) per round, without and with its compiled
+artifact. With --baseline the results are compared to a stored run and
+the exit status is 1 if any benchmark got slower than the tolerance
+allows.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+from typing import NamedTuple
+
+import numpy as np
+import pygame
+
+from src.animation import AnimationLibrary
+from src.config import ARROW_POOL_SIZE, SIM_TICK_RATE
+from src.entities.box import Box
+from src.entities.enemy import Enemy
+from src.level import generator
+from src.level.level_compiler import artifact_path, load_level_data
+from src.level.level_manager import LevelManager
+from src.projectile import ProjectilePool
+
+
+class Scenario(NamedTuple):
+    name: str
+    level: int = 1          # shipped level the map is built from
+    repeat: int = 1         # copies of the level placed side by side
+    enemies: int = 0        # extra enemies on top of the level's own
+    boxes: int = 0
+    arrows: int = 0         # arrows in flight
+    stuck: int = 0          # arrows stuck in walls
+    size: tuple = None      # (width, height) in tiles: use a generated map,
+                            # with the enemies and boxes placed in it
+
+
+SCENARIOS = (
+    Scenario("level"),
+    Scenario("wide", repeat=8),
+    Scenario("crowd", repeat=4, enemies=40, boxes=40, arrows=60, stuck=60),
+    Scenario("arrows", arrows=300, stuck=300),
+    Scenario("huge", size=(1000, 100), enemies=300, boxes=100, arrows=100, stuck=100),
+)
+
+BENCHMARKS = (
+    "load_level_cold", "load_level_warm", "draw_map", "player_update", "box_update", "broadphase",
+    "enemy_update", "check_collisions", "arrow_collisions",
+)
+
+
+def widen(data: dict, repeat: int) -> dict:
+    """ Compiled level data with the map repeated repeat times along x """
+    if repeat == 1:
+        return data
+    width = data["map_width"] * data["tile_width"]
+
+    def shifted(entries, keys):
+        out = []
+        for k in range(repeat):
+            for entry in entries:
+                entry = dict(entry)
+                dx = k * width
+                entry["x"] += dx
+                for key in keys:
+                    entry[key] = (entry[key][0] + dx, entry[key][1])
+                out.append(entry)
+        return out
+
+    wide = dict(data)
+    wide["map_width"] = data["map_width"] * repeat
+    wide["layers"] = [
+        dict(layer, rows=np.tile(layer["rows"], (1, repeat)))
+        if layer["kind"] == "tile" else layer
+        for layer in data["layers"]
+    ]
+    for kind in ("ground_rects", "obstacle_rects"):
+        wide[kind] = np.concatenate([data[kind] + (k * width, 0, 0, 0) for k in range(repeat)])
+        wide[kind.replace("rects", "count")] = len(wide[kind])
+    wide["enemy_data"] = shifted(data["enemy_data"], ("start", "end"))
+    wide["item_data"] = shifted(data["item_data"], ())
+    return wide
+
+
+class Bench:
+    """ One PlayState scene built from a Scenario, rebuilt for every round """
+
+    def __init__(self, game, scenario: Scenario, seed: int = 0):
+        self.game = game
+        self.scenario = scenario
+        self.seed = seed
+        self.play = game.states["play"]
+        # Folder of the TMX the scenario's map comes from, for the load benchmarks
+        self._folder = None
+        if scenario.size:
+            self._folder = tempfile.TemporaryDirectory(prefix="bench_")
+            self.level_dir = self._folder.name
+            tree = generator.generate(*scenario.size, enemies=scenario.enemies,
+                                      boxes=scenario.boxes, gems=0, seed=seed)
+            generator.write(tree, generator.level_file(scenario.level, self.level_dir))
+            self._prepared = LevelManager(level_dir=self.level_dir).prepare_level(scenario.level)
+        else:
+            self.level_dir = LevelManager.LEVEL_DIR
+            self._prepared = LevelManager().prepare_level(scenario.level)
+            self._prepared["data"] = widen(self._prepared["data"], scenario.repeat)
+        self._camera_x = 0
+
+    def close(self):
+        """ Remove the generated map, if any """
+        if self._folder is not None:
+            self._folder.cleanup()
+            self._folder = None
+
+    def load(self, lm=None):
+        """ Install the scenario's map into lm (a fresh LevelManager by default) """
+        if lm is None:
+            lm = LevelManager(cache_size=0)
+        for _ in lm.install_steps(self.scenario.level, self._prepared):
+            pass
+        return lm
+
+    def build(self):
+        """ A fresh scene: the map, the level's entities and the scenario's extras """
+        play = self.play
+        lm = play.level_manager
+        lm.clear_cache()
+        self.load(lm)
+        play._init_level()
+        lm.update_streaming(play.camera.view)
+
+        s = self.scenario
+        rng = random.Random(self.seed)
+        extras = not s.size
+        if lm.streaming:
+            # Streamed maps only index the regions they have been asked about
+            lm.query_rect(pygame.Rect(0, 0, lm.width, lm.height), "ground")
+        grounds = lm.get_ground_rects() or [pygame.Rect(0, lm.height - 64, lm.width, 64)]
+        walls = lm.get_obstacle_rects()
+        gifs = sorted({ed["gif_path"] for ed in lm.get_enemy_data()})
+
+        for _ in range(s.enemies if gifs and extras else 0):
+            ground = rng.choice(grounds)
+            animation = AnimationLibrary.get(rng.choice(gifs))
+            height = animation.frames(1)[0].get_height()
+            x = rng.randint(ground.left, max(ground.left, ground.right - 64))
+            enemy = Enemy(animation, x, ground.top - height, ground.left, ground.right - 64, 80)
+            play.enemies.add(enemy)
+            play.all_sprites.add(enemy)
+
+        for _ in range(s.boxes if extras else 0):
+            ground = rng.choice(grounds)
+            box = Box(rng.randint(ground.left, max(ground.left, ground.right - 64)),
+                      ground.top - 64 - rng.randint(0, 128))
+            box.level_manager = lm
+            play.boxes.add(box)
+            play.all_sprites.add(box)
+
+        bullets = play.player.bullets
+        pool = play.player.arrow_pool = ProjectilePool(max(ARROW_POOL_SIZE, s.arrows + s.stuck))
+        for _ in range(s.arrows):
+            arrow = pool.acquire(0, 0, 1)
+            for _ in range(20):
+                arrow.reset(rng.randrange(lm.width), rng.randrange(lm.height),
+                            rng.choice((-1, 1)), world_width=lm.width)
+                if not (lm.query_rect(arrow.rect, "ground") or lm.query_rect(arrow.rect, "obstacle")):
+                    break
+            bullets.add(arrow)
+
+        for _ in range(s.stuck if walls else 0):
+            wall = rng.choice(walls)
+            direction = rng.choice((-1, 1))
+            arrow = pool.acquire(wall.centerx, rng.randint(wall.top, wall.bottom - 1),
+                                 direction, world_width=lm.width)
+            arrow.stick(wall)
+            bullets.add(arrow)
+
+        # Contacts for check_collisions, as a tick would have left them
+        play._build_broadphase(1.0 / SIM_TICK_RATE)
+
+    def setup(self, name: str):
+        """ What runs before each round of benchmark name """
+        if name == "load_level_cold":
+            return self._drop_artifact
+        if name == "load_level_warm":
+            return lambda: load_level_data(self._tmx_path())
+        return self.build
+
+    def call(self, name: str):
+        """ The callable timed for benchmark name """
+        play = self.play
+        dt = 1.0 / SIM_TICK_RATE
+        if name in ("load_level_cold", "load_level_warm"):
+            # The whole load of the source TMX: compiled cache (or parse), images, install
+            return lambda: LevelManager(level_dir=self.level_dir, cache_size=0).load_level(self.scenario.level)
+        if name == "draw_map":
+            return self._draw_map
+        if name == "player_update":
+            return lambda: play.player.update(dt)
+        if name == "box_update":
+            return lambda: play.boxes.update(dt)
+        if name == "broadphase":
+            return lambda: play._build_broadphase(dt)
+        if name == "enemy_update":
+            # Enemies read the tick's contacts, so finding them is part of it
+            def enemy_update():
+                play._build_broadphase(dt)
+                play.enemies.update(dt, play.broadphase)
+            return enemy_update
+        if name == "check_collisions":
+            return play._check_collisions
+        if name == "arrow_collisions":
+            # Arrows move a tick first, so every call sweeps real paths
+            def arrow_collisions():
+                play.player.arrow_pool.update(dt)
+                play._collide_arrows()
+            return arrow_collisions
+        raise KeyError(name)
+
+    def _tmx_path(self) -> str:
+        return LevelManager(level_dir=self.level_dir).level_path(self.scenario.level)
+
+    def _drop_artifact(self):
+        try:
+            os.remove(artifact_path(self._tmx_path()))
+        except FileNotFoundError:
+            pass
+
+    def _draw_map(self):
+        # Pan along the bottom of the map, one screen width per call
+        camera = self.play.camera
+        lm = self.play.level_manager
+        camera.view.topleft = (self._camera_x, max(0, lm.height - camera.view.height))
+        camera.render_view.topleft = camera.view.topleft
+        lm.update_streaming(camera.view)
+        lm.draw_map(self.game.screen, camera)
+        self._camera_x += camera.view.width
+        if self._camera_x >= lm.width:
+            self._camera_x = 0
+
+
+def time_call(fn, setup, number: int, rounds: int) -> dict:
+    """ Median and best of rounds, each number calls after setup(), in us per call """
+    per_call = []
+    for _ in range(rounds):
+        setup()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            elapsed = time.perf_counter() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        per_call.append(elapsed / number * 1e6)
+    return {
+        "us": statistics.median(per_call),
+        "min_us": min(per_call),
+        "number": number,
+        "rounds": rounds,
+    }
+
+
+def run(scenarios=SCENARIOS, benchmarks=BENCHMARKS, number: int = 60,
+        rounds: int = 5, game=None) -> dict:
+    """ {"scenario/benchmark": timing} for every pair, plus run metadata """
+    if game is None:
+        from src.engine import Game
+        game = Game(headless=True)
+    play = game.states["play"]
+    results = {}
+    for scenario in scenarios:
+        bench = Bench(game, scenario)
+        play.current_level_index = scenario.level
+        game.change_state("play")
+        for name in benchmarks:
+            # A load leaves the cache warm, so each round times a single one
+            calls = 1 if name.startswith("load_level") else number
+            results[f"{scenario.name}/{name}"] = time_call(bench.call(name), bench.setup(name), calls, rounds)
+        game.change_state("main_menu")
+        bench.close()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "number": number,
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta: float = 2.0) -> list:
+    """
+    (key, baseline us, current us, ratio, regressed) for keys in both runs.
+    A benchmark regressed if it is slower by more than tolerance and by
+    more than min_delta microseconds, so timer noise on sub-microsecond
+    calls does not count.
+    """
+    rows = []
+    for key, current in results["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        ratio = current["us"] / base["us"] if base["us"] else float("inf")
+        regressed = ratio > 1.0 + tolerance and current["us"] - base["us"] > min_delta
+        rows.append((key, base["us"], current["us"], ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths headless.")
+    parser.add_argument("--scenario", action="append", choices=[s.name for s in SCENARIOS],
+                        help="run only this scenario (repeatable)")
+    parser.add_argument("--bench", action="append", choices=BENCHMARKS,
+                        help="run only this benchmark (repeatable)")
+    parser.add_argument("--number", type=int, default=60, help="calls per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", metavar="FILE", help="write the results to FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a stored run")
+    parser.add_argument("--save-baseline", metavar="FILE",
+                        help="store this run as the baseline in FILE")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default: 25%%)")
+    args = parser.parse_args(argv)
+    paths = {
+        name: os.path.abspath(getattr(args, name)) if getattr(args, name) else None
+        for name in ("json", "baseline", "save_baseline")
+    }
+
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    benchmarks = [b for b in BENCHMARKS if not args.bench or b in args.bench]
+    results = run(scenarios, benchmarks, args.number, args.rounds)
+
+    for path in (paths["json"], paths["save_baseline"]):
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+
+    if not paths["baseline"]:
+        print(f"{'benchmark':<32}{'us/call':>12}{'best':>12}")
+        for key, r in results["results"].items():
+            print(f"{key:<32}{r['us']:12.1f}{r['min_us']:12.1f}")
+        return 0
+
+    with open(paths["baseline"]) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.tolerance)
+    print(f"{'benchmark':<32}{'baseline':>12}{'now':>12}{'ratio':>9}")
+    for key, base, now, ratio, regressed in rows:
+        flag = "  SLOWER" if regressed else ""
+        print(f"{key:<32}{base:12.1f}{now:12.1f}{ratio:9.2f}{flag}")
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        print(f"{regressions} benchmark(s) slower than the baseline by more "
+              f"than {args.tolerance:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+"""
+Candidate pairs between the moving sprites of a level, found once per tick.
+
+PlayState builds the broadphase before enemies move. Enemies then ask it
+for the player and the arrows they might touch, and the player asks for
+the enemies, gems and boxes it might touch. Each consumer still runs its
+own exact test (rects or masks) on the candidates.
+"""
+import math
+from itertools import chain, islice
+
+import numpy as np
+
+
+class Broadphase:
+    """
+    Sort-and-sweep over fattened sprite bounds.
+
+    build() takes each kind of sprite with a margin per sprite: how far it
+    can still move before the tick's collision tests are done. Bounds are
+    grown by that margin, sorted by their left edge and swept, and pairs
+    between kinds that interact are kept.
+
+    candidates() yields a sprite's partners of one kind in group order,
+    the order the exact tests used to visit them in. Margins must cover
+    how far partners move; a querying sprite that moved further than its
+    own margin since build() gets the rest of the group instead, so the
+    result always includes the real contacts.
+    """
+    # Below this many sprites a plain Python sweep beats numpy's call overhead
+    VECTORIZE_FROM = 96
+
+    def __init__(self, interactions):
+        """ interactions: (kind, kind) pairs whose sprites are tested against each other """
+        self.interactions = {frozenset(pair) for pair in interactions}
+        self._members = {}
+        self._index = {}
+        self._bounds = ((), (), (), ())
+        self._pairs = {}
+        self.pair_count = 0
+
+    def build(self, layers):
+        """
+        layers: (kind, sprites, margins) triples; margins is one number for
+        every sprite of the kind or a sequence with one per sprite
+        """
+        self._members = {}
+        self._pairs = {}
+        sprites, kinds, ranks, rects, margins = [], [], [], [], []
+        for kind, members, margin in layers:
+            members = list(members)
+            self._members[kind] = members
+            sprites += members
+            kinds += [kind] * len(members)
+            ranks += range(len(members))
+            rects += [sprite.rect for sprite in members]
+            margins += margin if isinstance(margin, (list, tuple)) else [margin] * len(members)
+        self._index = dict(zip(sprites, range(len(sprites))))
+
+        if len(sprites) < self.VECTORIZE_FROM:
+            pairs = self._sweep(kinds, rects, margins)
+        else:
+            pairs = self._sweep_vectorized(kinds, rects, margins)
+        self.pair_count = len(pairs)
+
+        for i, j in pairs:
+            self._add_pair(sprites[i], kinds[j], ranks[j], sprites[j])
+            self._add_pair(sprites[j], kinds[i], ranks[i], sprites[i])
+        for by_kind in self._pairs.values():
+            for partners in by_kind.values():
+                partners.sort(key=lambda entry: entry[0])
+
+    def candidates(self, sprite, kind: str):
+        """
+        Yield the sprites of kind that sprite may touch this tick, in group
+        order. sprite may move while they are visited: once it is outside
+        its bounds, the rest of the group is yielded instead.
+        """
+        members = self._members.get(kind, [])
+        last = -1
+        for rank, partner in self._pairs.get(sprite, {}).get(kind, ()):
+            if not self._within_bounds(sprite):
+                break
+            yield partner
+            last = rank
+        if not self._within_bounds(sprite):
+            yield from members[last + 1:]
+
+    def _within_bounds(self, sprite) -> bool:
+        i = self._index.get(sprite)
+        if i is None:
+            return False
+        left, top, right, bottom = self._bounds
+        rect = sprite.rect
+        return (left[i] <= rect.left and top[i] <= rect.top
+                and rect.right <= right[i] and rect.bottom <= bottom[i])
+
+    def _sweep(self, kinds, rects, margins) -> list:
+        """ (i, j) index pairs of interacting sprites whose bounds overlap """
+        grow = [math.ceil(margin) for margin in margins]
+        left = [rect.left - m for rect, m in zip(rects, grow)]
+        top = [rect.top - m for rect, m in zip(rects, grow)]
+        right = [rect.right + m for rect, m in zip(rects, grow)]
+        bottom = [rect.bottom + m for rect, m in zip(rects, grow)]
+        self._bounds = (left, top, right, bottom)
+
+        pairs = []
+        order = sorted(range(len(rects)), key=left.__getitem__)
+        for n, i in enumerate(order):
+            for j in islice(order, n + 1, None):
+                if left[j] >= right[i]:
+                    break
+                if (top[i] < bottom[j] and top[j] < bottom[i]
+                        and frozenset((kinds[i], kinds[j])) in self.interactions):
+                    pairs.append((i, j))
+        return pairs
+
+    def _sweep_vectorized(self, kinds, rects, margins) -> list:
+        """ _sweep() in one numpy pass, for crowded levels """
+        names = list(self._members)
+        interacts = np.array([[frozenset((a, b)) in self.interactions for b in names] for a in names])
+        kind_ids = np.repeat(np.arange(len(names)), [len(members) for members in self._members.values()])
+
+        rect = np.fromiter(chain.from_iterable(rects), dtype=np.int64, count=4 * len(rects)).reshape(-1, 4)
+        grow = np.ceil(margins).astype(np.int64)
+        left, top = rect[:, 0] - grow, rect[:, 1] - grow
+        right, bottom = rect[:, 0] + rect[:, 2] + grow, rect[:, 1] + rect[:, 3] + grow
+        self._bounds = (left.tolist(), top.tolist(), right.tolist(), bottom.tolist())
+
+        # Each overlapping pair is found once, from the box with the smaller left edge
+        order = np.argsort(left, kind="stable")
+        ends = np.searchsorted(left[order], right[order], side="left")
+        counts = np.maximum(ends - np.arange(len(order)) - 1, 0)
+        first = np.repeat(np.arange(len(order)), counts)
+        second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+        a, b = order[first], order[second]
+        keep = (
+            interacts[kind_ids[a], kind_ids[b]]
+            & (top[a] < bottom[b]) & (top[b] < bottom[a])
+            & (left[a] < right[b]) & (left[b] < right[a])
+        )
+        return list(zip(a[keep].tolist(), b[keep].tolist()))
+
+    def _add_pair(self, sprite, kind: str, rank: int, partner):
+        self._pairs.setdefault(sprite, {}).setdefault(kind, []).append((rank, partner))
@@ -1 +1,44 @@
-TOTAL_LEVELS = 5
\ No newline at end of file
+TOTAL_LEVELS = 5
+
+# Parsed levels LevelManager keeps in memory for instant retries
+LEVEL_CACHE_SIZE = 3
+
+# Levels with at least this many tiles stream collision and chunk surfaces
+# by region instead of building everything at load time. Their start cost
+# then depends on the level's objects and merged rects, not its tile count.
+STREAMING_MIN_TILES = 64 * 64
+STREAMING_MEMORY_BUDGET = 192 * 1024 * 1024
+
+# Decoded surfaces AssetManager keeps before evicting unpinned entries
+ASSET_CACHE_BUDGET = 128 * 1024 * 1024
+
+# Simulation runs at a fixed rate regardless of the render frame rate
+SIM_TICK_RATE = 60
+RENDER_FPS = 60
+# Most ticks simulated per rendered frame; after a longer stall the game
+# slows down instead of spiralling to catch up.
+MAX_SIM_STEPS = 5
+
+# Development aid: record the input of every level attempt to
+# RECORDINGS_DIR/level_XX.inp, overwriting the previous attempt, so it can
+# be replayed headless (python -m src.headless --replay <file>).
+RECORD_INPUT = False
+RECORDINGS_DIR = "recordings"
+
+# Per-system frame timings (Game.profiler); F3 toggles the on-screen table.
+# The window is how many recent samples each average and percentile covers.
+PROFILER_ENABLED = True
+PROFILER_WINDOW = 240
+
+# Per-frame telemetry log (src/telemetry.py); set a path such as
+# "telemetry/session.csv" to record every frame of a play session.
+TELEMETRY_LOG = None
+# Frames buffered before a batch is handed to the writer thread
+TELEMETRY_FLUSH_ROWS = 240
+
+# Default output folder of the level generator (python -m src.level.generator)
+GENERATED_LEVELS_DIR = "assets/generated"
+
+# Arrows each player can have in the air or stuck at once; when all are
+# in use the longest-stuck one is reused for the next shot.
+ARROW_POOL_SIZE = 32
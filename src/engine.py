@@ -1,7 +1,13 @@
+import os
+import time
+
 import pygame
 
-from src.config import TOTAL_LEVELS
+from src.config import TOTAL_LEVELS, SIM_TICK_RATE, RENDER_FPS, MAX_SIM_STEPS, TELEMETRY_LOG
+from src.input import KEYBOARD
 from src.persistence import SaveManager
+from src.profiler import Profiler
+from src.telemetry import TelemetryRecorder
 from src.state.main_menu_state import MainMenuState
 from src.state.play_state import PlayState
 from src.state.instructions_state import InstructionsState
@@ -13,11 +19,22 @@ from src.state.pause_state import PauseState
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless: bool = False):
+        """
+        headless: use SDL's dummy video and audio drivers, so no window is
+            opened; the screen is still a valid offscreen surface
+        """
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
         self.screen = pygame.display.set_mode((1536, 1024))
         pygame.display.set_caption("Cloudbreak Rebellion")
         self.clock = pygame.time.Clock()
+        self.input = KEYBOARD
+        self.profiler = Profiler()
+        self.telemetry = None
 
         self.states = {
             "main_menu": MainMenuState(self),
@@ -31,9 +48,18 @@ class Game:
         }
 
         self.state_stack = []
+        self._state_names = {state: name for name, state in self.states.items()}
+
+        # Fraction of a simulation tick the rendered frame is ahead of the
+        # last update; states interpolate positions by it when drawing.
+        self.render_alpha = 1.0
 
     def push_state(self, state_name):
+        if self.telemetry is not None:
+            self.telemetry.transition(f'push_state("{state_name}")')
+        self._push(state_name)
 
+    def _push(self, state_name):
         state = self.states[state_name]
         self.state_stack.append(state)
         state.enter()
@@ -43,32 +69,135 @@ class Game:
         if not self.state_stack:
             return
         state = self.state_stack.pop()
+        if self.telemetry is not None:
+            self.telemetry.transition(f'pop_state("{self._state_names[state]}")')
         state.exit()
 
     def change_state(self, state_name):
+        if self.telemetry is not None:
+            self.telemetry.transition(f'change_state("{state_name}")')
         while self.state_stack:
             old = self.state_stack.pop()
             old.exit()
-        self.push_state(state_name)
+        self._push(state_name)
+
+    def start_telemetry(self, path: str):
+        """ Log every following frame to path (see src.telemetry) """
+        self.stop_telemetry()
+        self.telemetry = TelemetryRecorder(path, self.profiler)
+
+    def stop_telemetry(self):
+        if self.telemetry is not None:
+            self.telemetry.close()
+            self.telemetry = None
+
+    def _record_frame(self, frame_seconds: float, work_seconds: float):
+        top = self.state_stack[-1] if self.state_stack else None
+        play = self.states["play"]
+        counts = play.entity_counts() if play in self.state_stack else {}
+        self.telemetry.frame(self._state_names.get(top, ""), frame_seconds, work_seconds, counts)
 
     def run(self):
+        if TELEMETRY_LOG:
+            self.start_telemetry(TELEMETRY_LOG)
         self.push_state("main_menu")
 
         running = True
+        step = 1.0 / SIM_TICK_RATE
+        accumulator = 0.0
+        frame_end = time.perf_counter()
 
         while running:
-            dt = self.clock.tick(60) / 1000.0
+            accumulator += self.clock.tick(RENDER_FPS) / 1000.0
+            frame_start = time.perf_counter()
+            profiler = self.profiler
+
+            with profiler.section("input"):
+                for event in self.input.events():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        profiler.toggle_overlay()
+                    else:
+                        self.state_stack[-1].handle_event(event)
+
+            steps = 0
+            while accumulator >= step and steps < MAX_SIM_STEPS:
+                with profiler.section("update"):
+                    self.state_stack[-1].update(step)
+                accumulator -= step
+                steps += 1
+            if steps == MAX_SIM_STEPS:
+                accumulator = min(accumulator, step)
+
+            self.render_alpha = accumulator / step
+            with profiler.section("draw"):
+                self.screen.fill((0, 0, 0))
+                self.state_stack[-1].draw(self.screen)
+            if profiler.overlay_visible:
+                profiler.draw_overlay(self.screen)
+            with profiler.section("flip"):
+                pygame.display.flip()
+
+            if self.telemetry is not None:
+                now = time.perf_counter()
+                self._record_frame(now - frame_end, now - frame_start)
+                frame_end = now
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                else:
-                    self.state_stack[-1].handle_event(event)
-
-            self.state_stack[-1].update(dt)
-            self.screen.fill((0, 0, 0))
-            self.state_stack[-1].draw(self.screen)
-            pygame.display.flip()
+        while self.state_stack:
+            self.pop_state()
+        self.stop_telemetry()
 
         SaveManager.reset_progress(num_levels=TOTAL_LEVELS)
-        pygame.quit()
\ No newline at end of file
+        pygame.quit()
+
+    def run_headless(self, level_index: int, ticks: int, controls,
+                     render: bool = False) -> dict:
+        """
+        Step PlayState for ticks fixed simulation steps as fast as possible,
+        with input from controls (e.g. a ScriptedInput). Nothing is shown:
+        with render set each tick is drawn to the offscreen screen surface,
+        otherwise draw is skipped. Whenever the level ends (game over or
+        clear) it is restarted, so long soak runs stay in play.
+
+        Returns counters and the wall time taken; per-system timings are
+        in self.profiler.stats(). With telemetry started every tick is
+        logged as one frame.
+        """
+        self.input = controls
+        step = 1.0 / SIM_TICK_RATE
+        play = self.states["play"]
+        stats = {"ticks": 0, "deaths": 0, "clears": 0}
+
+        play.current_level_index = level_index
+        self.change_state("play")
+        start = time.perf_counter()
+        for tick in range(ticks):
+            tick_start = time.perf_counter()
+            with self.profiler.section("input"):
+                controls.begin_tick(tick)
+                for event in controls.events():
+                    self.state_stack[-1].handle_event(event)
+            with self.profiler.section("update"):
+                self.state_stack[-1].update(step)
+
+            if self.state_stack[-1] is not play:
+                if self.state_stack[-1] is self.states["game_over"]:
+                    stats["deaths"] += 1
+                elif self.state_stack[-1] is self.states["game_clear"]:
+                    stats["clears"] += 1
+                play.current_level_index = level_index
+                self.change_state("play")
+            elif render:
+                with self.profiler.section("draw"):
+                    self.screen.fill((0, 0, 0))
+                    play.draw(self.screen)
+            stats["ticks"] += 1
+            if self.telemetry is not None:
+                elapsed = time.perf_counter() - tick_start
+                self._record_frame(elapsed, elapsed)
+
+        stats["wall_seconds"] = time.perf_counter() - start
+        stats["sim_seconds"] = stats["ticks"] * step
+        self.input = KEYBOARD
+        return stats
\ No newline at end of file
@@ -1,16 +1,21 @@
 import os
 import pygame
 
+from src.assets import AssetManager
+from src.masks import MaskRegistry
+
 
 class Box(pygame.sprite.Sprite):
 
+    IMAGE_PATH = os.path.join("assets", "images", "items", "box.png")
+
     def __init__(self, x: int, y: int, **properties):
 
         super().__init__()
 
-        img_path = os.path.join("assets", "images", "items", "box.png")
-        self.image = pygame.image.load(img_path).convert_alpha()
+        self.image = AssetManager.image(self.IMAGE_PATH)
         self.rect = self.image.get_rect(topleft=(x, y))
+        self.mask = MaskRegistry.get(self.image)
 
         self.properties = properties
 
@@ -34,7 +39,7 @@ class Box(pygame.sprite.Sprite):
 
         for _ in range(steps):
             self.rect.x += step_dx
-            for obs in self.level_manager.get_obstacle_rects():
+            for obs in self.level_manager.query_rect(self.rect, "obstacle"):
                 if self.rect.colliderect(obs):
                     if step_dx > 0:
                         self.rect.right = obs.left
@@ -64,7 +69,9 @@ class Box(pygame.sprite.Sprite):
             self.rect.y += step_dy
 
             if step_dy > 0:
-                for ground in self.level_manager.get_ground_rects():
+                sweep = pygame.Rect(self.rect.left, prev_bottom,
+                                    self.rect.width, self.rect.bottom - prev_bottom + 1)
+                for ground in self.level_manager.query_rect(sweep, "ground"):
                     if (prev_bottom <= ground.top <= self.rect.bottom and
                             self.rect.right > ground.left and
                             self.rect.left < ground.right):
@@ -78,6 +85,11 @@ class Box(pygame.sprite.Sprite):
 
             prev_bottom = self.rect.bottom
 
+    def max_step(self, dt: float) -> float:
+        """ Farthest the next update can move the box, in pixels """
+        fall = self.vel_y if self.on_ground else self.vel_y + self.gravity * dt
+        return (abs(self.vel_x) + min(max(fall, 0.0), self.max_fall_speed)) * dt + 1
+
     def apply(self, player):
 
         for key, value in self.properties.items():
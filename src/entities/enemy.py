@@ -1,23 +1,6 @@
 import pygame
-from PIL import Image
 
-
-def load_gif_frames(path):
-    """
-    Load all frames from a GIF file into a list of pygame.Surface.
-    """
-    pil_img = Image.open(path)
-    frames = []
-    try:
-        while True:
-            frame = pil_img.copy().convert('RGBA')
-            data = frame.tobytes()
-            surf = pygame.image.fromstring(data, frame.size, frame.mode)
-            frames.append(surf)
-            pil_img.seek(pil_img.tell() + 1)
-    except EOFError:
-        pass
-    return frames
+from src.animation import Animation
 
 
 class Enemy(pygame.sprite.Sprite):
@@ -26,37 +9,39 @@ class Enemy(pygame.sprite.Sprite):
     and dies when hit by a projectile.
     """
 
-    def __init__(self, frames, spawn_x, spawn_y, patrol_start, patrol_end, speed):
+    def __init__(self, animation: Animation, spawn_x, spawn_y, patrol_start, patrol_end, speed):
         """
-        frames: list of pygame.Surface animation frames
+        animation: shared Animation from the AnimationLibrary
         spawn_x, spawn_y: initial position (pixels)
         patrol_start, patrol_end: x‐coordinates (pixels) defining patrol range
         speed: movement speed in pixels per second
         """
         super().__init__()
 
-        self.frames = frames
-        self.frame_index = 0
-        self.anim_timer = 0.0
-        self.anim_speed = 0.1
-        self.image = self.frames[self.frame_index]
-        self.rect = self.image.get_rect(topleft=(spawn_x, spawn_y))
-
         self.start_x = min(patrol_start, patrol_end)
         self.end_x = max(patrol_start, patrol_end)
         self.speed = speed
 
         self.direction = 1 if spawn_x <= self.end_x else -1
 
+        self.animation = animation
+        self.frames = animation.frames(self.direction)
+        self.masks = animation.masks(self.direction)
+        self.frame_index = 0
+        self.anim_timer = 0.0
+        self.anim_speed = 0.1
+        self.image = self.frames[self.frame_index]
+        self.mask = self.masks[self.frame_index]
+        self.rect = self.image.get_rect(topleft=(spawn_x, spawn_y))
+
         self.alive = True
 
         self.contact_damage = 1
 
-    def update(self, dt, player_group, arrow_group):
+    def update(self, dt, contacts):
         """
         dt: time elapsed since last frame (seconds)
-        player_group: pygame.sprite.GroupSingle or Group for collision
-        arrow_group: pygame.sprite.Group of projectiles
+        contacts: the tick's Broadphase, with "player" and "arrow" candidates
         """
         if not self.alive:
             return
@@ -64,15 +49,17 @@ class Enemy(pygame.sprite.Sprite):
         self.rect.x += self.direction * self.speed * dt
         if self.rect.x <= self.start_x or self.rect.x >= self.end_x:
             self.direction *= -1
-
-            self.frames = [pygame.transform.flip(f, True, False) for f in self.frames]
+            self.frames = self.animation.frames(self.direction)
+            self.masks = self.animation.masks(self.direction)
 
         self.anim_timer += dt
         if self.anim_timer >= self.anim_speed:
             self.anim_timer -= self.anim_speed
             self.frame_index = (self.frame_index + 1) % len(self.frames)
             self.image = self.frames[self.frame_index]
-        hits = pygame.sprite.spritecollide(self, player_group, False)
+            self.mask = self.masks[self.frame_index]
+        hits = [player for player in contacts.candidates(self, "player")
+                if self.rect.colliderect(player.rect)]
         for player in hits:
             damage = getattr(self, "contact_damage", 1)
             if hasattr(player, "take_damage"):
@@ -80,9 +67,17 @@ class Enemy(pygame.sprite.Sprite):
             else:
                 player.health -= damage
 
-        if pygame.sprite.spritecollide(self, arrow_group, True):
+        arrows = [a for a in contacts.candidates(self, "arrow")
+                  if a.alive() and self.rect.colliderect(a.rect)]
+        for arrow in arrows:
+            arrow.kill()
+        if arrows:
             self.die()
 
+    def max_step(self, dt: float) -> float:
+        """ Farthest the next update can move the enemy, in pixels """
+        return self.speed * dt + 1
+
     def die(self):
         """
         Handle death: remove from all groups. You can also add a death animation here.
@@ -1,6 +1,9 @@
 import os
 import pygame
 
+from src.assets import AssetManager
+from src.masks import MaskRegistry
+
 
 class Gem(pygame.sprite.Sprite):
     """
@@ -8,17 +11,14 @@ class Gem(pygame.sprite.Sprite):
     and its value is applied to the player's gem_count.
     """
 
+    IMAGE_PATH = os.path.join("assets", "images", "items", "gem.png")
+
     def __init__(self, x: int, y: int, value: int = 1, image_path: str = None):
         super().__init__()
 
-        if image_path:
-            img = pygame.image.load(image_path).convert_alpha()
-        else:
-            default_path = os.path.join("assets", "images", "items", "gem.png")
-            img = pygame.image.load(default_path).convert_alpha()
-
-        self.image = img
+        self.image = AssetManager.image(image_path or self.IMAGE_PATH)
         self.rect = self.image.get_rect(center=(x, y))
+        self.mask = MaskRegistry.get(self.image)
 
         self.value = value
 
@@ -1,23 +1,29 @@
 import os
 import pygame
-from src.projectile import Projectile
-from src.entities.enemy import load_gif_frames
+from src.projectile import ProjectilePool
+from src.animation import AnimationLibrary
+from src.input import KEYBOARD
 
 
 class Player(pygame.sprite.Sprite):
 
-    def __init__(self, x: int, y: int):
+    def __init__(self, x: int, y: int, controls=None):
+        """
+        controls: input source for held keys; defaults to the keyboard
+        """
         super().__init__()
 
+        self.controls = controls or KEYBOARD
+
         gif_path = os.path.join("assets", "images", "player", "player.gif")
-        self.frames = load_gif_frames(gif_path)
+        self.animation = AnimationLibrary.get(gif_path)
         self.frame_index = 0
         self.anim_timer = 0.0
         self.anim_speed = 0.1
 
-        self.image = self.frames[self.frame_index]
+        self.image = self.animation.right[self.frame_index]
         self.rect = self.image.get_rect(topleft=(x, y))
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.animation.right_masks[self.frame_index]
 
         self.vel_x = 0
         self.vel_y = 0
@@ -34,6 +40,7 @@ class Player(pygame.sprite.Sprite):
         self.gem_count = 0
 
         self.bullets = pygame.sprite.Group()
+        self.arrow_pool = ProjectilePool()
         self.shoot_cooldown = 0.5
         self.shoot_timer = 0.0
 
@@ -69,8 +76,10 @@ class Player(pygame.sprite.Sprite):
 
     def shoot(self):
         px, py = self.rect.center
-        arrow = Projectile(px, py + 10, self.facing)
-        self.bullets.add(arrow)
+        world_width = self.level_manager.width if self.level_manager else None
+        arrow = self.arrow_pool.acquire(px, py + 10, self.facing, world_width=world_width)
+        if arrow is not None:
+            self.bullets.add(arrow)
 
     def take_damage(self, amount: int, source_x: float):
         if self.is_invincible:
@@ -112,7 +121,7 @@ class Player(pygame.sprite.Sprite):
             self.knock_back_timer -= dt
             self.vel_x = self.knock_back_dir * self.knock_back_speed
         else:
-            keys = pygame.key.get_pressed()
+            keys = self.controls.pressed()
             self.vel_x = 0
             if keys[pygame.K_a] or keys[pygame.K_LEFT]:
                 self.vel_x = -self.speed
@@ -128,7 +137,7 @@ class Player(pygame.sprite.Sprite):
             step_dx = dx // steps
             for _ in range(steps):
                 self.rect.x += step_dx
-                for obs in self.level_manager.get_obstacle_rects():
+                for obs in self.level_manager.query_rect(self.rect, "obstacle"):
                     if self.rect.colliderect(obs):
                         if step_dx > 0:
                             self.rect.right = obs.left
@@ -154,7 +163,9 @@ class Player(pygame.sprite.Sprite):
                 self.rect.y += step_dy
 
                 if step_dy > 0:
-                    for ground in self.level_manager.get_ground_rects():
+                    sweep = pygame.Rect(self.rect.left, prev_bottom,
+                                        self.rect.width, self.rect.bottom - prev_bottom + 1)
+                    for ground in self.level_manager.query_rect(sweep, "ground"):
                         if (prev_bottom <= ground.top <= self.rect.bottom and
                                 self.rect.right > ground.left and
                                 self.rect.left < ground.right):
@@ -164,7 +175,9 @@ class Player(pygame.sprite.Sprite):
                             break
 
                 elif step_dy < 0:
-                    for obs in self.level_manager.get_obstacle_rects():
+                    sweep = pygame.Rect(self.rect.left, self.rect.top - 1,
+                                        self.rect.width, prev_bottom - self.rect.top + 1)
+                    for obs in self.level_manager.query_rect(sweep, "obstacle"):
                         if (self.rect.top <= obs.bottom <= prev_bottom and
                                 self.rect.right > obs.left and
                                 self.rect.left < obs.right):
@@ -190,17 +203,13 @@ class Player(pygame.sprite.Sprite):
         if self.shoot_timer > 0:
             self.shoot_timer -= dt
 
-        for arrow in list(self.bullets):
-            arrow.update(dt)
-
         if self.vel_x != 0:
             self.anim_timer += dt
             if self.anim_timer >= self.anim_speed:
                 self.anim_timer -= self.anim_speed
-                self.frame_index = (self.frame_index + 1) % len(self.frames)
+                self.frame_index = (self.frame_index + 1) % len(self.animation)
         else:
             self.frame_index = 0
 
-        frame = self.frames[self.frame_index]
-        self.image = pygame.transform.flip(frame, True, False) if self.facing < 0 else frame
-        self.mask = pygame.mask.from_surface(self.image)
+        self.image = self.animation.frames(self.facing)[self.frame_index]
+        self.mask = self.animation.masks(self.facing)[self.frame_index]
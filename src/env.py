@@ -0,0 +1,382 @@
+"""
+Gym-style environments over the headless game, for training and
+evaluating agents:
+
+    env = GameEnv(level=1)
+    obs = env.reset()
+    obs, reward, done, info = env.step(action)
+
+VectorEnv runs many GameEnvs in a pool of worker processes and returns
+batched NumPy arrays.
+"""
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+from src.config import SIM_TICK_RATE
+from src.input import HeldKeys
+from src.observation import PixelObserver
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Discrete actions as (held keys, keys pressed at the start of the step)
+ACTIONS = (
+    ((), ()),                                   # idle
+    ((pygame.K_a,), ()),                        # left
+    ((pygame.K_d,), ()),                        # right
+    ((), (pygame.K_w,)),                        # jump
+    ((pygame.K_a,), (pygame.K_w,)),             # left + jump
+    ((pygame.K_d,), (pygame.K_w,)),             # right + jump
+    ((), (pygame.K_SPACE,)),                    # shoot
+    ((pygame.K_a,), (pygame.K_SPACE,)),         # left + shoot
+    ((pygame.K_d,), (pygame.K_SPACE,)),         # right + shoot
+)
+
+# Nearest enemies described in each observation
+MAX_ENEMIES = 4
+# Player x, y, vel_x, vel_y, on_ground, facing, health, gems, exit dx, dy,
+# enemies left, then dx, dy, present for each of the nearest enemies
+OBS_SIZE = 11 + 3 * MAX_ENEMIES
+
+
+class _ActionInput:
+    """ Held keys set directly by the environment """
+
+    def __init__(self):
+        self.held = HeldKeys()
+
+    def begin_tick(self, tick: int):
+        pass
+
+    def events(self) -> list:
+        return []
+
+    def pressed(self):
+        return self.held
+
+
+class GameEnv:
+    """
+    One headless game stepped by discrete actions (indices into ACTIONS).
+
+    Each step holds the action for frame_skip simulation ticks. An episode
+    ends when the player dies, the level is cleared or max_seconds of game
+    time pass (info["truncated"]). Rewards come from the change in gems,
+    hearts and enemies over the step, plus a bonus or penalty at the end.
+
+    Observations are the OBS_SIZE state vector, or with pixels set the
+    rendered frame from a PixelObserver (pixel_size, grayscale and
+    frame_stack are passed on to it).
+
+    The game loads assets relative to the repository root, so creating an
+    environment changes the working directory to it.
+    """
+
+    REWARD_GEM = 1.0
+    REWARD_KILL = 1.0
+    REWARD_HIT = -1.0
+    REWARD_CLEAR = 10.0
+    REWARD_DEATH = -5.0
+
+    def __init__(self, level: int = 1, frame_skip: int = 4, max_seconds: float = 120.0,
+                 pixels: bool = False, pixel_size=None, grayscale: bool = False,
+                 frame_stack: int = 1):
+        os.chdir(ROOT)
+        from src.engine import Game
+
+        self.level = level
+        self.frame_skip = frame_skip
+        self.max_ticks = int(max_seconds * SIM_TICK_RATE)
+        self.game = Game(headless=True)
+        self.play = self.game.states["play"]
+        self._controls = _ActionInput()
+        self.game.input = self._controls
+        self._dt = 1.0 / SIM_TICK_RATE
+        self._held = [HeldKeys(held) for held, _ in ACTIONS]
+        self._taps = [
+            [pygame.event.Event(pygame.KEYDOWN, key=key) for key in taps]
+            for _, taps in ACTIONS
+        ]
+        self.ticks = 0
+
+        self.observer = None
+        if pixels:
+            self.observer = PixelObserver(
+                self.game.screen, pixel_size, grayscale=grayscale, stack=frame_stack
+            )
+
+    @property
+    def num_actions(self) -> int:
+        return len(ACTIONS)
+
+    @property
+    def observation_shape(self) -> tuple:
+        return self.observer.shape if self.observer else (OBS_SIZE,)
+
+    @property
+    def observation_dtype(self):
+        return np.dtype(np.uint8 if self.observer else np.float32)
+
+    def reset(self, level: int = None) -> np.ndarray:
+        self._restart(level)
+        return self.observation()
+
+    def step(self, action: int):
+        reward, done, info = self._advance(action)
+        return self.observation(), reward, done, info
+
+    def _restart(self, level: int = None):
+        if level is not None:
+            self.level = level
+        self.play.current_level_index = self.level
+        self.game.change_state("play")
+        self.ticks = 0
+        if self.observer:
+            self.observer.reset()
+
+    def _advance(self, action: int):
+        """ step() without producing the observation """
+        play = self.play
+        player = play.player
+        gems, health, enemies = player.gem_count, player.health, len(play.enemies)
+        enemies_left = enemies
+
+        self._controls.held = self._held[action]
+        for event in self._taps[action]:
+            play.handle_event(event)
+
+        outcome = None
+        for _ in range(self.frame_skip):
+            play.update(self._dt)
+            self.ticks += 1
+            top = self.game.state_stack[-1]
+            if top is not play:
+                outcome = "clear" if top is self.game.states["game_clear"] else "death"
+                break
+            # Leaving play empties the enemy group, so only count kills
+            # from ticks that stayed in it
+            enemies_left = len(play.enemies)
+
+        reward = (
+            (player.gem_count - gems) * self.REWARD_GEM
+            + (enemies - enemies_left) * self.REWARD_KILL
+            + max(health - player.health, 0) * self.REWARD_HIT
+        )
+        if outcome == "clear":
+            reward += self.REWARD_CLEAR
+        elif outcome == "death":
+            reward += self.REWARD_DEATH
+
+        truncated = outcome is None and self.ticks >= self.max_ticks
+        info = {
+            "level": self.level,
+            "ticks": self.ticks,
+            "outcome": outcome,
+            "truncated": truncated,
+        }
+        return reward, outcome is not None or truncated, info
+
+    def observation(self, out: np.ndarray = None) -> np.ndarray:
+        """ The current observation, written into out if given """
+        if self.observer:
+            self.game.screen.fill((0, 0, 0))
+            self.play.draw(self.game.screen)
+            return self.observer.capture(out)
+
+        obs = np.zeros(OBS_SIZE, np.float32) if out is None else out
+        play = self.play
+        p = play.player
+        lm = play.level_manager
+        view_w, view_h = play.camera.view.size
+        px, py = p.rect.center
+
+        obs[0] = px / max(lm.width, 1)
+        obs[1] = py / max(lm.height, 1)
+        obs[2] = p.vel_x / p.speed
+        obs[3] = p.vel_y / p.max_fall_speed
+        obs[4] = p.on_ground
+        obs[5] = p.facing
+        obs[6] = p.health / p.max_health
+        obs[7] = p.gem_count / play.total_gems if play.total_gems else 0.0
+        exit_pt = lm.get_exit_point()
+        if exit_pt:
+            obs[8] = (exit_pt[0] - px) / view_w
+            obs[9] = (exit_pt[1] - py) / view_h
+        else:
+            obs[8] = obs[9] = 0.0
+        obs[10] = len(play.enemies) / MAX_ENEMIES
+
+        nearest = sorted(
+            ((e.rect.centerx - px, e.rect.centery - py) for e in play.enemies),
+            key=lambda d: d[0] * d[0] + d[1] * d[1],
+        )[:MAX_ENEMIES]
+        base = 11
+        for dx, dy in nearest:
+            obs[base] = dx / view_w
+            obs[base + 1] = dy / view_h
+            obs[base + 2] = 1.0
+            base += 3
+        obs[base:] = 0.0
+        return obs
+
+
+def _worker(conn, count: int, env_kwargs: dict):
+    """ Own count environments in this process and serve batched commands """
+    shm = obs = None
+    try:
+        envs = [GameEnv(**env_kwargs) for _ in range(count)]
+        conn.send(("ok", (envs[0].observation_shape, envs[0].observation_dtype.str)))
+
+        # Observations are written straight into the parent's shared block
+        name, offset = conn.recv()
+        shm = shared_memory.SharedMemory(name=name)
+        obs = np.ndarray(
+            (count,) + envs[0].observation_shape, envs[0].observation_dtype,
+            buffer=shm.buf, offset=offset,
+        )
+        rewards = np.zeros(count, np.float32)
+        dones = np.zeros(count, bool)
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "reset":
+                for i, env in enumerate(envs):
+                    env._restart(None if arg is None else int(arg[i]))
+                    env.observation(obs[i])
+                conn.send(("ok", None))
+            elif cmd == "step":
+                infos = []
+                for i, env in enumerate(envs):
+                    rewards[i], dones[i], info = env._advance(int(arg[i]))
+                    if dones[i]:
+                        info["final_observation"] = env.observation().copy()
+                        env._restart()
+                    env.observation(obs[i])
+                    infos.append(info)
+                conn.send(("ok", (rewards, dones, infos)))
+            elif cmd == "close":
+                break
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        del obs
+        if shm is not None:
+            shm.close()
+        conn.close()
+
+
+class VectorEnv:
+    """
+    num_envs independent GameEnvs stepped in a pool of worker processes.
+
+    Environments are split evenly over the workers; each worker steps its
+    share serially and answers with one batch, so the pipe is crossed once
+    per worker per step rather than once per environment. Observations
+    never go through the pipe: workers render them straight into one
+    shared-memory array, and reset()/step() return that array itself.
+    It is overwritten by the next step, so copy it to keep it.
+
+    Episodes that end are reset automatically; the last observation of the
+    finished episode is in info["final_observation"].
+    """
+
+    def __init__(self, num_envs: int, processes: int = None, **env_kwargs):
+        """
+        processes: worker count; defaults to one per CPU, at most num_envs
+        env_kwargs: passed to every GameEnv (level, frame_skip, max_seconds,
+            pixels, pixel_size, grayscale, frame_stack)
+        """
+        self.num_envs = num_envs
+        processes = max(1, min(num_envs, processes or os.cpu_count() or 1))
+
+        # spawn, so workers never inherit an initialised SDL from the parent
+        ctx = mp.get_context("spawn")
+        self._conns = []
+        self._procs = []
+        self._slices = []
+        self._shm = None
+        self.observations = None
+        start = 0
+        for i in range(processes):
+            count = num_envs // processes + (i < num_envs % processes)
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker, args=(child, count, env_kwargs), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+            self._slices.append(slice(start, start + count))
+            start += count
+
+        shape, dtype = self._gather()[0]
+        dtype = np.dtype(dtype)
+        frame_bytes = int(np.prod(shape)) * dtype.itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, num_envs * frame_bytes))
+        self.observations = np.ndarray((num_envs,) + tuple(shape), dtype, buffer=self._shm.buf)
+        for conn, part in zip(self._conns, self._slices):
+            conn.send((self._shm.name, part.start * frame_bytes))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _gather(self):
+        results = []
+        for conn in self._conns:
+            status, payload = conn.recv()
+            if status == "error":
+                self.close()
+                raise RuntimeError(f"Environment worker failed:\n{payload}")
+            results.append(payload)
+        return results
+
+    def reset(self, levels=None) -> np.ndarray:
+        """ Reset every environment; levels optionally gives one level per env """
+        for conn, part in zip(self._conns, self._slices):
+            conn.send(("reset", None if levels is None else list(levels[part])))
+        self._gather()
+        return self.observations
+
+    def step(self, actions):
+        """
+        actions: one action index per environment
+        Returns (observations, rewards, dones, infos) for all environments.
+        """
+        actions = np.asarray(actions)
+        for conn, part in zip(self._conns, self._slices):
+            conn.send(("step", actions[part]))
+
+        results = self._gather()
+        rewards = np.concatenate([r[0] for r in results])
+        dones = np.concatenate([r[1] for r in results])
+        infos = [info for r in results for info in r[2]]
+        return self.observations, rewards, dones, infos
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        self._conns = []
+        self._procs = []
+
+        if self._shm is not None:
+            self.observations = None
+            try:
+                self._shm.close()
+            except BufferError:
+                pass  # the caller still holds a view; the mapping goes with it
+            self._shm.unlink()
+            self._shm = None
@@ -0,0 +1,72 @@
+"""
+Run a level without a window or frame cap, e.g. for perf runs and soak
+tests on CI:
+
+    python -m src.headless --level 2 --minutes 10
+    python -m src.headless --replay recordings/level_02.inp
+    python -m src.headless --level 3 --render --telemetry telemetry/level_03.csv
+    python -m src.headless --level-dir assets/generated --minutes 10
+"""
+import argparse
+import os
+
+from src.config import SIM_TICK_RATE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a level headless.")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--minutes", type=float, default=None,
+                        help="simulated time to run (default: 1, or the "
+                             "length of the replayed recording)")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="input recording to play back instead of the demo script")
+    parser.add_argument("--render", action="store_true",
+                        help="draw every tick to an offscreen surface")
+    parser.add_argument("--level-dir", metavar="DIR",
+                        help="load level_XX.tmx from DIR, e.g. generated maps")
+    parser.add_argument("--telemetry", metavar="FILE",
+                        help="log per-tick timings to FILE (see src.telemetry)")
+    args = parser.parse_args(argv)
+    replay = os.path.abspath(args.replay) if args.replay else None
+    telemetry = os.path.abspath(args.telemetry) if args.telemetry else None
+    level_dir = os.path.abspath(args.level_dir) if args.level_dir else None
+
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+    from src.engine import Game
+    from src.input import ReplayInput, ScriptedInput
+
+    if replay:
+        controls = ReplayInput.load(replay)
+        if controls.tick_rate != SIM_TICK_RATE:
+            print(f"{args.replay} was recorded at {controls.tick_rate} ticks/s, "
+                  f"the game now runs at {SIM_TICK_RATE}; it cannot be replayed.")
+            return 1
+        level = controls.level_index
+        ticks = len(controls)
+    else:
+        controls = ScriptedInput.demo()
+        level = args.level
+        ticks = 60 * SIM_TICK_RATE
+    if args.minutes is not None:
+        ticks = int(args.minutes * 60 * SIM_TICK_RATE)
+
+    game = Game(headless=True)
+    if level_dir:
+        game.states["play"].level_manager.set_level_dir(level_dir)
+    if telemetry:
+        game.start_telemetry(telemetry)
+    stats = game.run_headless(level, ticks, controls, render=args.render)
+    game.stop_telemetry()
+
+    print(
+        f"level {level}: {stats['sim_seconds']:.0f}s simulated in "
+        f"{stats['wall_seconds']:.2f}s "
+        f"({stats['sim_seconds'] / stats['wall_seconds']:.0f}x), "
+        f"{stats['deaths']} deaths, {stats['clears']} clears"
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+import os
+import struct
+from typing import NamedTuple
+
+import pygame
+
+# Keys that drive the simulation; recordings store them as bit indices.
+# Esc is left out on purpose: pausing does not advance PlayState.
+TRACKED_KEYS = (
+    pygame.K_a, pygame.K_LEFT, pygame.K_d, pygame.K_RIGHT,
+    pygame.K_w, pygame.K_UP, pygame.K_SPACE,
+)
+_KEY_BITS = {key: bit for bit, key in enumerate(TRACKED_KEYS)}
+
+RECORDING_MAGIC = b"CBIN"
+RECORDING_VERSION = 1
+# magic, version, level index, tick rate, frame count
+RECORDING_HEADER = struct.Struct("<4sHHHI")
+
+
+class InputFrame(NamedTuple):
+    """ Input for one simulation tick """
+    held: int       # bitmask over TRACKED_KEYS
+    taps: tuple     # TRACKED_KEYS indices pressed (KEYDOWN) before the tick
+
+
+def _held_keys(mask: int) -> "HeldKeys":
+    return HeldKeys(key for bit, key in enumerate(TRACKED_KEYS) if mask >> bit & 1)
+
+
+class HeldKeys:
+    """ Set of held keys indexable like pygame.key.get_pressed() """
+
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class KeyboardInput:
+    """ Live input: events from the SDL queue, held keys from the keyboard """
+
+    def begin_tick(self, tick: int):
+        pass
+
+    def events(self) -> list:
+        return pygame.event.get()
+
+    def pressed(self):
+        return pygame.key.get_pressed()
+
+
+class ScriptedInput:
+    """
+    Deterministic input for headless runs.
+
+    spans: (start_tick, end_tick, keys) entries; keys are held for
+        start_tick <= tick < end_tick
+    taps: (interval, key) entries; key is pressed every interval ticks
+    period: when set, the spans repeat every period ticks
+    """
+
+    def __init__(self, spans=(), taps=(), period: int = None):
+        self.spans = [(start, end, frozenset(keys)) for start, end, keys in spans]
+        self.taps = list(taps)
+        self.period = period
+        self.tick = 0
+        self._held = HeldKeys()
+        self._events = []
+
+    @classmethod
+    def demo(cls):
+        """ Walk right and left across the level, jumping and shooting """
+        return cls(
+            spans=[(0, 120, {pygame.K_d}), (120, 200, {pygame.K_a})],
+            taps=[(23, pygame.K_w), (17, pygame.K_SPACE)],
+            period=200,
+        )
+
+    def begin_tick(self, tick: int):
+        self.tick = tick
+        t = tick % self.period if self.period else tick
+        held = set()
+        for start, end, keys in self.spans:
+            if start <= t < end:
+                held |= keys
+        self._held = HeldKeys(held)
+        self._events = [
+            pygame.event.Event(pygame.KEYDOWN, key=key)
+            for interval, key in self.taps
+            if tick % interval == 0
+        ]
+
+    def events(self) -> list:
+        return self._events
+
+    def pressed(self):
+        return self._held
+
+
+class InputRecorder:
+    """
+    Records the input PlayState consumes, one InputFrame per tick.
+
+    Key presses are passed in with feed() as PlayState handles them and
+    are attached to the next tick. Held keys are sampled from source once
+    per tick in begin_tick(), and pressed() returns that sample, so the
+    game sees exactly what is written to the recording.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.frames = []
+        self._pending = []
+        self._held = HeldKeys()
+
+    def feed(self, event):
+        if event.type == pygame.KEYDOWN and event.key in _KEY_BITS:
+            self._pending.append(_KEY_BITS[event.key])
+
+    def begin_tick(self, tick: int):
+        keys = self.source.pressed()
+        mask = 0
+        for bit, key in enumerate(TRACKED_KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+        self.frames.append(InputFrame(mask, tuple(self._pending)))
+        self._pending.clear()
+        self._held = _held_keys(mask)
+
+    def events(self) -> list:
+        return self.source.events()
+
+    def pressed(self):
+        return self._held
+
+    def save(self, path: str, level_index: int, tick_rate: int):
+        """ Write the frames: a header, then held mask, tap count and taps per tick """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        body = bytearray()
+        for frame in self.frames:
+            body.append(frame.held)
+            body.append(len(frame.taps))
+            body.extend(frame.taps)
+        with open(path, "wb") as f:
+            f.write(RECORDING_HEADER.pack(
+                RECORDING_MAGIC, RECORDING_VERSION, level_index, tick_rate, len(self.frames)
+            ))
+            f.write(body)
+
+
+class ReplayInput:
+    """
+    Plays back a recording written by InputRecorder, tick for tick.
+    After the last frame no keys are held or pressed.
+    """
+
+    def __init__(self, frames: list, level_index: int = 1, tick_rate: int = None):
+        self.frames = frames
+        self.level_index = level_index
+        self.tick_rate = tick_rate
+        self._held = HeldKeys()
+        self._events = []
+
+    def __len__(self):
+        return len(self.frames)
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayInput":
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, level_index, tick_rate, count = RECORDING_HEADER.unpack_from(data)
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError(f"{path} is not an input recording this version can read")
+
+        frames = []
+        pos = RECORDING_HEADER.size
+        for _ in range(count):
+            held, n = data[pos], data[pos + 1]
+            frames.append(InputFrame(held, tuple(data[pos + 2:pos + 2 + n])))
+            pos += 2 + n
+        return cls(frames, level_index, tick_rate)
+
+    def begin_tick(self, tick: int):
+        if tick < len(self.frames):
+            frame = self.frames[tick]
+        else:
+            frame = InputFrame(0, ())
+        self._held = _held_keys(frame.held)
+        self._events = [
+            pygame.event.Event(pygame.KEYDOWN, key=TRACKED_KEYS[bit])
+            for bit in frame.taps
+        ]
+
+    def events(self) -> list:
+        return self._events
+
+    def pressed(self):
+        return self._held
+
+
+KEYBOARD = KeyboardInput()
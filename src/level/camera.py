@@ -0,0 +1,61 @@
+import pygame
+
+
+class Camera:
+    """
+    A screen-sized view into the level that follows a target.
+    Converts world coordinates to screen coordinates and never scrolls
+    past the level edges, so maps no larger than the screen stay fixed.
+
+    view is the simulated position. Drawing goes through render_view,
+    which interpolate() places between the view at the start of the last
+    simulation step and the current one.
+    """
+
+    def __init__(self, view_width: int, view_height: int):
+        self.view = pygame.Rect(0, 0, view_width, view_height)
+        self.bounds = pygame.Rect(0, 0, view_width, view_height)
+        self.render_view = self.view.copy()
+        self._prev_pos = self.view.topleft
+
+    def set_bounds(self, width: int, height: int):
+        self.bounds = pygame.Rect(0, 0, width, height)
+        self._clamp()
+
+    def follow(self, target: pygame.Rect):
+        """ Centre the view on target, clamped to the level bounds """
+        self.view.center = target.center
+        self._clamp()
+
+    def _clamp(self):
+        if self.bounds.width <= self.view.width:
+            self.view.x = self.bounds.x
+        else:
+            self.view.x = max(self.bounds.left, min(self.view.x, self.bounds.right - self.view.width))
+
+        if self.bounds.height <= self.view.height:
+            self.view.y = self.bounds.y
+        else:
+            self.view.y = max(self.bounds.top, min(self.view.y, self.bounds.bottom - self.view.height))
+
+    def begin_step(self):
+        """ Remember the current view as the start of a simulation step """
+        self._prev_pos = self.view.topleft
+
+    def snap(self):
+        """ Drop interpolation, e.g. after jumping to a new level """
+        self._prev_pos = self.view.topleft
+        self.render_view.topleft = self.view.topleft
+
+    def interpolate(self, alpha: float):
+        px, py = self._prev_pos
+        self.render_view.topleft = (
+            round(px + (self.view.x - px) * alpha),
+            round(py + (self.view.y - py) * alpha),
+        )
+
+    def apply_pos(self, x, y):
+        return (x - self.render_view.x, y - self.render_view.y)
+
+    def apply(self, rect: pygame.Rect) -> pygame.Rect:
+        return rect.move(-self.render_view.x, -self.render_view.y)
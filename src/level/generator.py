@@ -0,0 +1,230 @@
+"""
+Writes synthetic Tiled TMX levels for benchmarks and soak runs, at sizes
+and entity counts far beyond the shipped 24x16 maps:
+
+    python -m src.level.generator --index 1 --width 1000 --height 100 \\
+        --enemies 300 --boxes 100 --gems 200
+
+The map uses the shipped tilesets and object conventions, so LevelManager
+loads it like any other level: a floor, walls at both ends, tiers of
+one-way platforms every PLATFORM_SPACING rows, short pillars on the floor,
+enemies patrolling platforms between waypoints, boxes and gems. Output is
+fully determined by the parameters and the seed, and the level can be
+written to any folder: it points at the shipped tilesets and background.
+"""
+
+import argparse
+import os
+import random
+import xml.etree.ElementTree as ET
+
+from src.config import GENERATED_LEVELS_DIR
+
+ASSETS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "assets"))
+TILE_SIZE = 64
+
+# (first gid, tileset) as in the shipped levels
+TILESETS = ((1, "items.tsx"), (226, "enemy.tsx"), (326, "tile-1.tsx"))
+GROUND_GIDS = (331, 332)
+GROUND_CAP_GID = 333
+WALL_GIDS = (336, 341, 346)         # top, middle, bottom
+DECORATION_GIDS = (328, 329, 330)
+GEM_GID = 1
+BOX_GID = 16
+ENEMY_GID = 236
+ENEMY_SIZE = 96
+ENEMY_TYPES = (0, 1)
+BACKGROUND = os.path.join("images", "level", "background_2.png")
+
+# Rows between platform tiers; four is a comfortable single jump
+PLATFORM_SPACING = 4
+
+
+def generate(width: int = 200, height: int = 32, density: float = 0.4,
+             enemies: int = 20, boxes: int = 10, gems: int = 20,
+             seed: int = 0) -> ET.ElementTree:
+    """
+    A level as an ElementTree.
+
+    width, height: map size in tiles (at least 24 x 12)
+    density: share of each platform tier covered by platforms, 0..1
+    enemies, boxes, gems: how many of each to place on platforms
+    """
+    width = max(width, 24)
+    height = max(height, 12)
+    rng = random.Random(seed)
+    floor_row = height - 1
+
+    ground = [[0] * width for _ in range(height)]
+    obstacle = [[0] * width for _ in range(height)]
+    decoration = [[0] * width for _ in range(height)]
+
+    # Surfaces to stand on: (row, first column, last column)
+    platforms = [(floor_row, 1, width - 2)]
+    _fill_platform(ground, floor_row, 0, width - 1, rng)
+    for row in range(floor_row - PLATFORM_SPACING, 2, -PLATFORM_SPACING):
+        x = 2 + rng.randint(0, 4)
+        while x < width - 4:
+            if rng.random() < density:
+                length = rng.randint(3, 10)
+                end = min(x + length, width - 3) - 1
+                _fill_platform(ground, row, x, end, rng)
+                platforms.append((row, x, end))
+                x = end + 1
+            x += rng.randint(2, 5)
+
+    for column in (0, width - 1):
+        _fill_wall(obstacle, column, 0, floor_row - 1)
+    # Pillars on the floor, clear of the spawn and the portal
+    for column in range(8, width - 8):
+        if rng.random() < density * 0.04:
+            _fill_wall(obstacle, column, floor_row - 2, floor_row - 1)
+
+    for row, first, last in platforms:
+        for column in range(first, last + 1):
+            if rng.random() < 0.05 and not obstacle[row - 1][column]:
+                decoration[row - 1][column] = rng.choice(DECORATION_GIDS)
+
+    floor_top = floor_row * TILE_SIZE
+    objects = {"Enemies": [], "Player": [], "Doors": [], "Items": []}
+    next_id = [1]
+
+    def add(group, **attrs):
+        attrs = {"id": next_id[0], **attrs}
+        next_id[0] += 1
+        objects[group].append(attrs)
+
+    # Enemies patrol part of a platform; the floor gets windows of it
+    patrols = [p for p in platforms if p[2] - p[1] >= 3]
+    for i in range(enemies):
+        row, first, last = rng.choice(patrols)
+        if last - first > 12:
+            first = rng.randint(first, last - 12)
+            last = first + 12
+        top = row * TILE_SIZE
+        start_x = first * TILE_SIZE
+        end_x = (last + 1) * TILE_SIZE - ENEMY_SIZE
+        x = rng.randint(start_x, end_x)
+        name = f"enemy_{i + 1}"
+        add("Enemies", name=name, type="enemy_spawn", gid=ENEMY_GID, x=x, y=top,
+            width=ENEMY_SIZE, height=ENEMY_SIZE,
+            properties={"enemy_type": rng.choice(ENEMY_TYPES), "speed": rng.randint(80, 120)})
+        add("Enemies", name=f"{name}_start", type="waypoint", x=start_x, y=top)
+        add("Enemies", name=f"{name}_end", type="waypoint", x=end_x, y=top)
+
+    # Tile objects are anchored at their bottom edge, as Tiled does
+    for i in range(boxes):
+        row, first, last = rng.choice(platforms)
+        add("Items", name=f"box_{i + 1}", type="box", gid=BOX_GID,
+            x=rng.randint(first * TILE_SIZE, last * TILE_SIZE), y=row * TILE_SIZE,
+            width=TILE_SIZE, height=TILE_SIZE)
+    for i in range(gems):
+        row, first, last = rng.choice(platforms)
+        add("Items", name=f"gem_{i + 1}", type="gem", gid=GEM_GID,
+            x=rng.randint(first * TILE_SIZE, last * TILE_SIZE),
+            y=row * TILE_SIZE - rng.randint(0, TILE_SIZE),
+            width=TILE_SIZE, height=TILE_SIZE)
+
+    add("Player", name="player", type="player_spawn", x=160, y=floor_top - 3 * TILE_SIZE)
+    add("Doors", name="portal", type="portal", x=(width - 3) * TILE_SIZE, y=floor_top - 88,
+        width=60, height=87)
+
+    return _build_tree(width, height, ground, obstacle, decoration, objects, next_id[0])
+
+
+def _fill_platform(layer: list, row: int, first: int, last: int, rng: random.Random):
+    for column in range(first, last + 1):
+        layer[row][column] = rng.choice(GROUND_GIDS)
+    layer[row][first] = layer[row][last] = GROUND_CAP_GID
+
+
+def _fill_wall(layer: list, column: int, top: int, bottom: int):
+    for row in range(top, bottom + 1):
+        layer[row][column] = WALL_GIDS[1]
+    layer[row][column] = WALL_GIDS[2]
+    layer[top][column] = WALL_GIDS[0]
+
+
+def _build_tree(width, height, ground, obstacle, decoration, objects, next_object_id):
+    root = ET.Element("map", {
+        "version": "1.10", "orientation": "orthogonal", "renderorder": "right-down",
+        "width": str(width), "height": str(height),
+        "tilewidth": str(TILE_SIZE), "tileheight": str(TILE_SIZE),
+        "infinite": "0", "nextlayerid": "9", "nextobjectid": str(next_object_id),
+    })
+    # Paths are filled in by write(), relative to the output folder
+    for firstgid, name in TILESETS:
+        ET.SubElement(root, "tileset", {"firstgid": str(firstgid), "source": name})
+
+    background = ET.SubElement(root, "imagelayer", {"id": "1", "name": "Background"})
+    ET.SubElement(background, "image", {"source": BACKGROUND, "width": "1536", "height": "1024"})
+
+    for layer_id, (name, rows) in enumerate(
+            (("Ground", ground), ("Obstacle", obstacle), ("Decoration", decoration)), 2):
+        layer = ET.SubElement(root, "layer", {
+            "id": str(layer_id), "name": name, "width": str(width), "height": str(height),
+        })
+        data = ET.SubElement(layer, "data", {"encoding": "csv"})
+        data.text = "\n" + ",\n".join(",".join(map(str, row)) for row in rows) + "\n"
+
+    for group_id, (name, entries) in enumerate(objects.items(), 5):
+        group = ET.SubElement(root, "objectgroup", {"id": str(group_id), "name": name})
+        for entry in entries:
+            entry = dict(entry)
+            properties = entry.pop("properties", None)
+            obj = ET.SubElement(group, "object", {k: str(v) for k, v in entry.items()})
+            if properties:
+                props = ET.SubElement(obj, "properties")
+                for key, value in properties.items():
+                    ET.SubElement(props, "property", {"name": key, "type": "int", "value": str(value)})
+            elif "gid" not in entry and "width" not in entry:
+                ET.SubElement(obj, "point")
+
+    ET.indent(root, space=" ")
+    return ET.ElementTree(root)
+
+
+def write(tree: ET.ElementTree, path: str):
+    """ Save tree as path, pointing its tilesets and images at the shipped assets """
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    root = tree.getroot()
+    for tileset in root.iter("tileset"):
+        name = os.path.basename(tileset.get("source"))
+        target = os.path.join(ASSETS_DIR, "tilesets", name)
+        tileset.set("source", os.path.relpath(target, folder).replace(os.sep, "/"))
+    for image in root.iter("image"):
+        target = os.path.join(ASSETS_DIR, BACKGROUND)
+        image.set("source", os.path.relpath(target, folder).replace(os.sep, "/"))
+    tree.write(path, encoding="UTF-8", xml_declaration=True)
+
+
+def level_file(index: int, level_dir: str = GENERATED_LEVELS_DIR) -> str:
+    return os.path.join(level_dir, f"level_{index:02d}.tmx")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic TMX level.")
+    parser.add_argument("--index", type=int, default=1,
+                        help="writes level_XX.tmx in the output folder")
+    parser.add_argument("--out-dir", default=GENERATED_LEVELS_DIR)
+    parser.add_argument("--width", type=int, default=200, help="tiles")
+    parser.add_argument("--height", type=int, default=32, help="tiles")
+    parser.add_argument("--density", type=float, default=0.4,
+                        help="platform coverage per tier, 0..1")
+    parser.add_argument("--enemies", type=int, default=20)
+    parser.add_argument("--boxes", type=int, default=10)
+    parser.add_argument("--gems", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    path = level_file(args.index, args.out_dir)
+    tree = generate(args.width, args.height, args.density,
+                    args.enemies, args.boxes, args.gems, args.seed)
+    write(tree, path)
+    print(f"Wrote {path} ({args.width}x{args.height} tiles, {args.enemies} enemies, "
+          f"{args.boxes} boxes, {args.gems} gems)")
+
+
+if __name__ == "__main__":
+    main()
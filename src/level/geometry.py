@@ -0,0 +1,198 @@
+import numpy as np
+import pygame
+
+
+def merge_tile_rects(cells, tile_width: int, tile_height: int,
+                     vertical: bool = True) -> list:
+    """
+    Compile solid tile cells into as few collision rects as possible.
+
+    cells: iterable of (x, y) tile coordinates that are solid
+    vertical: when False only horizontal runs are produced
+
+    Adjacent cells in a row are merged into runs first. With vertical set,
+    runs with the same span on consecutive rows are then stacked into one
+    rectangle. Ground must stay one rect per row because every tile top is
+    a landing surface; obstacles are fully solid and can be stacked.
+    Rects are returned in row-major order, like the per-tile lists were.
+    """
+    rows = {}
+    for x, y in cells:
+        rows.setdefault(y, []).append(x)
+
+    spans = []
+    for y in sorted(rows):
+        xs = sorted(rows[y])
+        start = prev = xs[0]
+        for x in xs[1:]:
+            if x != prev + 1:
+                spans.append((y, start, prev))
+                start = x
+            prev = x
+        spans.append((y, start, prev))
+
+    if vertical:
+        open_spans = {}
+        merged = []
+        for y, x0, x1 in spans:
+            block = open_spans.get((x0, x1))
+            if block is not None and block[1] == y - 1:
+                block[1] = y
+            else:
+                block = [y, y, x0, x1]
+                open_spans[(x0, x1)] = block
+                merged.append(block)
+    else:
+        merged = [[y, y, x0, x1] for y, x0, x1 in spans]
+
+    merged.sort(key=lambda b: (b[0], b[2]))
+    return [
+        pygame.Rect(
+            x0 * tile_width,
+            y0 * tile_height,
+            (x1 - x0 + 1) * tile_width,
+            (y1 - y0 + 1) * tile_height
+        )
+        for y0, y1, x0, x1 in merged
+    ]
+
+
+def sweep(boxes: np.ndarray, deltas: np.ndarray, rects: np.ndarray):
+    """
+    Swept-box raycasts: each (x, y, w, h) row of boxes moving by its
+    (dx, dy) row of deltas, against every row of rects.
+
+    Returns (toi, index, normal): the time of impact in 0..1 along the move
+    (inf where nothing is hit), the index of the rect hit first (-1 where
+    none; level order breaks ties) and the (nx, ny) unit normal of the face
+    hit. A box already overlapping a rect hits it at time 0. Overlap means
+    what pygame.Rect.colliderect means, so touching edges do not count.
+    """
+    if not len(rects):
+        return _first_impacts(boxes, deltas, rects, np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp))
+    near = _overlap(_swept_bounds(boxes, deltas)[:, None, :], rects) & _solid(rects)
+    rows, cols = np.nonzero(near)
+    return _first_impacts(boxes, deltas, rects, rows, cols)
+
+
+class ColumnIndex:
+    """
+    Rects bucketed into vertical columns column_width pixels wide, for
+    sweep() queries on many boxes at once.
+
+    Each column holds the indices of the rects reaching into it in level
+    order, padded with -1 into one table, so a query gathers the columns
+    under every box and tests them in a single vectorized pass.
+    """
+
+    def __init__(self, rects: np.ndarray, column_width: int = 1024):
+        self.rects = rects
+        self.column_width = column_width
+        solid = np.flatnonzero(_solid(rects)) if len(rects) else np.zeros(0, dtype=np.intp)
+        right = rects[solid, 0] + rects[solid, 2]
+        self.columns = max(1, int(-(-right.max() // column_width))) if len(solid) else 1
+
+        first = np.clip(rects[solid, 0] // column_width, 0, self.columns - 1)
+        last = np.clip((right - 1) // column_width, 0, self.columns - 1)
+        spans = last - first + 1
+        owner = np.repeat(solid, spans)
+        start = np.repeat(np.cumsum(spans) - spans, spans)
+        column = np.repeat(first, spans) + np.arange(len(owner)) - start
+        order = np.argsort(column, kind="stable")
+        owner, column = owner[order], column[order]
+
+        counts = np.bincount(column, minlength=self.columns)
+        self.table = np.full((self.columns, max(1, counts.max(initial=0))), -1, dtype=np.intp)
+        slot = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        self.table[column, slot] = owner
+
+    def sweep(self, boxes: np.ndarray, deltas: np.ndarray):
+        """ Like sweep(boxes, deltas, self.rects) """
+        rows, cols = [np.zeros(0, dtype=np.intp)], [np.zeros(0, dtype=np.intp)]
+        if len(boxes) and len(self.rects):
+            # Columns under the whole swept area of each box
+            swept = _swept_bounds(boxes, deltas)
+            first = np.clip(swept[:, 0] // self.column_width, 0, self.columns - 1)
+            last = np.clip((swept[:, 0] + swept[:, 2] - 1) // self.column_width, 0, self.columns - 1)
+            for step in range(int((last - first).max()) + 1):
+                boxes_in = np.flatnonzero(first + step <= last)
+                found = self.table[first[boxes_in] + step]
+                near = (found >= 0) & _overlap(swept[boxes_in, None, :], self.rects[np.maximum(found, 0)])
+                r, c = np.nonzero(near)
+                rows.append(boxes_in[r])
+                cols.append(found[r, c])
+        return _first_impacts(boxes, deltas, self.rects, np.concatenate(rows), np.concatenate(cols))
+
+
+def _swept_bounds(boxes: np.ndarray, deltas: np.ndarray) -> np.ndarray:
+    """ (x, y, w, h) rows covering each box over its whole move """
+    dx, dy = deltas[:, 0], deltas[:, 1]
+    return np.column_stack((boxes[:, 0] + np.minimum(dx, 0), boxes[:, 1] + np.minimum(dy, 0),
+                            boxes[:, 2] + np.abs(dx), boxes[:, 3] + np.abs(dy)))
+
+
+def _first_impacts(boxes, deltas, rects, rows, cols):
+    """
+    sweep()'s result from candidate (box row, rect index) pairs. A rect
+    already overlapped counts from the (negative) time it was entered, so
+    the deepest one wins before level order does.
+    """
+    toi = np.full(len(boxes), np.inf)
+    index = np.full(len(boxes), -1, dtype=np.intp)
+    normal = np.zeros((len(boxes), 2), dtype=np.int64)
+    if not len(rows):
+        return toi, index, normal
+
+    moving = deltas[rows]
+    enter, leave, side = _slab_times(boxes[rows], moving, rects[cols])
+    hit = (enter < leave) & (enter < 1) & (leave > 0)
+    order = np.lexsort((cols[hit], enter[hit], rows[hit]))
+    rows, cols = rows[hit][order], cols[hit][order]
+    enter, side, moving = enter[hit][order], side[hit][order], moving[hit][order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+
+    hit_rows = rows[first]
+    toi[hit_rows] = np.maximum(enter[first], 0.0)
+    index[hit_rows] = cols[first]
+    side, dx, dy = side[first], moving[first, 0], moving[first, 1]
+    # Boxes that do not move rest on whatever they overlap
+    normal[hit_rows, 0] = np.where(side, -np.sign(dx), 0)
+    normal[hit_rows, 1] = np.where(side, 0, np.where(dy < 0, 1, -1))
+    return toi, index, normal
+
+
+def _slab_times(boxes, deltas, rects):
+    """
+    Entry and exit times of each box's top-left corner through its rect
+    grown by the box size (the Minkowski sum), and whether the x slab is
+    the last one entered. Both are open intervals, like colliderect.
+    """
+    times = []
+    for axis in (0, 1):
+        position, size, delta = boxes[:, axis], boxes[:, axis + 2], deltas[:, axis]
+        low = rects[:, axis] - size
+        high = rects[:, axis] + rects[:, axis + 2]
+        moving = delta != 0
+        step = np.where(moving, delta, 1)
+        near = np.where(delta > 0, low, high)
+        far = np.where(delta > 0, high, low)
+        inside = (low < position) & (position < high)
+        enter = np.where(moving, (near - position) / step, np.where(inside, -np.inf, np.inf))
+        leave = np.where(moving, (far - position) / step, np.where(inside, np.inf, -np.inf))
+        times.append((enter, leave))
+    (enter_x, leave_x), (enter_y, leave_y) = times
+    return np.maximum(enter_x, enter_y), np.minimum(leave_x, leave_y), enter_x > enter_y
+
+
+def _solid(rects: np.ndarray) -> np.ndarray:
+    # pygame never reports a collision with an empty rect
+    return (rects[..., 2] > 0) & (rects[..., 3] > 0)
+
+
+def _overlap(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """ Rect.colliderect on broadcast (..., 4) arrays of x, y, w, h """
+    return (
+        (a[..., 0] < b[..., 0] + b[..., 2]) & (a[..., 0] + a[..., 2] > b[..., 0])
+        & (a[..., 1] < b[..., 1] + b[..., 3]) & (a[..., 1] + a[..., 3] > b[..., 1])
+    )
@@ -0,0 +1,427 @@
+"""
+Compiles Tiled TMX levels into a compact binary artifact that is stored
+next to the source (level_01.tmx -> level_01.lvc).
+
+Layout (little endian):
+    header   magic, format version, source mtime_ns, size and sha1,
+             length of the metadata block
+    meta     UTF-8 JSON: map size, layers, tile image references, merged
+             collision rect counts, spawn / exit / enemy / item records
+    tiles    one uint32 gid array (width * height) per tile layer
+    rects    int32 (x, y, w, h) quads: ground rects, then obstacle rects
+
+An artifact is fresh while the TMX keeps its mtime and size (or, after a
+checkout that only touched the mtime, its sha1) and every external
+tileset it depends on is unchanged.
+
+Reading an artifact only parses the header and metadata; tile layers and
+rects are memory-mapped, so pages are read as they are first touched.
+
+    python -m src.level.level_compiler assets/levels/*.tmx
+"""
+
+import os
+import sys
+import json
+import struct
+import hashlib
+import xml.etree.ElementTree as ET
+from array import array
+
+import numpy as np
+import pytmx
+
+from src.level.geometry import merge_tile_rects
+
+MAGIC = b"CBLV"
+VERSION = 2
+HEADER = struct.Struct("<4sHqq20sI")
+ARTIFACT_EXT = ".lvc"
+
+
+class _TileRef:
+    """ Placeholder pytmx stores instead of a surface while compiling """
+
+    __slots__ = ("path", "colorkey", "rect", "flags")
+
+    def __init__(self, path, colorkey, rect, flags):
+        self.path = path
+        self.colorkey = colorkey
+        self.rect = rect
+        self.flags = flags
+
+
+def _recording_loader(filename, colorkey, **kwargs):
+    def load_image(rect=None, flags=None):
+        return _TileRef(filename, colorkey, rect, flags)
+
+    return load_image
+
+
+def artifact_path(tmx_path: str) -> str:
+    return os.path.splitext(tmx_path)[0] + ARTIFACT_EXT
+
+
+def _sha1(path: str) -> bytes:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.digest()
+
+
+def _tileset_sources(tmx_path: str) -> list:
+    """ External .tsx files referenced by the map, relative to its folder """
+    sources = []
+    for _, elem in ET.iterparse(tmx_path, events=("start",)):
+        if elem.tag == "tileset" and elem.get("source"):
+            sources.append(elem.get("source"))
+        elif elem.tag in ("layer", "imagelayer", "objectgroup", "group"):
+            break
+    return sources
+
+
+def _layer_group(layer) -> str:
+    if isinstance(layer, pytmx.TiledImageLayer):
+        return "background"
+    lname = layer.name.lower()
+    if "bg" in lname or "background" in lname:
+        return "background"
+    if "fg" in lname or "foreground" in lname:
+        return "foreground"
+    return "middle"
+
+
+def _plain_properties(properties) -> dict:
+    """
+    Object properties that survive serialization. Tile objects also inherit
+    tile metadata (animation frames, collider groups) which no entity reads.
+    """
+    return {
+        key: value for key, value in properties.items()
+        if isinstance(value, (str, int, float, bool))
+    }
+
+
+def _parse_objects(tmx_data) -> dict:
+    spawn_point = (0, 0)
+    exit_point = None
+    enemy_data = []
+    item_data = []
+    other_objects = []
+
+    for layer in tmx_data.layers:
+        if not isinstance(layer, pytmx.TiledObjectGroup):
+            continue
+
+        if layer.name == "Enemies":
+            enemy_spawns = {}
+            for obj in layer:
+                otype = obj.type.lower()
+
+                if otype == "enemy_spawn":
+                    # The GIF is looked up from the type when the level is loaded
+                    enemy_spawns[obj.name] = {
+                        "x": int(obj.x),
+                        "y": int(obj.y),
+                        "enemy_type": obj.properties.get("enemy_type", 0),
+                        "speed": obj.properties.get("speed", 0),
+                        "start": None,
+                        "end": None,
+                    }
+
+                elif otype == "waypoint":
+
+                    base, kind = obj.name.rsplit("_", 1)
+                    if base in enemy_spawns:
+                        enemy_spawns[base][kind] = (int(obj.x), int(obj.y))
+
+            enemy_data.extend(enemy_spawns.values())
+
+        elif layer.name == "Player":
+            for obj in layer:
+                if obj.type.lower() == "player_spawn":
+                    spawn_point = (int(obj.x), int(obj.y))
+
+        elif layer.name == "Doors":
+            for obj in layer:
+                if obj.type.lower() == "portal":
+                    exit_point = (int(obj.x), int(obj.y))
+
+        elif layer.name == "Items":
+            for obj in layer:
+                if obj.type:
+                    item_data.append({
+                        "x": int(obj.x),
+                        "y": int(obj.y),
+                        "type": obj.type,
+                        "properties": _plain_properties(obj.properties)
+                    })
+
+        else:
+            for obj in layer:
+                other_objects.append({
+                    "x": int(obj.x),
+                    "y": int(obj.y),
+                    "type": obj.type,
+                    "properties": _plain_properties(obj.properties)
+                })
+
+    return {
+        "spawn_point": spawn_point,
+        "exit_point": exit_point,
+        "enemy_data": enemy_data,
+        "item_data": item_data,
+        "other_objects": other_objects,
+    }
+
+
+def compile_level(tmx_path: str, write: bool = True) -> dict:
+    """
+    Parse a TMX file and return its level data (see read_artifact).
+    With write set the artifact is also saved next to the source;
+    a failure to write is reported and otherwise ignored.
+    """
+    level_dir = os.path.dirname(os.path.abspath(tmx_path))
+    tmx_data = pytmx.TiledMap(tmx_path, image_loader=_recording_loader)
+    map_w, map_h = tmx_data.width, tmx_data.height
+
+    sources = []
+    source_index = {}
+
+    def source_of(ref):
+        key = (os.path.relpath(os.path.abspath(ref.path), level_dir), ref.colorkey)
+        if key not in source_index:
+            source_index[key] = len(sources)
+            sources.append({"path": key[0], "colorkey": ref.colorkey})
+        return source_index[key]
+
+    gids = []
+    for ref in tmx_data.images:
+        if ref is None:
+            gids.append(None)
+            continue
+        flags = ref.flags
+        gids.append([
+            source_of(ref),
+            list(ref.rect) if ref.rect else None,
+            [bool(flags.flipped_horizontally), bool(flags.flipped_vertically),
+             bool(flags.flipped_diagonally)] if flags else [False, False, False]
+        ])
+
+    layers = []
+    tile_blobs = []
+    collision_cells = {"ground": [], "obstacle": []}
+    for layer in tmx_data.layers:
+        if isinstance(layer, pytmx.TiledImageLayer):
+            ref = layer.image
+            if ref is None:
+                continue
+            layers.append({
+                "name": layer.name,
+                "kind": "image",
+                "group": "background",
+                "source": source_of(ref),
+                "offset": [getattr(layer, "offsetx", 0) or 0,
+                           getattr(layer, "offsety", 0) or 0],
+            })
+
+        elif isinstance(layer, pytmx.TiledTileLayer):
+            flat = array("I")
+            for row in layer.data:
+                flat.extend(row)
+            tile_blobs.append(flat)
+            layers.append({
+                "name": layer.name,
+                "kind": "tile",
+                "group": _layer_group(layer),
+            })
+
+            if layer.name == "Obstacle":
+                collision_cells["obstacle"].extend((x, y) for x, y, gid in layer if gid)
+            elif layer.name == "Ground":
+                collision_cells["ground"].extend((x, y) for x, y, gid in layer if gid)
+
+    tw, th = tmx_data.tilewidth, tmx_data.tileheight
+    rects = {
+        "ground": merge_tile_rects(collision_cells["ground"], tw, th, vertical=False),
+        "obstacle": merge_tile_rects(collision_cells["obstacle"], tw, th),
+    }
+
+    depends = []
+    for rel in _tileset_sources(tmx_path):
+        st = os.stat(os.path.join(level_dir, rel))
+        depends.append({"path": rel, "mtime_ns": st.st_mtime_ns, "size": st.st_size})
+
+    meta = {
+        "tile_width": tw,
+        "tile_height": th,
+        "map_width": map_w,
+        "map_height": map_h,
+        "sources": sources,
+        "gids": gids,
+        "layers": layers,
+        "ground_count": len(rects["ground"]),
+        "obstacle_count": len(rects["obstacle"]),
+        "depends": depends,
+    }
+    meta.update(_parse_objects(tmx_data))
+
+    if write:
+        try:
+            _write_artifact(tmx_path, meta, tile_blobs, rects)
+        except OSError as e:
+            print(f"Error writing compiled level: {e}")
+
+    blobs = iter(tile_blobs)
+    for layer in layers:
+        if layer["kind"] == "tile":
+            layer["rows"] = np.array(next(blobs), dtype=np.uint32).reshape(map_h, map_w)
+    rect_data = {
+        kind: np.array([(r.x, r.y, r.w, r.h) for r in found], dtype=np.int32).reshape(-1, 4)
+        for kind, found in rects.items()
+    }
+    return _finish(meta, rect_data, level_dir)
+
+
+def _write_artifact(tmx_path: str, meta: dict, tile_blobs: list, rects: dict):
+    st = os.stat(tmx_path)
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    header = HEADER.pack(MAGIC, VERSION, st.st_mtime_ns, st.st_size,
+                         _sha1(tmx_path), len(meta_bytes))
+
+    quads = array("i")
+    for kind in ("ground", "obstacle"):
+        for r in rects[kind]:
+            quads.extend((r.x, r.y, r.w, r.h))
+
+    path = artifact_path(tmx_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(meta_bytes)
+        for blob in tile_blobs:
+            if sys.byteorder != "little":
+                blob = array("I", blob)
+                blob.byteswap()
+            f.write(blob.tobytes())
+        if sys.byteorder != "little":
+            quads.byteswap()
+        f.write(quads.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_artifact(tmx_path: str):
+    """
+    Return the level data stored in the artifact for tmx_path, or None if
+    it is missing, from another format version, stale or unreadable.
+    Tile layers ("rows") and rects are copy-on-write memory maps.
+    """
+    path = artifact_path(tmx_path)
+    try:
+        st = os.stat(tmx_path)
+        with open(path, "rb") as f:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                return None
+            magic, version, mtime_ns, size, sha1, meta_len = HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION or st.st_size != size:
+                return None
+            meta_bytes = f.read(meta_len)
+            file_size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return None
+
+    if st.st_mtime_ns != mtime_ns:
+        if _sha1(tmx_path) != sha1:
+            return None
+        _touch_header(path, st.st_mtime_ns, size, sha1, meta_len)
+
+    level_dir = os.path.dirname(os.path.abspath(tmx_path))
+    try:
+        return _parse_artifact(path, meta_bytes, file_size, level_dir)
+    except (ValueError, KeyError, TypeError, IndexError, OSError) as e:
+        # Truncated or corrupt: as good as missing, so the TMX is recompiled
+        print(f"Ignoring unreadable compiled level {path}: {e}")
+        return None
+
+
+def _parse_artifact(path: str, meta_bytes: bytes, file_size: int, level_dir: str):
+    """ Level data from the body of an artifact, or None if a dependency changed """
+    meta = json.loads(meta_bytes.decode("utf-8"))
+
+    for dep in meta["depends"]:
+        try:
+            dst = os.stat(os.path.join(level_dir, dep["path"]))
+        except OSError:
+            return None
+        if dst.st_mtime_ns != dep["mtime_ns"] or dst.st_size != dep["size"]:
+            return None
+
+    map_w, map_h = meta["map_width"], meta["map_height"]
+    tile_layers = [layer for layer in meta["layers"] if layer["kind"] == "tile"]
+    ground_count = meta["ground_count"]
+    rect_count = ground_count + meta["obstacle_count"]
+    offset = HEADER.size + len(meta_bytes)
+    layer_size = map_w * map_h * 4
+    if file_size != offset + len(tile_layers) * layer_size + rect_count * 16:
+        raise ValueError("artifact is truncated or has trailing data")
+
+    for layer in tile_layers:
+        layer["rows"] = _map_block(path, offset, "<u4", (map_h, map_w))
+        offset += layer_size
+    quads = _map_block(path, offset, "<i4", (rect_count, 4))
+    rect_data = {"ground": quads[:ground_count], "obstacle": quads[ground_count:]}
+
+    return _finish(meta, rect_data, level_dir)
+
+
+def _map_block(path: str, offset: int, dtype: str, shape: tuple) -> np.ndarray:
+    """
+    Copy-on-write map of one array in the artifact: writes (e.g. set_tile)
+    stay in memory and never reach the file.
+    """
+    if 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape)
+
+
+def _touch_header(path, mtime_ns, size, sha1, meta_len):
+    """ Record the new mtime of an unchanged source so it is not re-hashed """
+    try:
+        with open(path, "r+b") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, mtime_ns, size, sha1, meta_len))
+    except OSError:
+        pass
+
+
+def _finish(meta: dict, rect_data: dict, level_dir: str) -> dict:
+    """ Attach the (N, 4) rect arrays and resolve relative paths """
+    for source in meta["sources"]:
+        source["path"] = os.path.normpath(os.path.join(level_dir, source["path"]))
+    for ed in meta["enemy_data"]:
+        for kind in ("start", "end"):
+            if ed[kind] is not None:
+                ed[kind] = tuple(ed[kind])
+    if meta["spawn_point"] is not None:
+        meta["spawn_point"] = tuple(meta["spawn_point"])
+    if meta["exit_point"] is not None:
+        meta["exit_point"] = tuple(meta["exit_point"])
+
+    meta["ground_rects"] = rect_data["ground"]
+    meta["obstacle_rects"] = rect_data["obstacle"]
+    return meta
+
+
+def load_level_data(tmx_path: str) -> dict:
+    """ Level data from a fresh artifact, recompiling the TMX if needed """
+    data = read_artifact(tmx_path)
+    if data is None:
+        data = compile_level(tmx_path)
+    return data
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:]:
+        compile_level(arg)
+        print(f"Compiled {arg} -> {artifact_path(arg)}")
@@ -1,13 +1,60 @@
 import os
+from collections import OrderedDict
+
+import numpy as np
 import pygame
-import pytmx
-from pytmx.util_pygame import load_pygame
+
+from src.config import LEVEL_CACHE_SIZE, STREAMING_MIN_TILES, STREAMING_MEMORY_BUDGET
+from src.level.geometry import ColumnIndex
+from src.animation import AnimationLibrary, decode_gif
+from src.level.level_compiler import load_level_data
+from src.level.preloader import LevelPreloader
+from src.level.spatial_grid import SpatialGrid
 
 
 class LevelManager:
 
-    def __init__(self):
-        self.tmx_data = None
+    LAYER_GROUPS = ("background", "middle", "foreground")
+    CHUNK_TILES = 16
+    # Rough per-rect cost (Rect, grid buckets, bookkeeping) for the budget,
+    # charged to every region holding the rect
+    REGION_RECT_BYTES = 256
+
+    # Everything load_level builds for one level; cached per level index
+    LEVEL_STATE = (
+        "level_data", "tile_width", "tile_height", "map_width", "map_height",
+        "width", "height", "background_layers", "middle_layers",
+        "foreground_layers", "tile_layers", "image_layers", "tile_images",
+        "_source_images", "chunk_width", "chunk_height", "layer_chunks",
+        "ground_rects", "obstacle_rects", "collision_grids", "streaming",
+        "_region_rects", "_resident_rects", "_regions", "_resident_bytes", "spawn_point",
+        "exit_point", "enemy_data", "item_data", "other_objects",
+    )
+
+    # Shipped levels: assets/levels/level_XX.tmx
+    LEVEL_DIR = os.path.normpath(
+        os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "assets", "levels")
+    )
+    # Enemy animations: assets/images/enemies/enemy_<type>.gif, whatever
+    # folder the level itself was loaded from
+    ENEMY_DIR = os.path.normpath(
+        os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "assets", "images", "enemies")
+    )
+
+    def __init__(self, streaming: bool = None,
+                 memory_budget: int = STREAMING_MEMORY_BUDGET,
+                 cache_size: int = LEVEL_CACHE_SIZE,
+                 level_dir: str = None):
+        """
+        streaming: True/False forces streaming mode on or off; None picks it
+            per level from STREAMING_MIN_TILES
+        memory_budget: bytes of streamed regions to keep before evicting
+        cache_size: number of parsed levels kept for instant reloads
+        level_dir: folder of level_XX.tmx files; defaults to LEVEL_DIR
+        """
+        self.level_dir = level_dir or self.LEVEL_DIR
+        self.level_index = None
+        self.level_data = None
         self.tile_width = self.tile_height = 0
         self.map_width = self.map_height = 0
         self.width = self.height = 0
@@ -15,9 +62,28 @@ class LevelManager:
         self.background_layers = []
         self.middle_layers = []
         self.foreground_layers = []
+        self.tile_layers = {}
+        self.image_layers = {}
+        self.tile_images = []
+        self._source_images = []
+        self.chunk_width = self.chunk_height = 0
+        self.layer_chunks = {group: {} for group in self.LAYER_GROUPS}
 
         self.ground_rects = []
         self.obstacle_rects = []
+        self.collision_grids = {
+            "ground": SpatialGrid(),
+            "obstacle": SpatialGrid(),
+        }
+        self._rect_indexes = {}
+
+        self.streaming_setting = streaming
+        self.streaming = False
+        self.memory_budget = memory_budget
+        self._region_rects = {}
+        self._resident_rects = {"ground": {}, "obstacle": {}}
+        self._regions = {}
+        self._resident_bytes = 0
 
         self.spawn_point = (0, 0)
         self.exit_point = None
@@ -25,167 +91,488 @@ class LevelManager:
         self.item_data = []
         self.other_objects = []
 
-    def load_level(self, level_index: int):
-        tmx_path = os.path.normpath(
-            os.path.join(
-                os.path.dirname(__file__), os.pardir, os.pardir,
-                "assets", "levels", f"level_{level_index:02d}.tmx"
-            )
-        )
-        self.tmx_data = load_pygame(tmx_path)
+        self.cache_size = cache_size
+        self._level_cache = OrderedDict()
+        self._modified = False
+        self._preloader = None
 
-        self.tile_width = self.tmx_data.tilewidth
-        self.tile_height = self.tmx_data.tileheight
-        self.map_width = self.tmx_data.width
-        self.map_height = self.tmx_data.height
+    def load_level(self, level_index: int):
+        """
+        Make level_index the current level. Recently used levels are restored
+        from an in-memory LRU with their tile surfaces, chunks and collision
+        index intact; anything else is read from the compiled level cache.
+        A background preload of the same level is finished first.
+        """
+        self._stash_level()
+        if self._preloader is not None and self._preloader.level_index == level_index:
+            self._preloader.finish()
+            self._preloader = None
+
+        cached = self._level_cache.get(level_index)
+        if cached is not None:
+            self._level_cache.move_to_end(level_index)
+            for name, value in cached.items():
+                setattr(self, name, value)
+            self._rect_indexes = {}
+            self.level_index = level_index
+            self._modified = False
+            return
+
+        for _ in self.install_steps(level_index, self.prepare_level(level_index)):
+            pass
+        self._stash_level()
+
+    def level_path(self, level_index: int) -> str:
+        return os.path.join(self.level_dir, f"level_{level_index:02d}.tmx")
+
+    def set_level_dir(self, level_dir: str = None):
+        """ Load levels from another folder (e.g. generated maps) from now on """
+        self.level_dir = os.path.abspath(level_dir) if level_dir else self.LEVEL_DIR
+        # Indices now name other files: nothing cached or preloaded is valid
+        self.clear_cache()
+        self.level_index = None
+        self._preloader = None
+
+    def prepare_level(self, level_index: int) -> dict:
+        """
+        The part of a load that is safe off the main thread: level data from
+        the compiled cache, decoded tileset images and enemy GIF frames.
+        Nothing is converted to the display format here.
+        """
+        data = load_level_data(self.level_path(level_index))
+        images = [pygame.image.load(source["path"]) for source in data["sources"]]
+        gifs = {}
+        for ed in data["enemy_data"]:
+            path = ed["gif_path"] = os.path.join(self.ENEMY_DIR, f"enemy_{ed['enemy_type']}.gif")
+            if path not in gifs and not AnimationLibrary.has(path):
+                gifs[path] = decode_gif(path)
+        return {"data": data, "images": images, "gifs": gifs}
+
+    def install_steps(self, level_index: int, prepared: dict):
+        """
+        Main-thread half of a load: make the prepared level current.
+        This is a generator that yields between short steps (image
+        conversion, collision index, each pre-rendered chunk) so a caller
+        can spread the work over several frames.
+        """
+        data = prepared["data"]
+        self.level_data = data
+
+        self.tile_width = data["tile_width"]
+        self.tile_height = data["tile_height"]
+        self.map_width = data["map_width"]
+        self.map_height = data["map_height"]
         self.width = self.map_width * self.tile_width
         self.height = self.map_height * self.tile_height
 
-        self.background_layers.clear()
-        self.middle_layers.clear()
-        self.foreground_layers.clear()
-
-        self.ground_rects.clear()
-        self.obstacle_rects.clear()
-        self.spawn_point = (0, 0)
-        self.exit_point = None
-        self.enemy_data.clear()
-        self.item_data.clear()
-        self.other_objects.clear()
-
-        enemy_spawns = {}
-
-        for layer in self.tmx_data.layers:
-
-            if isinstance(layer, pytmx.TiledImageLayer):
-                self.background_layers.append(layer.name)
-
-            elif isinstance(layer, pytmx.TiledTileLayer):
-                lname = layer.name.lower()
-                if "bg" in lname or "background" in lname:
-                    self.background_layers.append(layer.name)
-                elif "fg" in lname or "foreground" in lname:
-                    self.foreground_layers.append(layer.name)
-                else:
-                    self.middle_layers.append(layer.name)
-
-                if layer.name == "Obstacle":
-                    for x, y, gid in layer:
-                        if gid:
-                            rect = pygame.Rect(
-                                x * self.tile_width,
-                                y * self.tile_height,
-                                self.tile_width,
-                                self.tile_height
-                            )
-                            self.obstacle_rects.append(rect)
-
-                elif layer.name == "Ground":
-                    for x, y, gid in layer:
-                        if gid:
-                            rect = pygame.Rect(
-                                x * self.tile_width,
-                                y * self.tile_height,
-                                self.tile_width,
-                                self.tile_height
-                            )
-                            self.ground_rects.append(rect)
-
-        for layer in self.tmx_data.layers:
-            if not isinstance(layer, pytmx.TiledObjectGroup):
+        self.background_layers = []
+        self.middle_layers = []
+        self.foreground_layers = []
+        self.tile_layers = {}
+        self.image_layers = {}
+        self._source_images = []
+        for source, image in zip(data["sources"], prepared["images"]):
+            self._source_images.append(self._convert_source(source, image))
+            yield
+        self.tile_images = self._cut_tiles(data["gids"])
+        for path, frames in prepared["gifs"].items():
+            AnimationLibrary.add(path, frames)
+        yield
+
+        self.spawn_point = data["spawn_point"]
+        self.exit_point = data["exit_point"]
+        self.enemy_data = data["enemy_data"]
+        self.item_data = data["item_data"]
+        self.other_objects = data["other_objects"]
+
+        self.collision_grids = {
+            "ground": SpatialGrid(self.tile_width * 2),
+            "obstacle": SpatialGrid(self.tile_width * 2),
+        }
+        self._rect_indexes = {}
+
+        if self.streaming_setting is None:
+            self.streaming = self.map_width * self.map_height >= STREAMING_MIN_TILES
+        else:
+            self.streaming = self.streaming_setting
+        self._region_rects = {}
+        self._resident_rects = {"ground": {}, "obstacle": {}}
+        self._regions = {}
+        self._resident_bytes = 0
+        self.chunk_width = self.CHUNK_TILES * self.tile_width
+        self.chunk_height = self.CHUNK_TILES * self.tile_height
+        self.layer_chunks = {group: {} for group in self.LAYER_GROUPS}
+
+        for layer in data["layers"]:
+            self._group_layers(layer["group"]).append(layer["name"])
+
+            if layer["kind"] == "image":
+                self.image_layers[layer["name"]] = (
+                    self._source_images[layer["source"]], tuple(layer["offset"])
+                )
                 continue
 
-            if layer.name == "Enemies":
-                for obj in layer:
-                    otype = obj.type.lower()
-
-                    if otype == "enemy_spawn":
-                        name = obj.name
-                        etype = obj.properties.get("enemy_type", 0)
-
-                        gif_file = f"enemy_{etype}.gif"
-                        gif_path = os.path.normpath(
-                            os.path.join(
-                                os.path.dirname(__file__), os.pardir, os.pardir,
-                                "assets", "images", "enemies", gif_file
-                            )
-                        )
-                        enemy_spawns[name] = {
-                            "x": int(obj.x),
-                            "y": int(obj.y),
-                            "enemy_type": etype,
-                            "speed": obj.properties.get("speed", 0),
-                            "start": None,
-                            "end": None,
-                            "gif_path": gif_path
-                        }
-
-                    elif otype == "waypoint":
-
-                        base, kind = obj.name.rsplit("_", 1)
-                        if base in enemy_spawns:
-                            enemy_spawns[base][kind] = (int(obj.x), int(obj.y))
-
-                for data in enemy_spawns.values():
-                    self.enemy_data.append(data)
-
-            elif layer.name == "Player":
-                for obj in layer:
-                    if obj.type.lower() == "player_spawn":
-                        self.spawn_point = (int(obj.x), int(obj.y))
-
-            elif layer.name == "Doors":
-                for obj in layer:
-                    if obj.type.lower() == "portal":
-                        self.exit_point = (int(obj.x), int(obj.y))
-
-            elif layer.name == "Items":
-                for obj in layer:
-                    if obj.type:
-                        self.item_data.append({
-                            "x": int(obj.x),
-                            "y": int(obj.y),
-                            "type": obj.type,
-                            "properties": dict(obj.properties)
-                        })
-
-            else:
-                for obj in layer:
-                    self.other_objects.append({
-                        "x": int(obj.x),
-                        "y": int(obj.y),
-                        "type": obj.type,
-                        "properties": dict(obj.properties)
-                    })
+            self.tile_layers[layer["name"]] = layer["rows"]
+
+        self.level_index = level_index
+        self._modified = False
+
+        if self.streaming:
+            self.ground_rects = []
+            self.obstacle_rects = []
+            for kind in ("ground", "obstacle"):
+                self._region_rects[kind] = self._bucket_rects(data[f"{kind}_rects"])
+            return
+
+        self.ground_rects = [pygame.Rect(r) for r in data["ground_rects"].tolist()]
+        self.obstacle_rects = [pygame.Rect(r) for r in data["obstacle_rects"].tolist()]
+        for rect in self.ground_rects:
+            self.collision_grids["ground"].insert(rect)
+        for rect in self.obstacle_rects:
+            self.collision_grids["obstacle"].insert(rect)
+
+        whole_map = pygame.Rect(0, 0, self.width, self.height)
+        for group in self.LAYER_GROUPS:
+            for key in self._chunk_keys(whole_map):
+                yield
+                self.layer_chunks[group][key] = self._bake_chunk(group, *key)
+
+    def preload(self, level_index: int):
+        """
+        Start preparing level_index on a worker thread. Call poll_preload()
+        once per frame afterwards; load_level() of that index finishes any
+        remaining work and then comes straight from the LRU.
+        """
+        if level_index in self._level_cache or self.cache_size <= 0:
+            return
+        if self._preloader is not None and self._preloader.level_index == level_index:
+            return
+        self._preloader = LevelPreloader(self, level_index)
+        self._preloader.start()
+
+    def poll_preload(self) -> bool:
+        """ Advance the background preload by one short main-thread step """
+        if self._preloader is None:
+            return True
+        if self._preloader.poll():
+            self._preloader = None
+            return True
+        return False
+
+    def snapshot(self) -> dict:
+        return {name: getattr(self, name) for name in self.LEVEL_STATE}
+
+    def adopt_level(self, level_index: int, state: dict):
+        """ Put a level built elsewhere (see LevelPreloader) into the LRU """
+        self._level_cache[level_index] = state
+        self._trim_cache()
+
+    def _stash_level(self):
+        """ Store (or refresh) the current level in the LRU, evicting the oldest """
+        if self.level_index is None or self._modified or self.cache_size <= 0:
+            return
+        self._level_cache[self.level_index] = self.snapshot()
+        self._level_cache.move_to_end(self.level_index)
+        self._trim_cache()
+
+    def _trim_cache(self):
+        while len(self._level_cache) > self.cache_size:
+            self._level_cache.popitem(last=False)
+
+    def clear_cache(self):
+        self._level_cache.clear()
+
+    @staticmethod
+    def _convert_source(source: dict, image: pygame.Surface) -> pygame.Surface:
+        """ Display-format copy of a decoded tileset or layer image """
+        if source["colorkey"]:
+            image = image.convert()
+            image.set_colorkey(pygame.Color(f"#{source['colorkey']}"), pygame.RLEACCEL)
+            return image
+        return image.convert_alpha()
+
+    def _cut_tiles(self, gids: list) -> list:
+        """ Per-gid tile surfaces cut from the sources, with Tiled's flip flags """
+        tiles = []
+        for entry in gids:
+            if entry is None:
+                tiles.append(None)
+                continue
+            source, rect, (flip_h, flip_v, flip_d) = entry
+            image = self._source_images[source]
+            tile = image.subsurface(rect) if rect else image
+            if flip_d:
+                tile = pygame.transform.flip(pygame.transform.rotate(tile, 270), True, False)
+            if flip_h or flip_v:
+                tile = pygame.transform.flip(tile, flip_h, flip_v)
+            tiles.append(tile)
+        return tiles
 
     def draw_map(self, screen, camera):
         """ 按：背景 → 中间 → 前景 的顺序绘制所有瓦片与背景图 """
+        for group in self.LAYER_GROUPS:
+            chunks = self.layer_chunks[group]
+            for key in self._chunk_keys(camera.render_view):
+                if key not in chunks:
+                    self._store_chunk(group, key)
+                surf = chunks[key]
+                if surf is not None:
+                    cx, cy = key
+                    screen.blit(surf, camera.apply_pos(cx * self.chunk_width, cy * self.chunk_height))
+
+    def set_tile(self, layer_name: str, x: int, y: int, gid: int):
+        """
+        Change one tile of a drawn layer and re-bake only the chunk holding it.
+        Collision rects are compiled at load time and are not affected.
+        The level leaves the LRU so the next load starts from its source.
+        """
+        self._level_cache.pop(self.level_index, None)
+        self._modified = True
+        self.tile_layers[layer_name][y, x] = gid
+        key = (x // self.CHUNK_TILES, y // self.CHUNK_TILES)
+        for group in self.LAYER_GROUPS:
+            if layer_name in self._group_layers(group):
+                self._drop_chunk(group, key)
+
+    def invalidate_layers(self, group: str = None):
+        """ Drop the cached chunks of one group (or all groups) so they are re-baked """
+        groups = self.LAYER_GROUPS if group is None else (group,)
+        for name in groups:
+            for key in list(self.layer_chunks[name]):
+                self._drop_chunk(name, key)
+
+    def update_streaming(self, view: pygame.Rect):
+        """
+        Streaming mode only: load the regions around view ahead of the
+        player, then evict the farthest ones while over the memory budget.
+        Far chunk surfaces go first; collision data of a far region is only
+        dropped if surfaces alone cannot bring usage under the budget.
+        """
+        if not self.streaming:
+            return
+
+        ahead = view.inflate(self.chunk_width, self.chunk_height)
+        keep = set()
+        for key in self._chunk_keys(ahead):
+            keep.add(key)
+            for group in self.LAYER_GROUPS:
+                if key not in self.layer_chunks[group]:
+                    self._store_chunk(group, key)
+
+        if self._resident_bytes <= self.memory_budget:
+            return
+
+        cx, cy = view.centerx / self.chunk_width, view.centery / self.chunk_height
+        far_first = sorted(
+            (key for key in self._regions if key not in keep),
+            key=lambda k: (k[0] + 0.5 - cx) ** 2 + (k[1] + 0.5 - cy) ** 2,
+            reverse=True
+        )
+        for key in far_first:
+            if self._resident_bytes <= self.memory_budget:
+                return
+            for group in self.LAYER_GROUPS:
+                self._drop_chunk(group, key)
+        for key in far_first:
+            if self._resident_bytes <= self.memory_budget:
+                return
+            self._unload_region(key)
+
+    def _bucket_rects(self, quads: np.ndarray) -> tuple:
+        """
+        Streaming: list the compiled rects by the regions they overlap, as
+        (quads, region ids, rect indices) sorted by region id. One numpy
+        pass over the rects; the tile layers are not read.
+        """
+        quads = np.asarray(quads, dtype=np.int64).reshape(-1, 4)
+        cols = max(1, -(-self.width // self.chunk_width))
+        x0 = quads[:, 0] // self.chunk_width
+        y0 = quads[:, 1] // self.chunk_height
+        nx = (quads[:, 0] + quads[:, 2] - 1) // self.chunk_width - x0 + 1
+        ny = (quads[:, 1] + quads[:, 3] - 1) // self.chunk_height - y0 + 1
+        spans = nx * ny
+        index = np.repeat(np.arange(len(quads)), spans)
+        step = np.arange(len(index)) - np.repeat(np.cumsum(spans) - spans, spans)
+        regions = (y0[index] + step // nx[index]) * cols + x0[index] + step % nx[index]
+        order = np.lexsort((index, regions))
+        return quads, regions[order], index[order]
+
+    def _ensure_region(self, key):
+        """
+        Index the collision rects overlapping one chunk-sized region.
+        Rects are the whole-map merged rects, shared by every region they
+        cross: each is inserted once, keyed by its level index, and stays
+        until the last region holding it is unloaded.
+        """
+        region = self._regions.get(key)
+        if region is not None:
+            return region
+
+        cx, cy = key
+        region_id = cy * max(1, -(-self.width // self.chunk_width)) + cx
+        region = {"ground": [], "obstacle": [], "bytes": 0}
+        for kind, (quads, regions, index) in self._region_rects.items():
+            lo, hi = np.searchsorted(regions, (region_id, region_id + 1))
+            ids = index[lo:hi].tolist()
+            resident = self._resident_rects[kind]
+            grid = self.collision_grids[kind]
+            added = False
+            for i in ids:
+                entry = resident.get(i)
+                if entry is None:
+                    rect = pygame.Rect(quads[i].tolist())
+                    entry = resident[i] = [rect, 0]
+                    grid.insert(rect, key=i)
+                    added = True
+                entry[1] += 1
+            if added:
+                self._sync_rect_list(kind)
+            region[kind] = ids
+            region["bytes"] += len(ids) * self.REGION_RECT_BYTES
+
+        self._regions[key] = region
+        self._resident_bytes += region["bytes"]
+        return region
+
+    def _unload_region(self, key):
+        for group in self.LAYER_GROUPS:
+            self._drop_chunk(group, key)
+
+        region = self._regions.pop(key, None)
+        if region is None:
+            return
+        for kind in ("ground", "obstacle"):
+            resident = self._resident_rects[kind]
+            removed = False
+            for i in region[kind]:
+                entry = resident[i]
+                entry[1] -= 1
+                if not entry[1]:
+                    del resident[i]
+                    self.collision_grids[kind].remove(i)
+                    removed = True
+            if removed:
+                self._sync_rect_list(kind)
+        self._resident_bytes -= region["bytes"]
+
+    def _sync_rect_list(self, kind: str):
+        """ Streaming: rebuild the rect list from the resident rects, in level order """
+        resident = self._resident_rects[kind]
+        self._rect_list(kind)[:] = [resident[i][0] for i in sorted(resident)]
+        self._rect_indexes.pop(kind, None)
+
+    def _rect_list(self, kind: str) -> list:
+        return self.ground_rects if kind == "ground" else self.obstacle_rects
+
+    def _store_chunk(self, group: str, key):
+        surf = self._bake_chunk(group, *key)
+        self.layer_chunks[group][key] = surf
+        if self.streaming and surf is not None:
+            size = surf.get_bytesize() * surf.get_width() * surf.get_height()
+            self._ensure_region(key)["bytes"] += size
+            self._resident_bytes += size
+
+    def _drop_chunk(self, group: str, key):
+        surf = self.layer_chunks[group].pop(key, None)
+        region = self._regions.get(key)
+        if surf is not None and region is not None:
+            size = surf.get_bytesize() * surf.get_width() * surf.get_height()
+            region["bytes"] -= size
+            self._resident_bytes -= size
+
+    def _group_layers(self, group: str) -> list:
+        if group == "background":
+            return self.background_layers
+        if group == "middle":
+            return self.middle_layers
+        return self.foreground_layers
+
+    def _chunk_keys(self, view: pygame.Rect):
+        """ Yield the (cx, cy) keys of every chunk that intersects view """
+        cols = -(-self.width // self.chunk_width)
+        rows = -(-self.height // self.chunk_height)
+        x0 = max(0, view.left // self.chunk_width)
+        y0 = max(0, view.top // self.chunk_height)
+        x1 = min(cols - 1, (view.right - 1) // self.chunk_width)
+        y1 = min(rows - 1, (view.bottom - 1) // self.chunk_height)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                yield cx, cy
+
+    def _bake_chunk(self, group: str, cx: int, cy: int):
+        """
+        Render one CHUNK_TILES x CHUNK_TILES block of a layer group into a
+        display-format surface, or return None if the block is empty.
+        The background group is opaque; middle and foreground keep alpha.
+        """
+        names = self._group_layers(group)
+        if not names:
+            return None
+
+        ox = cx * self.chunk_width
+        oy = cy * self.chunk_height
+        w = min(self.chunk_width, self.width - ox)
+        h = min(self.chunk_height, self.height - oy)
+        tx0, ty0 = cx * self.CHUNK_TILES, cy * self.CHUNK_TILES
+        tx1 = min(tx0 + self.CHUNK_TILES, self.map_width)
+        ty1 = min(ty0 + self.CHUNK_TILES, self.map_height)
+
+        if group == "background":
+            surf = pygame.Surface((w, h)).convert()
+            surf.fill((0, 0, 0))
+        else:
+            surf = pygame.Surface((w, h), pygame.SRCALPHA).convert_alpha()
+            surf.fill((0, 0, 0, 0))
+
+        drawn = False
+        for name in names:
+            if name in self.image_layers:
+                image, (lx, ly) = self.image_layers[name]
+                if surf.blit(image, (lx - ox, ly - oy)):
+                    drawn = True
+                continue
 
-        def draw_tiled_layer(name):
-            layer = self.tmx_data.get_layer_by_name(name)
-            for x, y, gid in layer:
-                tile = self.tmx_data.get_tile_image_by_gid(gid)
-                if tile:
-                    wx, wy = x * self.tile_width, y * self.tile_height
-                    sx, sy = camera.apply_pos(wx, wy)
-                    screen.blit(tile, (sx, sy))
-
-        for name in self.background_layers:
-            layer = self.tmx_data.get_layer_by_name(name)
-            if isinstance(layer, pytmx.TiledImageLayer):
-                img = layer.image
-                ox = getattr(layer, "offsetx", 0) or 0
-                oy = getattr(layer, "offsety", 0) or 0
-                screen.blit(img, camera.apply_pos(ox, oy))
-            else:
-                draw_tiled_layer(name)
-
-        for name in self.middle_layers:
-            draw_tiled_layer(name)
-
-        for name in self.foreground_layers:
-            draw_tiled_layer(name)
-
+            block = self.tile_layers[name][ty0:ty1, tx0:tx1].tolist()
+            for ty, row in enumerate(block, ty0):
+                for tx, gid in enumerate(row, tx0):
+                    if not gid:
+                        continue
+                    tile = self.tile_images[gid]
+                    if tile:
+                        surf.blit(tile, (tx * self.tile_width - ox, ty * self.tile_height - oy))
+                        drawn = True
+
+        return surf if drawn else None
+
+    def query_rect(self, rect: pygame.Rect, kind: str) -> list:
+        """
+        Return the "ground" or "obstacle" rects near rect, in level order.
+        Only the grid cells under rect are visited, so callers must still
+        run their own overlap test on the result. In streaming mode the
+        regions under rect are indexed on first use.
+        """
+        if self.streaming:
+            self.ensure_regions(rect)
+        return self.collision_grids[kind].query(rect)
+
+    def ensure_regions(self, rect: pygame.Rect):
+        """ Streaming: index the collision regions under rect not loaded yet """
+        for key in self._chunk_keys(rect):
+            if key not in self._regions:
+                self._ensure_region(key)
+
+    def rect_index(self, kind: str) -> ColumnIndex:
+        """
+        The "ground" or "obstacle" rects as a ColumnIndex for bulk overlap
+        tests, indexed like the rect list. Rebuilt when the resident
+        geometry changes; in streaming mode call ensure_regions first.
+        """
+        index = self._rect_indexes.get(kind)
+        if index is None:
+            rects = self._rect_list(kind)
+            array = np.array([tuple(r) for r in rects], dtype=np.int64).reshape(len(rects), 4)
+            index = self._rect_indexes[kind] = ColumnIndex(array, self.chunk_width or 1024)
+        return index
 
     def get_collision_rects(self):
         return self.ground_rects + self.obstacle_rects
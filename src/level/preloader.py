@@ -0,0 +1,73 @@
+import threading
+
+
+class LevelPreloader:
+    """
+    Loads one level in the background while another screen is showing.
+
+    The worker thread runs LevelManager.prepare_level (compiled level data,
+    image and GIF decoding). Display conversion and chunk baking must happen
+    on the main thread, so poll() then advances the install one short step
+    per call on a scratch LevelManager and finally hands the result to the
+    owner's LRU, ready for an instant load_level.
+    """
+
+    def __init__(self, level_manager, level_index: int):
+        self.level_manager = level_manager
+        self.level_index = level_index
+        self.done = False
+
+        self._thread = None
+        self._prepared = None
+        self._error = None
+        self._scratch = None
+        self._steps = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def _work(self):
+        try:
+            self._prepared = self.level_manager.prepare_level(self.level_index)
+        except Exception as e:
+            self._error = e
+
+    def poll(self) -> bool:
+        """
+        Main thread, once per frame. Returns True when the preload is over,
+        either with the level in the LRU or abandoned after an error (the
+        next load_level then falls back to a normal load).
+        """
+        if self.done:
+            return True
+        if self._thread.is_alive():
+            return False
+        if self._error is not None:
+            print(f"Error preloading level {self.level_index}: {self._error}")
+            self.done = True
+            return True
+
+        if self._steps is None:
+            owner = self.level_manager
+            self._scratch = type(owner)(
+                streaming=owner.streaming_setting,
+                memory_budget=owner.memory_budget,
+                cache_size=0
+            )
+            self._steps = self._scratch.install_steps(self.level_index, self._prepared)
+
+        try:
+            next(self._steps)
+        except StopIteration:
+            self.level_manager.adopt_level(self.level_index, self._scratch.snapshot())
+            self._scratch = self._steps = self._prepared = None
+            self.done = True
+        return self.done
+
+    def finish(self):
+        """ Block until the level is ready (or the preload failed) """
+        if self._thread is not None:
+            self._thread.join()
+        while not self.poll():
+            pass
@@ -0,0 +1,139 @@
+import pygame
+
+
+class SpatialGrid:
+    """
+    Uniform hash grid that buckets rects by the cells they overlap.
+
+    Queries only visit the cells under the query rect and return the
+    stored items in insertion order, so a caller that stops at the first
+    hit behaves exactly like a linear scan over the original list.
+    """
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._entries = {}
+        self._next_key = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _cell_range(self, rect: pygame.Rect):
+        cs = self.cell_size
+        return (
+            rect.left // cs,
+            rect.top // cs,
+            (rect.right - 1) // cs,
+            (rect.bottom - 1) // cs,
+        )
+
+    def insert(self, rect: pygame.Rect, item=None, key: int = None) -> int:
+        """
+        Add rect (or item, bounded by rect) to every cell it overlaps.
+        Returns a key that can be passed to remove() and move().
+
+        Queries list items by key, so items come back in insertion order
+        unless the caller picks its own keys; those must be unique.
+        """
+        if key is None:
+            key = self._next_key
+        self._next_key = max(self._next_key, key + 1)
+        bounds = pygame.Rect(rect)
+        self._entries[key] = (bounds, rect if item is None else item)
+        self._add_to_cells(key, self._cell_range(bounds))
+        return key
+
+    def remove(self, key: int):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._remove_from_cells(key, self._cell_range(entry[0]))
+
+    def move(self, key: int, rect: pygame.Rect):
+        """
+        Re-bound the entry under key to rect, keeping its place in query
+        order. Cells are only touched when rect reaches different ones.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        bounds = entry[0]
+        if bounds == rect:
+            return
+        old_cells = self._cell_range(bounds)
+        bounds.update(rect)
+        new_cells = self._cell_range(bounds)
+        if new_cells != old_cells:
+            self._remove_from_cells(key, old_cells)
+            self._add_to_cells(key, new_cells)
+
+    def _add_to_cells(self, key: int, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self.cells.setdefault((cx, cy), []).append(key)
+
+    def _remove_from_cells(self, key: int, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                bucket.remove(key)
+                if not bucket:
+                    del self.cells[(cx, cy)]
+
+    def clear(self):
+        self.cells.clear()
+        self._entries.clear()
+        self._next_key = 0
+
+    def query(self, rect: pygame.Rect) -> list:
+        """
+        Return every item whose cells intersect rect, in insertion order.
+        This is a broad test: callers still run their exact overlap check.
+        """
+        if rect.width <= 0 or rect.height <= 0:
+            return []
+
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        found = set()
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+
+        entries = self._entries
+        return [entries[key][1] for key in sorted(found)]
+
+
+class PlatformGroup(pygame.sprite.Group):
+    """
+    Sprite group whose members' rects are also kept in a SpatialGrid, so
+    callers can ask for the members near a rect instead of scanning them
+    all. Joining and leaving the group inserts and removes the rect;
+    update() re-buckets members that moved. platforms.query() returns
+    their rects in group order.
+    """
+
+    def __init__(self, *sprites, cell_size: int = 128):
+        self.platforms = SpatialGrid(cell_size)
+        self._keys = {}
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._keys[sprite] = self.platforms.insert(sprite.rect)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.platforms.remove(self._keys.pop(sprite))
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        for sprite, key in self._keys.items():
+            self.platforms.move(key, sprite.rect)
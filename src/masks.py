@@ -0,0 +1,34 @@
+import weakref
+
+import pygame
+
+
+class MaskRegistry:
+    """
+    Collision masks built once per surface and shared.
+
+    Sprite images come from AssetManager or an Animation, so many sprites
+    draw the same Surface object; its mask is computed the first time it
+    is asked for and dropped together with the surface.
+    """
+
+    _masks = weakref.WeakKeyDictionary()
+    _filled = {}
+
+    @classmethod
+    def get(cls, surface: pygame.Surface) -> pygame.Mask:
+        mask = cls._masks.get(surface)
+        if mask is None:
+            mask = pygame.mask.from_surface(surface)
+            cls._masks[surface] = mask
+        return mask
+
+    @classmethod
+    def filled(cls, size) -> pygame.Mask:
+        """ A fully solid mask of size, for rect-shaped triggers """
+        size = (int(size[0]), int(size[1]))
+        mask = cls._filled.get(size)
+        if mask is None:
+            mask = pygame.Mask(size, fill=True)
+            cls._filled[size] = mask
+        return mask
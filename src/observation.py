@@ -0,0 +1,102 @@
+import numpy as np
+import pygame
+
+_CHANNELS = (
+    pygame.surfarray.pixels_red,
+    pygame.surfarray.pixels_green,
+    pygame.surfarray.pixels_blue,
+)
+
+
+class PixelObserver:
+    """
+    Turns what is drawn on a surface into a NumPy observation.
+
+    Frames are read through pygame.surfarray views of the surface's own
+    pixels and copied once, straight into a preallocated buffer; there is
+    no intermediate bytes object as with pygame.image.tostring. With size
+    set, the frame is first smoothscaled into an offscreen target of that
+    size, and with grayscale it is converted in C by
+    pygame.transform.grayscale, so only the small frame is ever copied.
+
+    Observations are uint8, shaped (height, width, 3), or (height, width)
+    in grayscale, with a leading stack axis when stack > 1 (oldest frame
+    first). The returned array is a view of the buffer and is overwritten
+    by the next capture(); copy it to keep it, or pass out= to have the
+    observation written into an array of your own (e.g. shared memory).
+    """
+
+    def __init__(self, source: pygame.Surface, size=None, grayscale: bool = False,
+                 stack: int = 1):
+        """
+        source: the surface the game draws to
+        size: (width, height) to downscale to; None keeps the source size
+        grayscale: produce one luminance channel instead of RGB
+        stack: number of most recent frames in each observation
+        """
+        self.source = source
+        self.size = tuple(size) if size else source.get_size()
+        self.grayscale = grayscale
+        self.stack = stack
+
+        # Same format as the source, as required for smoothscale/grayscale
+        # destinations
+        self._scaled = None
+        if self.size != source.get_size():
+            self._scaled = pygame.Surface(self.size, 0, source)
+        self._gray = pygame.Surface(self.size, 0, source) if grayscale else None
+
+        w, h = self.size
+        frame = (h, w) if grayscale else (h, w, 3)
+        # Every frame is written twice, at i and i + stack, so the last
+        # `stack` frames are always one contiguous, ordered slice.
+        slots = 2 * stack if stack > 1 else 1
+        self._frames = np.zeros((slots,) + frame, np.uint8)
+        self._next = 0
+
+    @property
+    def shape(self) -> tuple:
+        frame = self._frames.shape[1:]
+        return (self.stack,) + frame if self.stack > 1 else frame
+
+    def reset(self):
+        """ Forget stacked history, e.g. at the start of an episode """
+        self._frames[:] = 0
+        self._next = 0
+
+    def capture(self, out: np.ndarray = None) -> np.ndarray:
+        """ Read the current contents of source into the observation buffer """
+        surf = self.source
+        if self._scaled is not None:
+            surf = pygame.transform.smoothscale(surf, self.size, self._scaled)
+        if self._gray is not None:
+            surf = pygame.transform.grayscale(surf, self._gray)
+
+        if self.stack == 1:
+            dest = self._frames[0] if out is None else out
+            self._copy_frame(surf, dest)
+            return dest
+
+        i = self._next
+        self._copy_frame(surf, self._frames[i])
+        self._frames[i + self.stack] = self._frames[i]
+        self._next = (i + 1) % self.stack
+        frames = self._frames[i + 1:i + 1 + self.stack]
+        if out is None:
+            return frames
+        np.copyto(out, frames)
+        return out
+
+    def _copy_frame(self, surf: pygame.Surface, dest: np.ndarray):
+        # surfarray views are (x, y) and swapping the axes is free. Copying
+        # one channel plane at a time keeps numpy's inner loop long, which
+        # is several times faster than copying a (y, x, 3) view at once.
+        if self._gray is not None:
+            view = pygame.surfarray.pixels_red(surf)
+            np.copyto(dest, view.swapaxes(0, 1))
+            del view  # unlocks the surface
+            return
+        for c, channel in enumerate(_CHANNELS):
+            view = channel(surf)
+            np.copyto(dest[..., c], view.swapaxes(0, 1))
+            del view
@@ -0,0 +1,138 @@
+import time
+from collections import deque
+
+import pygame
+
+from src.config import PROFILER_ENABLED, PROFILER_WINDOW
+
+
+class _Section:
+    __slots__ = ("samples", "start", "total")
+
+    def __init__(self, samples: deque):
+        self.samples = samples
+        self.start = 0.0
+        self.total = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.samples.append(elapsed)
+        self.total += elapsed
+        return False
+
+
+class _NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+def percentile(ordered: list, q: float):
+    """ Nearest-rank percentile (0 <= q <= 1) of an already sorted list """
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class Profiler:
+    """
+    Rolling timings of named sections of the frame.
+
+        with profiler.section("map"):
+            ...
+
+    Each section keeps its last `window` durations. stats() summarises
+    them (mean, p95, p99, max in milliseconds) for tests and tools, and
+    draw_overlay() shows the same table on screen. Sections are not
+    reentrant: the same name must not be nested in itself.
+    """
+
+    OVERLAY_REFRESH = 0.5   # seconds between overlay text updates
+
+    def __init__(self, enabled: bool = PROFILER_ENABLED, window: int = PROFILER_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.overlay_visible = False
+        self._samples = {}
+        self._sections = {}
+        self._overlay = None
+        self._overlay_time = 0.0
+        self._font = None
+
+    def section(self, name: str):
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            samples = deque(maxlen=self.window)
+            self._samples[name] = samples
+            section = self._sections[name] = _Section(samples)
+        return section
+
+    def reset(self):
+        for samples in self._samples.values():
+            samples.clear()
+
+    def stats(self) -> dict:
+        """ {section: {"count", "mean", "p95", "p99", "max"}}, times in ms """
+        result = {}
+        for name, samples in self._samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            n = len(ordered)
+            result[name] = {
+                "count": n,
+                "mean": sum(ordered) / n * 1000.0,
+                "p95": percentile(ordered, 0.95) * 1000.0,
+                "p99": percentile(ordered, 0.99) * 1000.0,
+                "max": ordered[-1] * 1000.0,
+            }
+        return result
+
+    def totals(self) -> dict:
+        """ {section: seconds spent in it since it was first timed} """
+        return {name: section.total for name, section in self._sections.items()}
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self._overlay = None
+
+    def draw_overlay(self, screen: pygame.Surface):
+        """ Blit the stats table in the top-right corner """
+        now = time.perf_counter()
+        if self._overlay is None or now - self._overlay_time >= self.OVERLAY_REFRESH:
+            self._overlay = self._render_overlay()
+            self._overlay_time = now
+        screen.blit(self._overlay, (screen.get_width() - self._overlay.get_width() - 8, 48))
+
+    def _render_overlay(self) -> pygame.Surface:
+        if self._font is None:
+            self._font = pygame.font.Font(None, 22)
+        rows = [("ms", "avg", "p95", "p99")]
+        for name, s in self.stats().items():
+            rows.append((name, f"{s['mean']:.2f}", f"{s['p95']:.2f}", f"{s['p99']:.2f}"))
+
+        # The font is proportional, so each cell is rendered on its own:
+        # names left-aligned, numbers right-aligned in fixed columns
+        cells = [[self._font.render(text, True, (255, 255, 255)) for text in row] for row in rows]
+        name_w = max(row[0].get_width() for row in cells) + 12
+        col_w = max(c.get_width() for row in cells for c in row[1:]) + 12
+        line_h = self._font.get_linesize()
+        panel = pygame.Surface((name_w + 3 * col_w + 12, line_h * len(rows) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, row in enumerate(cells):
+            y = 4 + i * line_h
+            panel.blit(row[0], (6, y))
+            for j, cell in enumerate(row[1:], 1):
+                panel.blit(cell, (6 + name_w + j * col_w - cell.get_width(), y))
+        return panel
@@ -1,81 +1,136 @@
 import os
+
+import numpy as np
 import pygame
 
+from src.assets import AssetManager
+from src.config import ARROW_POOL_SIZE
+from src.level.geometry import sweep
+from src.level.spatial_grid import SpatialGrid
+
+
+class _Slot:
+    """ Projectile attribute kept in the pool array of the same name """
+
+    def __init__(self, cast):
+        self.cast = cast
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, arrow, owner=None):
+        if arrow is None:
+            return self
+        return self.cast(getattr(arrow.pool, self.name)[arrow.slot])
+
+    def __set__(self, arrow, value):
+        getattr(arrow.pool, self.name)[arrow.slot] = value
+
 
 class Projectile(pygame.sprite.Sprite):
     """
     Represents an arrow projectile shot by the player.
-    Moves horizontally and is removed when it leaves the screen.
+    Moves horizontally and is removed when it leaves the level.
     Supports 'sticking' into surfaces or other sprites (e.g., boxes),
     and will follow a parent sprite if attached.
+
+    Arrows belong to a ProjectilePool, which keeps their motion state in
+    arrays and moves them all at once; the attributes below read and
+    write the arrow's slot in those arrays.
     """
 
-    def __init__(self, x: int, y: int, direction: int,
-                 speed: int = 1500, damage: int = 1):
+    IMAGE_PATH = os.path.join("assets", "images", "projectile", "arrow.png")
+    GRAVITY = 960
+    GROUND_LIFE = 12.5
+    FLASH_THRESHOLD = 2.5
+
+    direction = _Slot(int)
+    speed = _Slot(int)
+    vel_y = _Slot(float)
+    stuck = _Slot(bool)
+    stuck_on_wall = _Slot(bool)
+    stuck_on_ground = _Slot(bool)
+    ground_timer = _Slot(float)
+    visible = _Slot(bool)
+
+    def __init__(self, pool: "ProjectilePool", slot: int):
+        super().__init__()
+        self.pool = pool
+        self.slot = slot
+        self.image = AssetManager.image(self.IMAGE_PATH)
+        self.rect = self.image.get_rect()
+        self.prev_topleft = self.rect.topleft
+        self.damage = 1
+        self.world_width = None
+        self._parent = None
+        self.offset_x = 0
+        self.offset_y = 0
+
+    def reset(self, x: int, y: int, direction: int,
+              speed: int = 1200, damage: int = 1, world_width: int = None):
         """
+        Put the arrow in the state of a fresh shot (used by ProjectilePool)
+
         x, y: starting center position of the arrow
         direction: +1 for right, -1 for left
         speed: pixels per second
         damage: damage dealt to an enemy on hit
+        world_width: level width in pixels; defaults to the screen width
         """
-        super().__init__()
-
-        img_path = os.path.join("assets", "images", "projectile", "arrow.png")
-        self.image = pygame.image.load(img_path).convert_alpha()
         if direction < 0:
-            self.image = pygame.transform.flip(self.image, True, False)
+            self.image = AssetManager.flipped(self.IMAGE_PATH)
+        else:
+            self.image = AssetManager.image(self.IMAGE_PATH)
         self.rect = self.image.get_rect(center=(x, y))
+        # No previous simulated position to interpolate from yet
+        self.prev_topleft = self.rect.topleft
 
-        self.direction = direction
-        self.speed = speed
+        if world_width is None:
+            surface = pygame.display.get_surface()
+            world_width = surface.get_width() if surface else None
         self.damage = damage
+        self.world_width = world_width
+        self.parent = None
+        self.offset_x = 0
+        self.offset_y = 0
 
-        self.vel_y = 0
-        self.gravity = 1500
-
+        pool, slot = self.pool, self.slot
+        pool.x[slot], pool.y[slot] = self.rect.topleft
+        pool.sweep_x[slot], pool.sweep_y[slot] = self.rect.topleft
+        pool.w[slot], pool.h[slot] = self.rect.size
+        pool.world_width[slot] = np.inf if world_width is None else world_width
+        self.direction = direction
+        self.speed = speed
+        self.vel_y = 0.0
         self.stuck = False
         self.stuck_on_wall = False
         self.stuck_on_ground = False
         self.ground_timer = 0.0
-        self.ground_life = 10.0
-        self.flash_threshold = 2.0
         self.visible = True
 
+    @property
+    def parent(self):
+        return self._parent
 
-        self.parent = None
-        self.offset_x = 0
-        self.offset_y = 0
+    @parent.setter
+    def parent(self, sprite):
+        self._parent = sprite
+        self.pool.attached[self.slot] = sprite is not None
 
     def update(self, dt: float):
+        mask = np.zeros(self.pool.capacity, dtype=bool)
+        mask[self.slot] = True
+        self.pool.update(dt, mask)
 
-        if self.parent is not None:
-            self.rect.x = self.parent.rect.x + self.offset_x
-            self.rect.y = self.parent.rect.y + self.offset_y
-            return
-
-        dt = dt * 0.4
+    def follow_parent(self):
+        self.rect.x = self._parent.rect.x + self.offset_x
+        self.rect.y = self._parent.rect.y + self.offset_y
+        self._store_rect()
+        self.pool.platforms.move(int(self.pool.shot[self.slot]), self.rect)
 
-        if not self.stuck:
-
-            self.rect.x += int(self.direction * self.speed * dt)
-            self.vel_y += self.gravity * dt
-            self.rect.y += int(self.vel_y * dt)
-        else:
-
-            self.ground_timer += dt
-            time_left = self.ground_life - self.ground_timer
-            if time_left <= self.flash_threshold:
-
-                self.visible = (int(self.ground_timer * 5) % 2 == 0)
-            if self.ground_timer >= self.ground_life:
-                self.kill()
-            return
-
-        surface = pygame.display.get_surface()
-        if surface:
-            sw = surface.get_width()
-            if self.rect.right < 0 or self.rect.left > sw:
-                self.kill()
+    def kill(self):
+        super().kill()
+        self.pool.release(self)
 
     def stick(self, hit_rect: pygame.Rect):
         """
@@ -84,12 +139,14 @@ class Projectile(pygame.sprite.Sprite):
         """
         self.stuck = True
         self.stuck_on_wall = True
-        self.vel_y = 0
+        self.vel_y = 0.0
 
         if self.direction > 0:
             self.rect.right = hit_rect.left + 10
         else:
             self.rect.left = hit_rect.right - 10
+        self._store_rect()
+        self.pool.add_platform(self)
 
         self.ground_timer = 0.0
         self.visible = True
@@ -101,7 +158,209 @@ class Projectile(pygame.sprite.Sprite):
         """
         self.stuck = True
         self.stuck_on_ground = True
-        self.vel_y = 0
+        self.vel_y = 0.0
         self.rect.bottom = ground_rect.top
+        self._store_rect()
         self.ground_timer = 0.0
         self.visible = True
+
+    def _store_rect(self):
+        self.pool.x[self.slot], self.pool.y[self.slot] = self.rect.topleft
+
+
+class ProjectilePool:
+    """
+    A fixed set of arrows reused shot after shot, so rapid fire does not
+    allocate sprites or churn the GC.
+
+    acquire() hands out a free arrow reset for a new shot; arrows come
+    back on their own when killed (off the level, expired, hit an enemy).
+    When every arrow is in use the one that has been stuck the longest is
+    recycled; if none is stuck the shot is refused and acquire() returns
+    None.
+
+    Positions, velocities and stuck state live in arrays indexed by slot,
+    so update() integrates every arrow in one vectorized step and collide()
+    sweeps them in bulk against boxes and the level geometry. Sprite rects
+    are written back for the arrows that moved.
+
+    Arrows stuck in a wall are one-way platforms for the player. They are
+    kept in the platforms grid from stick() until they are released,
+    keyed by shot number so queries list them oldest shot first.
+    """
+
+    def __init__(self, capacity: int = ARROW_POOL_SIZE):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.int64)
+        self.y = np.zeros(capacity, dtype=np.int64)
+        # Where each arrow was when collide() last swept it
+        self.sweep_x = np.zeros(capacity, dtype=np.int64)
+        self.sweep_y = np.zeros(capacity, dtype=np.int64)
+        self.w = np.zeros(capacity, dtype=np.int64)
+        self.h = np.zeros(capacity, dtype=np.int64)
+        self.direction = np.ones(capacity, dtype=np.int64)
+        self.speed = np.zeros(capacity)
+        self.vel_y = np.zeros(capacity)
+        self.world_width = np.full(capacity, np.inf)
+        self.ground_timer = np.zeros(capacity)
+        self.stuck = np.zeros(capacity, dtype=bool)
+        self.stuck_on_wall = np.zeros(capacity, dtype=bool)
+        self.stuck_on_ground = np.zeros(capacity, dtype=bool)
+        self.visible = np.ones(capacity, dtype=bool)
+        self.attached = np.zeros(capacity, dtype=bool)
+        self.live = np.zeros(capacity, dtype=bool)
+        # Shot number of each slot, to keep oldest-first order
+        self.shot = np.zeros(capacity, dtype=np.int64)
+        self._shots = 0
+        self.platforms = SpatialGrid()
+        self._count = 0
+
+        self.arrows = [Projectile(self, slot) for slot in range(capacity)]
+        self._free = list(self.arrows)
+
+    def __len__(self):
+        return self._count
+
+    def acquire(self, x: int, y: int, direction: int, **kwargs):
+        """ An arrow reset with Projectile.reset's arguments, or None """
+        if self._free:
+            arrow = self._free.pop()
+        else:
+            arrow = self._oldest_stuck()
+            if arrow is None:
+                return None
+            # Out of its groups without coming back to the free list
+            pygame.sprite.Sprite.kill(arrow)
+            self.platforms.remove(int(self.shot[arrow.slot]))
+            self._count -= 1
+        arrow.reset(x, y, direction, **kwargs)
+        self.live[arrow.slot] = True
+        self.shot[arrow.slot] = self._shots
+        self._shots += 1
+        self._count += 1
+        return arrow
+
+    def release(self, arrow: Projectile):
+        if self.live[arrow.slot]:
+            self.live[arrow.slot] = False
+            arrow.parent = None
+            self.platforms.remove(int(self.shot[arrow.slot]))
+            self._free.append(arrow)
+            self._count -= 1
+
+    def add_platform(self, arrow: Projectile):
+        """ Let the player stand on arrow, which has stuck in a wall """
+        self.platforms.insert(arrow.rect, key=int(self.shot[arrow.slot]))
+
+    def live_slots(self, mask: np.ndarray = None) -> np.ndarray:
+        """ Slots of the live arrows (within mask), oldest shot first """
+        slots = np.flatnonzero(self.live if mask is None else self.live & mask)
+        return slots[np.argsort(self.shot[slots], kind="stable")]
+
+    def update(self, dt: float, mask: np.ndarray = None):
+        """
+        Advance the live arrows (or those selected by mask) by dt: flying
+        arrows move and fall, stuck ones count down to expiry and flash
+        near the end, and arrows attached to a sprite follow it.
+        PlayState calls it once per tick, before collide().
+        """
+        if not self._count:
+            return
+        live = self.live if mask is None else self.live & mask
+
+        for slot in np.flatnonzero(live & self.attached):
+            self.arrows[slot].follow_parent()
+
+        flying = np.flatnonzero(live & ~self.stuck)
+        if len(flying):
+            self.x[flying] += np.trunc(self.direction[flying] * self.speed[flying] * dt).astype(np.int64)
+            self.vel_y[flying] += Projectile.GRAVITY * dt
+            self.y[flying] += np.trunc(self.vel_y[flying] * dt).astype(np.int64)
+            self._sync_rects(flying)
+            x = self.x[flying]
+            gone = (x + self.w[flying] < 0) | (x > self.world_width[flying])
+            for slot in flying[gone]:
+                self.arrows[slot].kill()
+
+        resting = np.flatnonzero(live & self.stuck & ~self.attached)
+        if len(resting):
+            self.ground_timer[resting] += dt
+            timer = self.ground_timer[resting]
+            flashing = Projectile.GROUND_LIFE - timer <= Projectile.FLASH_THRESHOLD
+            self.visible[resting[flashing]] = np.trunc(timer[flashing] * 4).astype(np.int64) % 2 == 0
+            for slot in resting[timer >= Projectile.GROUND_LIFE]:
+                self.arrows[slot].kill()
+
+    def collide(self, boxes, level_manager, impulse: int = 400):
+        """
+        Stick flying arrows into boxes and level geometry, continuously:
+        each arrow is swept from where the previous collide() left it to
+        where it is now and stops at the first surface it touches on the
+        way, however far it moved. It is put at the contact point, then
+        side faces of boxes and obstacles take the tip like stick(), and
+        tops (and any face of the one-way ground) catch it like
+        stick_vertical(); arrows only fall, so nothing is hit from below.
+        Arrows hitting a box ride along with it, and side hits push it.
+        Simultaneous hits go to boxes, then obstacles, then ground, each in
+        group or level order.
+        """
+        if not self._count:
+            return
+        flying = self.live_slots(~self.stuck)
+        if not len(flying):
+            return
+
+        start = np.column_stack((self.sweep_x[flying], self.sweep_y[flying],
+                                 self.w[flying], self.h[flying]))
+        delta = np.column_stack((self.x[flying] - self.sweep_x[flying],
+                                 self.y[flying] - self.sweep_y[flying]))
+        if level_manager.streaming:
+            for (x, y, w, h), (dx, dy) in zip(start.tolist(), delta.tolist()):
+                level_manager.ensure_regions(
+                    pygame.Rect(x + min(dx, 0), y + min(dy, 0), w + abs(dx), h + abs(dy))
+                )
+
+        boxes = list(boxes)
+        box_rects = np.array([tuple(box.rect) for box in boxes], dtype=np.int64).reshape(len(boxes), 4)
+        targets = (
+            ([box.rect for box in boxes], sweep(start, delta, box_rects)),
+            (level_manager.get_obstacle_rects(), level_manager.rect_index("obstacle").sweep(start, delta)),
+            (level_manager.get_ground_rects(), level_manager.rect_index("ground").sweep(start, delta)),
+        )
+        times = np.stack([toi for _, (toi, _, _) in targets])
+        kinds = times.argmin(axis=0)
+        for row in np.flatnonzero(np.isfinite(times.min(axis=0))).tolist():
+            kind = kinds[row]
+            rects, (toi, index, normal) = targets[kind]
+            arrow = self.arrows[flying[row]]
+            t = toi[row]
+            arrow.rect.topleft = (round(start[row, 0] + t * delta[row, 0]),
+                                  round(start[row, 1] + t * delta[row, 1]))
+            rect = rects[index[row]]
+            # Ground is one-way and has no walls: arrows hitting its side land on it
+            side = normal[row, 0] != 0 and kind != 2
+            if side:
+                arrow.stick(rect)
+            else:
+                arrow.stick_vertical(rect)
+            if kind == 0:
+                box = boxes[index[row]]
+                arrow.parent = box
+                arrow.offset_x = arrow.rect.x - box.rect.x
+                arrow.offset_y = arrow.rect.y - box.rect.y
+                if side:
+                    box.vel_x += arrow.direction * impulse
+
+        self.sweep_x[flying] = self.x[flying]
+        self.sweep_y[flying] = self.y[flying]
+
+    def _sync_rects(self, slots: np.ndarray):
+        arrows = self.arrows
+        for slot, x, y in zip(slots.tolist(), self.x[slots].tolist(), self.y[slots].tolist()):
+            arrows[slot].rect.topleft = (x, y)
+
+    def _oldest_stuck(self):
+        slots = self.live_slots(self.stuck)
+        if not len(slots):
+            return None
+        return self.arrows[slots[np.argmax(self.ground_timer[slots])]]
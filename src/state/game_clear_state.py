@@ -1,6 +1,7 @@
 
 import os
 import pygame
+from src.assets import AssetManager
 from src.state.base_state import GameState
 from src.persistence import SaveManager
 
@@ -11,13 +12,14 @@ class GameClearState(GameState):
         self.screen_width, self.screen_height = game.screen.get_size()
 
         bg_path = os.path.join("assets", "images", "level", "background_3.png")
-        self.bg_image = pygame.image.load(bg_path).convert()
+        self.bg_image = AssetManager.scaled(
+            bg_path, (self.screen_width, self.screen_height), smooth=False, alpha=False
+        )
 
         gloopie_path = os.path.join("assets", "images", "main_menu", "gloopie.png")
-        graw = pygame.image.load(gloopie_path).convert_alpha()
         gw = int(self.screen_width * 0.30)
         gh = int(self.screen_height * 0.28)
-        self.gloopie_image = pygame.transform.smoothscale(graw, (gw, gh))
+        self.gloopie_image = AssetManager.scaled(gloopie_path, (gw, gh))
         self.gloopie_rect = self.gloopie_image.get_rect(center=(
             self.screen_width // 2,
             int(self.screen_height * 0.15)
@@ -31,8 +33,6 @@ class GameClearState(GameState):
 
         normal_path = os.path.join("assets", "images", "level", "buttons", "normal.png")
         hover_path = os.path.join("assets", "images", "level", "buttons", "hover.png")
-        normal_raw = pygame.image.load(normal_path).convert_alpha()
-        hover_raw = pygame.image.load(hover_path).convert_alpha()
 
         btn_w = int(self.screen_width * 0.28)
         btn_h = int(self.screen_height * 0.12)
@@ -48,8 +48,8 @@ class GameClearState(GameState):
         bx = overlay_x + (overlay_w - btn_w) // 2 - 0.028 * self.screen_width
         self.single_rect = pygame.Rect(bx, y_btn, btn_w, btn_h)
 
-        self.btn_normal = pygame.transform.smoothscale(normal_raw, (btn_w, btn_h))
-        self.btn_hover = pygame.transform.smoothscale(hover_raw, (btn_w, btn_h))
+        self.btn_normal = AssetManager.scaled(normal_path, (btn_w, btn_h))
+        self.btn_hover = AssetManager.scaled(hover_path, (btn_w, btn_h))
 
         self.btn1_hover = False
         self.btn2_hover = False
@@ -68,30 +68,15 @@ class GameClearState(GameState):
 
         self.icon_h = 36
         self.star_h = 78
-        self.heart_full = pygame.transform.smoothscale(
-            pygame.image.load(os.path.join("assets", "images", "level", "hud", "heart.png")).convert_alpha(),
-            (self.icon_h, self.icon_h)
-        )
-        self.heart_empty = pygame.transform.smoothscale(
-            pygame.image.load(os.path.join("assets", "images", "level", "hud", "heart_gray.png")).convert_alpha(),
-            (self.icon_h, self.icon_h)
-        )
-        self.gem_full = pygame.transform.smoothscale(
-            pygame.image.load(os.path.join("assets", "images", "level", "gem", "gem.png")).convert_alpha(),
-            (self.icon_h, self.icon_h)
-        )
-        self.gem_empty = pygame.transform.smoothscale(
-            pygame.image.load(os.path.join("assets", "images", "level", "gem", "gem_gray.png")).convert_alpha(),
-            (self.icon_h, self.icon_h)
-        )
-        self.star_full = pygame.transform.smoothscale(
-            pygame.image.load(os.path.join("assets", "images", "level", "star", "1.png")).convert_alpha(),
-            (self.star_h, self.star_h)
-        )
-        self.star_empty = pygame.transform.smoothscale(
-            pygame.image.load(os.path.join("assets", "images", "level", "star", "2.png")).convert_alpha(),
-            (self.star_h, self.star_h)
-        )
+        icon = (self.icon_h, self.icon_h)
+        star = (self.star_h, self.star_h)
+        level_dir = os.path.join("assets", "images", "level")
+        self.heart_full = AssetManager.scaled(os.path.join(level_dir, "hud", "heart.png"), icon)
+        self.heart_empty = AssetManager.scaled(os.path.join(level_dir, "hud", "heart_gray.png"), icon)
+        self.gem_full = AssetManager.scaled(os.path.join(level_dir, "gem", "gem.png"), icon)
+        self.gem_empty = AssetManager.scaled(os.path.join(level_dir, "gem", "gem_gray.png"), icon)
+        self.star_full = AssetManager.scaled(os.path.join(level_dir, "star", "1.png"), star)
+        self.star_empty = AssetManager.scaled(os.path.join(level_dir, "star", "2.png"), star)
 
         self.font_title = None
         self.font_option = None
@@ -113,9 +98,13 @@ class GameClearState(GameState):
 
         if self.level_index < len(prog["ratings"]) and self.level_index + 1 > prog["unlocked"]:
             prog["unlocked"] = self.level_index + 1
-        SaveManager.save_progress(prog)
+        # Headless runs never touch the player's save files
+        if not self.game.headless:
+            SaveManager.save_progress(prog)
 
         self.is_last = (self.level_index == len(prog["ratings"]))
+        if not self.is_last and not self.game.headless:
+            self.game.states["play"].level_manager.preload(self.level_index + 1)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -141,6 +130,9 @@ class GameClearState(GameState):
             self.game.change_state("main_menu")
 
     def update(self, dt):
+        if not self.is_last:
+            self.game.states["play"].level_manager.poll_preload()
+
         mx, my = pygame.mouse.get_pos()
         if self.is_last:
             self.single_hover = self.single_rect.collidepoint(mx, my)
@@ -150,8 +142,7 @@ class GameClearState(GameState):
 
     def draw(self, screen):
 
-        bg = pygame.transform.scale(self.bg_image, (self.screen_width, self.screen_height))
-        screen.blit(bg, (0, 0))
+        screen.blit(self.bg_image, (0, 0))
 
         overlay = pygame.Surface((self.overlay_rect.w, self.overlay_rect.h), pygame.SRCALPHA)
         pygame.draw.rect(overlay, (255, 255, 255, 153), overlay.get_rect(), border_radius=25)
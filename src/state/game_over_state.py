@@ -2,6 +2,7 @@
 
 import os
 import pygame
+from src.assets import AssetManager
 from src.state.base_state import GameState
 
 
@@ -14,10 +15,9 @@ class GameOverState(GameState):
         self.level_index = None
 
         gloopie_path = os.path.join("assets", "images", "main_menu", "gloopie.png")
-        graw = pygame.image.load(gloopie_path).convert_alpha()
         gw = int(self.screen_width * 0.30)
         gh = int(self.screen_height * 0.28)
-        self.gloopie_image = pygame.transform.smoothscale(graw, (gw, gh))
+        self.gloopie_image = AssetManager.scaled(gloopie_path, (gw, gh))
         self.gloopie_rect = self.gloopie_image.get_rect(center=(
             self.screen_width // 2,
             int(self.screen_height * 0.20)
@@ -31,8 +31,6 @@ class GameOverState(GameState):
 
         normal_path = os.path.join("assets", "images", "level", "buttons", "normal.png")
         hover_path = os.path.join("assets", "images", "level", "buttons", "hover.png")
-        normal_raw = pygame.image.load(normal_path).convert_alpha()
-        hover_raw = pygame.image.load(hover_path).convert_alpha()
 
         btn_w = int(self.screen_width * 0.28)
         btn_h = int(self.screen_height * 0.12)
@@ -45,8 +43,8 @@ class GameOverState(GameState):
         self.btn1_rect = pygame.Rect(x1, y_btn, btn_w, btn_h)
         self.btn2_rect = pygame.Rect(x2, y_btn, btn_w, btn_h)
 
-        self.btn_normal = pygame.transform.smoothscale(normal_raw, (btn_w, btn_h))
-        self.btn_hover = pygame.transform.smoothscale(hover_raw, (btn_w, btn_h))
+        self.btn_normal = AssetManager.scaled(normal_path, (btn_w, btn_h))
+        self.btn_hover = AssetManager.scaled(hover_path, (btn_w, btn_h))
 
         self.btn1_hover = False
         self.btn2_hover = False
@@ -67,7 +65,9 @@ class GameOverState(GameState):
             bg_file = "background_3.png"
 
         bg_path = os.path.join("assets", "images", "level", bg_file)
-        self.bg_image = pygame.image.load(bg_path).convert()
+        self.bg_image = AssetManager.scaled(
+            bg_path, (self.screen_width, self.screen_height), smooth=False, alpha=False
+        )
 
         pygame.font.init()
         fp = os.path.join("assets", "fonts", "PixelFun-Regular.ttf")
@@ -94,8 +94,7 @@ class GameOverState(GameState):
 
     def draw(self, screen):
 
-        bg = pygame.transform.scale(self.bg_image, (self.screen_width, self.screen_height))
-        screen.blit(bg, (0, 0))
+        screen.blit(self.bg_image, (0, 0))
 
         overlay = pygame.Surface((self.overlay_rect.w, self.overlay_rect.h), pygame.SRCALPHA)
         pygame.draw.rect(overlay, (255, 255, 255, 153), overlay.get_rect(), border_radius=25)
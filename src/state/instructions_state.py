@@ -1,4 +1,5 @@
 import pygame
+from src.assets import AssetManager
 from src.state.base_state import GameState
 
 
@@ -13,10 +14,7 @@ class InstructionsState(GameState):
         self.text_font = pygame.font.Font(fp, 40)
 
         bg_path = "assets/images/instructions/background.png"
-        self.bg = pygame.transform.smoothscale(
-            pygame.image.load(bg_path).convert_alpha(),
-            (self.screen_width, self.screen_height)
-        )
+        self.bg = AssetManager.scaled(bg_path, (self.screen_width, self.screen_height))
         self.lines = [
             "",
             "Story: ",
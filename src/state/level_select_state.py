@@ -2,6 +2,7 @@
 
 import os
 import pygame
+from src.assets import AssetManager
 from src.state.base_state import GameState
 from src.persistence import SaveManager
 from src.config import TOTAL_LEVELS
@@ -13,34 +14,23 @@ class LevelSelectState(GameState):
 
         self.screen_width, self.screen_height = self.game.screen.get_size()
 
-        bg_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "background.png")
-        ).convert_alpha()
-        self.background = pygame.transform.smoothscale(
-            bg_raw,
+        image_dir = os.path.join("assets", "images", "level_select")
+        self.background = AssetManager.scaled(
+            os.path.join(image_dir, "background.png"),
             (self.screen_width, self.screen_height)
         )
 
-        title_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "title.png")
-        ).convert_alpha()
         title_w = int(self.screen_width * 0.47)
         title_h = int(self.screen_height * 0.097)
-        self.title_image = pygame.transform.smoothscale(title_raw, (title_w, title_h))
+        self.title_image = AssetManager.scaled(os.path.join(image_dir, "title.png"), (title_w, title_h))
         title_x = int(self.screen_width * 0.265)
         title_y = int(self.screen_height * 0.081)
         self.title_rect = pygame.Rect(title_x, title_y, title_w, title_h)
 
-        star_lit_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "star", "1.png")
-        ).convert_alpha()
-        star_unlit_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "star", "2.png")
-        ).convert_alpha()
         star_w = int(self.screen_width * 0.0259)
         star_h = int(self.screen_height * 0.0369)
-        self.star_lit = pygame.transform.smoothscale(star_lit_raw, (star_w, star_h))
-        self.star_unlit = pygame.transform.smoothscale(star_unlit_raw, (star_w, star_h))
+        self.star_lit = AssetManager.scaled(os.path.join(image_dir, "star", "1.png"), (star_w, star_h))
+        self.star_unlit = AssetManager.scaled(os.path.join(image_dir, "star", "2.png"), (star_w, star_h))
 
         self.level_buttons = []
         btn_w = int(self.screen_width * 0.074)
@@ -50,19 +40,9 @@ class LevelSelectState(GameState):
         x_offset = int(self.screen_width * 0.135)
         y_offset = int(self.screen_height * 0.18)
 
-        btn_normal_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "level", "1.png")
-        ).convert_alpha()
-        btn_hover_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "level", "2.png")
-        ).convert_alpha()
-        self.btn_img_normal = pygame.transform.smoothscale(btn_normal_raw, (btn_w, btn_h))
-        self.btn_img_hover = pygame.transform.smoothscale(btn_hover_raw, (btn_w, btn_h))
-
-        btn_locked_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "level", "3.png")
-        ).convert_alpha()
-        self.btn_img_locked = pygame.transform.smoothscale(btn_locked_raw, (btn_w, btn_h))
+        self.btn_img_normal = AssetManager.scaled(os.path.join(image_dir, "level", "1.png"), (btn_w, btn_h))
+        self.btn_img_hover = AssetManager.scaled(os.path.join(image_dir, "level", "2.png"), (btn_w, btn_h))
+        self.btn_img_locked = AssetManager.scaled(os.path.join(image_dir, "level", "3.png"), (btn_w, btn_h))
 
         for i in range(TOTAL_LEVELS):
             row = i // 5
@@ -93,16 +73,10 @@ class LevelSelectState(GameState):
 
         self.unlocked = 1
 
-        back_normal_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "back", "1.png")
-        ).convert_alpha()
-        back_hover_raw = pygame.image.load(
-            os.path.join("assets", "images", "level_select", "back", "2.png")
-        ).convert_alpha()
         back_w = int(self.screen_width * 0.05)
         back_h = int(self.screen_height * 0.056)
-        self.back_img_normal = pygame.transform.smoothscale(back_normal_raw, (back_w, back_h))
-        self.back_img_hover = pygame.transform.smoothscale(back_hover_raw, (back_w, back_h))
+        self.back_img_normal = AssetManager.scaled(os.path.join(image_dir, "back", "1.png"), (back_w, back_h))
+        self.back_img_hover = AssetManager.scaled(os.path.join(image_dir, "back", "2.png"), (back_w, back_h))
         back_x = int(self.screen_width * 0.11)
         back_y = int(self.screen_height * 0.8)
         self.back_button_rect = pygame.Rect(back_x, back_y, back_w, back_h)
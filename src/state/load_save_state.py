@@ -6,6 +6,7 @@ import json
 import time
 import hashlib
 import base64
+from src.assets import AssetManager
 from src.state.base_state import GameState
 from src.persistence import SaveManager
 
@@ -15,20 +16,20 @@ class LoadSaveState(GameState):
         super().__init__(game)
         self.screen_width, self.screen_height = self.game.screen.get_size()
 
-        bg_raw = pygame.image.load("assets/images/load_save/background.png").convert_alpha()
-        self.background = pygame.transform.smoothscale(bg_raw, (self.screen_width, self.screen_height))
-        title_raw = pygame.image.load("assets/images/load_save/title.png").convert_alpha()
+        bg_path = "assets/images/load_save/background.png"
+        self.background = AssetManager.scaled(bg_path, (self.screen_width, self.screen_height))
+        title_path = "assets/images/load_save/title.png"
         tw = int(self.screen_width * 0.47)
         th = int(self.screen_height * 0.097)
-        self.title_image = pygame.transform.smoothscale(title_raw, (tw, th))
+        self.title_image = AssetManager.scaled(title_path, (tw, th))
         tx = int(self.screen_width * 0.265)
         ty = int(self.screen_height * 0.081)
         self.title_rect = pygame.Rect(tx, ty, tw, th)
 
-        info_raw = pygame.image.load("assets/images/load_save/load_info.png").convert_alpha()
+        info_path = "assets/images/load_save/load_info.png"
         self.info_w = int(self.screen_width * 0.13)
         self.info_h = int(self.screen_height * 0.195)
-        self.info_image = pygame.transform.smoothscale(info_raw, (self.info_w, self.info_h))
+        self.info_image = AssetManager.scaled(info_path, (self.info_w, self.info_h))
 
         self.save_slots = []
         base_x = int(self.screen_width * 0.17)
@@ -48,20 +49,20 @@ class LoadSaveState(GameState):
             }
             self.save_slots.append([rect, save_data])
 
-        load0 = pygame.image.load("assets/images/load_save/button/1.png").convert_alpha()
-        load1 = pygame.image.load("assets/images/load_save/button/2.png").convert_alpha()
-        del0 = pygame.image.load("assets/images/load_save/button/3.png").convert_alpha()
-        del1 = pygame.image.load("assets/images/load_save/button/4.png").convert_alpha()
-        ld = pygame.image.load("assets/images/load_save/button/5.png").convert_alpha()
-        dd = pygame.image.load("assets/images/load_save/button/6.png").convert_alpha()
+        load_path = "assets/images/load_save/button/1.png"
+        load_hover_path = "assets/images/load_save/button/2.png"
+        delete_path = "assets/images/load_save/button/3.png"
+        delete_hover_path = "assets/images/load_save/button/4.png"
+        load_disabled_path = "assets/images/load_save/button/5.png"
+        delete_disabled_path = "assets/images/load_save/button/6.png"
         bw = int(self.screen_width * 0.06)
         bh = int(self.screen_height * 0.045)
-        self.load_btn_img_normal = pygame.transform.smoothscale(load0, (bw, bh))
-        self.load_btn_img_hover = pygame.transform.smoothscale(load1, (bw, bh))
-        self.load_btn_img_disabled = pygame.transform.smoothscale(ld, (bw, bh))
-        self.delete_btn_img_normal = pygame.transform.smoothscale(del0, (bw, bh))
-        self.delete_btn_img_hover = pygame.transform.smoothscale(del1, (bw, bh))
-        self.delete_btn_img_disabled = pygame.transform.smoothscale(dd, (bw, bh))
+        self.load_btn_img_normal = AssetManager.scaled(load_path, (bw, bh))
+        self.load_btn_img_hover = AssetManager.scaled(load_hover_path, (bw, bh))
+        self.load_btn_img_disabled = AssetManager.scaled(load_disabled_path, (bw, bh))
+        self.delete_btn_img_normal = AssetManager.scaled(delete_path, (bw, bh))
+        self.delete_btn_img_hover = AssetManager.scaled(delete_hover_path, (bw, bh))
+        self.delete_btn_img_disabled = AssetManager.scaled(delete_disabled_path, (bw, bh))
 
         spacing = int(self.screen_width * 0.01)
         self.slot_buttons = []
@@ -73,29 +74,29 @@ class LoadSaveState(GameState):
             dr = pygame.Rect(lx + bw + spacing, ly, bw, bh)
             self.slot_buttons.append([lr, dr, False, False])
 
-        a0 = pygame.image.load("assets/images/load_save/button/add_0.png").convert_alpha()
-        a1 = pygame.image.load("assets/images/load_save/button/add_1.png").convert_alpha()
+        add_path = "assets/images/load_save/button/add_0.png"
+        add_hover_path = "assets/images/load_save/button/add_1.png"
         sz = int(self.screen_height * 0.056)
-        self.add_img_normal = pygame.transform.smoothscale(a0, (sz, sz))
-        self.add_img_hover = pygame.transform.smoothscale(a1, (sz, sz))
+        self.add_img_normal = AssetManager.scaled(add_path, (sz, sz))
+        self.add_img_hover = AssetManager.scaled(add_hover_path, (sz, sz))
         ax = int(self.screen_width * 0.486)
         ay = int(self.screen_height * 0.8)
         self.add_rect = pygame.Rect(ax, ay, sz, sz)
         self.add_hover = False
 
-        cross0 = pygame.image.load("assets/images/load_save/button/cross.png").convert_alpha()
-        cross1 = pygame.image.load("assets/images/load_save/button/cross_hover.png").convert_alpha()
+        cross_path = "assets/images/load_save/button/cross.png"
+        cross_hover_path = "assets/images/load_save/button/cross_hover.png"
 
         self.cross_size = int(self.screen_height * 0.05)
-        self.cross_img_normal = pygame.transform.smoothscale(cross0, (self.cross_size, self.cross_size))
-        self.cross_img_hover = pygame.transform.smoothscale(cross1, (self.cross_size, self.cross_size))
+        self.cross_img_normal = AssetManager.scaled(cross_path, (self.cross_size, self.cross_size))
+        self.cross_img_hover = AssetManager.scaled(cross_hover_path, (self.cross_size, self.cross_size))
 
-        b0 = pygame.image.load("assets/images/load_save/back/1.png").convert_alpha()
-        b1 = pygame.image.load("assets/images/load_save/back/2.png").convert_alpha()
+        back_path = "assets/images/load_save/back/1.png"
+        back_hover_path = "assets/images/load_save/back/2.png"
         bw2 = int(self.screen_width * 0.05)
         bh2 = int(self.screen_height * 0.056)
-        self.back_img_normal = pygame.transform.smoothscale(b0, (bw2, bh2))
-        self.back_img_hover = pygame.transform.smoothscale(b1, (bw2, bh2))
+        self.back_img_normal = AssetManager.scaled(back_path, (bw2, bh2))
+        self.back_img_hover = AssetManager.scaled(back_hover_path, (bw2, bh2))
         bx = int(self.screen_width * 0.11)
         by = int(self.screen_height * 0.8)
         self.back_button_rect = pygame.Rect(bx, by, bw2, bh2)
@@ -1,6 +1,7 @@
 
 
 import pygame
+from src.assets import AssetManager
 from src.state.base_state import GameState
 
 
@@ -10,24 +11,21 @@ class MainMenuState(GameState):
 
         self.screen_width, self.screen_height = self.game.screen.get_size()
 
-        bg_raw = pygame.image.load("assets/images/main_menu/background.png").convert_alpha()
         bg_size = (int(self.screen_width), int(self.screen_height))
-        self.background = pygame.transform.smoothscale(bg_raw, bg_size)
+        self.background = AssetManager.scaled("assets/images/main_menu/background.png", bg_size)
 
-        gloopie_raw = pygame.image.load("assets/images/main_menu/gloopie.png").convert_alpha()
         target_w = int(self.screen_width * 0.30)
 
 
         target_h = 0.28 * self.screen_height
-        self.gloopie_image = pygame.transform.smoothscale(gloopie_raw, (target_w, target_h))
+        self.gloopie_image = AssetManager.scaled("assets/images/main_menu/gloopie.png", (target_w, target_h))
         self.gloopie_rect = self.gloopie_image.get_rect()
         self.gloopie_rect.centerx = self.screen_width // 2
         self.gloopie_rect.centery = int(self.screen_height * 0.18)
 
-        title_raw = pygame.image.load("assets/images/main_menu/title.png").convert_alpha()
         title_w = int(self.screen_width * 0.63)
         title_h = int(self.screen_height * 0.25)
-        self.title_image = pygame.transform.smoothscale(title_raw, (title_w, title_h))
+        self.title_image = AssetManager.scaled("assets/images/main_menu/title.png", (title_w, title_h))
 
         title_x = int(self.screen_width * 0.17)
         title_y = int(self.screen_height * 0.30)
@@ -45,14 +43,13 @@ class MainMenuState(GameState):
         btn_y_load = btn_y_start + int(self.screen_height * 0.136)
         btn_y_setting = btn_y_load + int(self.screen_height * 0.136)
 
-        normal_raw = pygame.image.load(self.btn_images["normal"]).convert_alpha()
-        hover_raw = pygame.image.load(self.btn_images["hover"]).convert_alpha()
-        self.start_img_normal = pygame.transform.smoothscale(normal_raw, (btn_width, btn_height))
-        self.start_img_hover = pygame.transform.smoothscale(hover_raw, (btn_width, btn_height))
-        self.load_img_normal = pygame.transform.smoothscale(normal_raw, (btn_width, btn_height))
-        self.load_img_hover = pygame.transform.smoothscale(hover_raw, (btn_width, btn_height))
-        self.setting_img_normal = pygame.transform.smoothscale(normal_raw, (btn_width, btn_height))
-        self.setting_img_hover = pygame.transform.smoothscale(hover_raw, (btn_width, btn_height))
+        btn_size = (btn_width, btn_height)
+        self.start_img_normal = AssetManager.scaled(self.btn_images["normal"], btn_size)
+        self.start_img_hover = AssetManager.scaled(self.btn_images["hover"], btn_size)
+        self.load_img_normal = self.start_img_normal
+        self.load_img_hover = self.start_img_hover
+        self.setting_img_normal = self.start_img_normal
+        self.setting_img_hover = self.start_img_hover
 
         self.start_button_rect = pygame.Rect(btn_x, btn_y_start, btn_width, btn_height)
         self.load_button_rect = pygame.Rect(btn_x, btn_y_load, btn_width, btn_height)
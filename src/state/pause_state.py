@@ -1,4 +1,5 @@
 import pygame
+from src.assets import AssetManager
 from src.state.base_state import GameState
 
 
@@ -16,8 +17,6 @@ class PauseState(GameState):
 
         normal_path = "assets/images/level/buttons/normal.png"
         hover_path = "assets/images/level/buttons/hover.png"
-        normal_raw = pygame.image.load(normal_path).convert_alpha()
-        hover_raw = pygame.image.load(hover_path).convert_alpha()
 
         btn_w = int(overlay_w * 0.4)
         btn_h = int(overlay_h * 0.225)
@@ -30,8 +29,8 @@ class PauseState(GameState):
         self.btn1_rect = pygame.Rect(x1, y_btn, btn_w, btn_h)
         self.btn2_rect = pygame.Rect(x2, y_btn, btn_w, btn_h)
 
-        self.btn_normal = pygame.transform.smoothscale(normal_raw, (btn_w, btn_h))
-        self.btn_hover = pygame.transform.smoothscale(hover_raw, (btn_w, btn_h))
+        self.btn_normal = AssetManager.scaled(normal_path, (btn_w, btn_h))
+        self.btn_hover = AssetManager.scaled(hover_path, (btn_w, btn_h))
 
         self.btn1_hover = False
         self.btn2_hover = False
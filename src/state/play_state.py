@@ -1,47 +1,56 @@
 import os
 import pygame
+from src.animation import AnimationLibrary
+from src.assets import AssetManager
+from src.masks import MaskRegistry
 from src.state.base_state import GameState
 from src.level.level_manager import LevelManager
+from src.level.camera import Camera
 from src.entities.player import Player
-from src.entities.enemy import Enemy, load_gif_frames
+from src.entities.enemy import Enemy
 from src.entities.gem import Gem
 from src.entities.box import Box
+from src.projectile import Projectile
+from src.broadphase import Broadphase
+from src.level.spatial_grid import PlatformGroup
 from src.persistence import SaveManager
-from src.config import TOTAL_LEVELS
+from src.config import TOTAL_LEVELS, SIM_TICK_RATE, RECORD_INPUT, RECORDINGS_DIR
+from src.input import InputRecorder
 
 
 class PlayState(GameState):
+    # Sprites spawned during play; pinned while the state is active
+    ENTITY_IMAGES = (Projectile.IMAGE_PATH, Box.IMAGE_PATH, Gem.IMAGE_PATH)
+    # Sprite kinds tested against each other, through the broadphase
+    CONTACTS = (("enemy", "player"), ("enemy", "arrow"), ("player", "box"), ("player", "item"))
+
     def __init__(self, game):
         super().__init__(game)
         self.level_manager = LevelManager()
+        self.camera = Camera(*self.game.screen.get_size())
         self.player = None
         self.player_group = None
         self.enemies = pygame.sprite.Group()
         self.items = pygame.sprite.Group()
-        self.boxes = pygame.sprite.Group()
+        # Box tops are platforms, kept in a grid as the boxes move
+        self.boxes = PlatformGroup()
         self.all_sprites = pygame.sprite.Group()
+        self.broadphase = Broadphase(self.CONTACTS)
         self.current_level_index = 1
         self._level_finished = False
+        self.recorder = None
+        self.tick = 0
+
+        hud_dir = os.path.join("assets", "images", "level")
+        self.heart_full = AssetManager.image(os.path.join(hud_dir, "hud", "heart.png"))
+        self.heart_empty = AssetManager.image(os.path.join(hud_dir, "hud", "heart_gray.png"))
+        self.gem_full = AssetManager.image(os.path.join(hud_dir, "gem", "gem.png"))
+        self.gem_empty = AssetManager.image(os.path.join(hud_dir, "gem", "gem_gray.png"))
 
-        self.heart_full = pygame.image.load(
-            os.path.join("assets", "images", "level", "hud", "heart.png")
-        ).convert_alpha()
-        self.heart_empty = pygame.image.load(
-            os.path.join("assets", "images", "level", "hud", "heart_gray.png")
-        ).convert_alpha()
-        self.gem_full = pygame.image.load(
-            os.path.join("assets", "images", "level", "gem", "gem.png")
-        ).convert_alpha()
-        self.gem_empty = pygame.image.load(
-            os.path.join("assets", "images", "level", "gem", "gem_gray.png")
-        ).convert_alpha()
-
-        stop0 = pygame.image.load("assets/images/level/buttons/stop.png").convert_alpha()
-        stop1 = pygame.image.load("assets/images/level/buttons/stop_hover.png").convert_alpha()
         btn_w = int(self.game.screen.get_width() * 0.0176)
         btn_h = int(self.game.screen.get_height() * 0.029)
-        self.stop_img = pygame.transform.smoothscale(stop0, (btn_w, btn_h))
-        self.stop_img_hover = pygame.transform.smoothscale(stop1, (btn_w, btn_h))
+        self.stop_img = AssetManager.scaled("assets/images/level/buttons/stop.png", (btn_w, btn_h))
+        self.stop_img_hover = AssetManager.scaled("assets/images/level/buttons/stop_hover.png", (btn_w, btn_h))
         margin_x = 76
         margin_y = 10
         x = self.game.screen.get_width() - btn_w - margin_x
@@ -50,17 +59,21 @@ class PlayState(GameState):
         self.pause_hover = False
 
     def enter(self):
-        if not hasattr(self, "_loaded_from_save") or not self._loaded_from_save:
+        AssetManager.acquire(*self.ENTITY_IMAGES)
+        # Headless runs (CI, training) never touch the player's save files
+        if not self.game.headless and not getattr(self, "_loaded_from_save", False):
             SaveManager.reset_progress()
         self._loaded_from_save = False
 
-        if self.level_manager.tmx_data is None and self.current_level_index is None:
+        if self.level_manager.level_data is None and self.current_level_index is None:
             self.load_level(1)
         elif self.current_level_index is not None:
             self.load_level(self.current_level_index)
         self._init_level()
 
     def exit(self):
+        AssetManager.release(*self.ENTITY_IMAGES)
+        self._save_recording()
         self.enemies.empty()
         self.items.empty()
         self.all_sprites.empty()
@@ -89,18 +102,26 @@ class PlayState(GameState):
         self.all_sprites.empty()
         self._level_finished = False
 
+        self.tick = 0
+        controls = self.game.input
+        if RECORD_INPUT and not self.game.headless:
+            self.recorder = controls = InputRecorder(self.game.input)
+
         px, py = self.level_manager.get_player_spawn()
-        self.player = Player(px, py)
+        self.player = Player(px, py, controls=controls)
         self.player.level_manager = self.level_manager
         self.player.start_invincibility()
         self.all_sprites.add(self.player)
         self.player_group = pygame.sprite.GroupSingle(self.player)
         self.player.prev_bottom = self.player.rect.bottom
 
+        self.camera.set_bounds(self.level_manager.width, self.level_manager.height)
+        self.camera.follow(self.player.rect)
+        self.camera.snap()
+
         for ed in self.level_manager.get_enemy_data():
-            frames = load_gif_frames(ed["gif_path"])
             enemy = Enemy(
-                frames,
+                AnimationLibrary.get(ed["gif_path"]),
                 ed["x"], ed["y"],
                 ed["start"][0], ed["end"][0],
                 ed["speed"]
@@ -126,6 +147,9 @@ class PlayState(GameState):
         self.total_gems = len(self.items)
 
     def handle_event(self, event):
+        if self.recorder is not None:
+            self.recorder.feed(event)
+
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.pause_button_rect.collidepoint(event.pos):
                 self.game.push_state("pause")
@@ -141,71 +165,44 @@ class PlayState(GameState):
         mx, my = pygame.mouse.get_pos()
         self.pause_hover = self.pause_button_rect.collidepoint(mx, my)
 
+        if self.recorder is not None:
+            self.recorder.begin_tick(self.tick)
+        self.tick += 1
+
+        self.camera.begin_step()
+        for spr in self.all_sprites:
+            spr.prev_topleft = spr.rect.topleft
+        for arrow in self.player.bullets:
+            arrow.prev_topleft = arrow.rect.topleft
+
+        profiler = self.game.profiler
         self.player.prev_bottom = self.player.rect.bottom
-        self.player.update(dt)
-        self.player.bullets.update(dt)
-
-        impulse = 400
-        for arrow in list(self.player.bullets):
-            if not arrow.stuck:
-                for box in self.boxes:
-                    if arrow.rect.colliderect(box.rect):
-                        arrow.stick(box.rect)
-                        arrow.parent = box
-                        arrow.offset_x = arrow.rect.x - box.rect.x
-                        arrow.offset_y = arrow.rect.y - box.rect.y
-                        box.vel_x += arrow.direction * impulse
-                        break
-            if arrow.stuck:
-                continue
-            for block in self.level_manager.get_obstacle_rects():
-                if arrow.rect.colliderect(block):
-                    arrow.stick(block)
-                    break
-            if arrow.stuck:
-                continue
-            for box in self.boxes:
-                if arrow.rect.colliderect(box.rect):
-                    arrow.stick_vertical(box.rect)
-                    arrow.parent = box
-                    arrow.offset_x = arrow.rect.x - box.rect.x
-                    arrow.offset_y = arrow.rect.y - box.rect.y
-                    break
-            if arrow.stuck:
-                continue
-            for block in self.level_manager.get_ground_rects():
-                if arrow.rect.colliderect(block):
-                    arrow.stick_vertical(block)
-                    break
-
-        attack_bullets = pygame.sprite.Group(
-            a for a in self.player.bullets
-            if not getattr(a, "stuck_on_ground", False)
-        )
-        if not self.player.is_dead:
-            self.enemies.update(dt, self.player_group, attack_bullets)
+        with profiler.section("player"):
+            self.player.update(dt)
+        with profiler.section("arrows"):
+            self.player.arrow_pool.update(dt)
+            self._collide_arrows()
+
+        with profiler.section("broadphase"):
+            self._build_broadphase(dt)
+        with profiler.section("enemies"):
+            if not self.player.is_dead:
+                self.enemies.update(dt, self.broadphase)
 
         self.items.update(dt)
         self.boxes.update(dt)
 
-        self._check_collisions()
+        with profiler.section("collisions"):
+            self._check_collisions()
 
         if self.player.is_dead:
-            screen_h = pygame.display.get_surface().get_height()
-            if self.player.rect.top > screen_h:
+            if self.player.rect.top > self.level_manager.height:
                 self.game.change_state("game_over")
                 return
 
         if self._check_level_complete():
-            stars = (self.player.health + self.player.gem_count) // 2
-            prog = SaveManager.load_progress()
-            idx = self.current_level_index - 1
-            if stars > prog["ratings"][idx]:
-                prog["ratings"][idx] = stars
-            num_levels = len(prog["ratings"])
-            if self.current_level_index < num_levels and prog["unlocked"] < self.current_level_index + 1:
-                prog["unlocked"] = self.current_level_index + 1
-            SaveManager.save_progress(prog)
+            if not self.game.headless:
+                self._save_level_result()
 
             clear = self.game.states["game_clear"]
             clear.level_index = self.current_level_index
@@ -218,26 +215,98 @@ class PlayState(GameState):
             return
 
         self.player.prev_bottom = self.player.rect.bottom
+        if not self.player.is_dead:
+            self.camera.follow(self.player.rect)
+        self.level_manager.update_streaming(self.camera.view)
 
     def draw(self, screen):
-        class NoCam:
-            def apply_pos(self, x, y): return (x, y)
-
-        self.level_manager.draw_map(screen, NoCam())
-
-        for spr in self.all_sprites:
-            if spr is self.player and not self.player.visible:
-                continue
-            screen.blit(spr.image, spr.rect.topleft)
-
-        for arrow in self.player.bullets:
-            if getattr(arrow, "visible", True):
-                screen.blit(arrow.image, arrow.rect.topleft)
-
-        self._draw_hud(screen)
-
-        img = self.stop_img_hover if self.pause_hover else self.stop_img
-        screen.blit(img, self.pause_button_rect.topleft)
+        # Only interpolate while simulating; under the pause overlay the
+        # last update is what should stay on screen.
+        alpha = self.game.render_alpha if self.game.state_stack[-1] is self else 1.0
+        self.camera.interpolate(alpha)
+        profiler = self.game.profiler
+        with profiler.section("map"):
+            self.level_manager.draw_map(screen, self.camera)
+
+        with profiler.section("sprites"):
+            view = self.camera.render_view.inflate(64, 64)
+            for spr in self.all_sprites:
+                if spr is self.player and not self.player.visible:
+                    continue
+                if spr.rect.colliderect(view):
+                    screen.blit(spr.image, self._render_pos(spr, alpha))
+
+            for arrow in self.player.bullets:
+                if getattr(arrow, "visible", True) and arrow.rect.colliderect(view):
+                    screen.blit(arrow.image, self._render_pos(arrow, alpha))
+
+        with profiler.section("hud"):
+            self._draw_hud(screen)
+            img = self.stop_img_hover if self.pause_hover else self.stop_img
+            screen.blit(img, self.pause_button_rect.topleft)
+
+    def entity_counts(self) -> dict:
+        """ Live entities, for telemetry """
+        bullets = self.player.bullets if self.player else ()
+        return {
+            "enemies": len(self.enemies),
+            "arrows": len(bullets),
+            "boxes": len(self.boxes),
+            "stuck_arrows": sum(1 for arrow in bullets if arrow.stuck),
+        }
+
+    def _save_level_result(self):
+        stars = (self.player.health + self.player.gem_count) // 2
+        prog = SaveManager.load_progress()
+        idx = self.current_level_index - 1
+        if stars > prog["ratings"][idx]:
+            prog["ratings"][idx] = stars
+        num_levels = len(prog["ratings"])
+        if self.current_level_index < num_levels and prog["unlocked"] < self.current_level_index + 1:
+            prog["unlocked"] = self.current_level_index + 1
+        SaveManager.save_progress(prog)
+
+    def _save_recording(self):
+        """ Keep the input of the attempt that just ended, one file per level """
+        if self.recorder is None or not self.recorder.frames:
+            self.recorder = None
+            return
+        path = os.path.join(RECORDINGS_DIR, f"level_{self.current_level_index:02d}.inp")
+        try:
+            self.recorder.save(path, self.current_level_index, SIM_TICK_RATE)
+        except OSError as e:
+            print(f"Could not save input recording {path}: {e}")
+        self.recorder = None
+
+    def _render_pos(self, spr, alpha):
+        """ Screen position of spr, between its last two simulated positions """
+        x, y = spr.rect.topleft
+        prev = getattr(spr, "prev_topleft", None)
+        if prev is not None and alpha < 1.0:
+            x = round(prev[0] + (x - prev[0]) * alpha)
+            y = round(prev[1] + (y - prev[1]) * alpha)
+        return self.camera.apply_pos(x, y)
+
+    def _collide_arrows(self):
+        """ Stick flying arrows into boxes and level geometry """
+        self.player.arrow_pool.collide(self.boxes, self.level_manager)
+
+    def _build_broadphase(self, dt):
+        """
+        Candidate contacts for the rest of the tick. Margins cover what
+        still moves before the tests: enemies and boxes their next step,
+        the player its collision response (snapping onto a platform or out
+        of a wall); arrows and gems stay put. Arrows lying on the ground
+        are harmless and left out.
+        """
+        p = self.player
+        self.broadphase.build((
+            ("player", self.player_group, (abs(p.vel_x) + abs(p.vel_y)) * dt + 10),
+            ("enemy", self.enemies, [e.max_step(dt) for e in self.enemies]),
+            ("arrow", [a for a in p.bullets if not a.stuck_on_ground], 0),
+            ("box", self.boxes, [box.max_step(dt) for box in self.boxes]),
+            ("item", self.items, 0),
+        ))
 
     def _check_collisions(self):
         p = self.player
@@ -245,7 +314,7 @@ class PlayState(GameState):
             return
         p.on_ground = False
 
-        for rect in self.level_manager.get_obstacle_rects():
+        for rect in self.level_manager.query_rect(p.rect, "obstacle"):
             if p.rect.colliderect(rect):
                 if p.vel_x > 0:
                     p.rect.right = rect.left
@@ -255,11 +324,13 @@ class PlayState(GameState):
 
         if p.vel_y >= 0:
             prev = p.prev_bottom
-            platforms = []
-            platforms += [arrow.rect for arrow in p.bullets if getattr(arrow, "stuck_on_wall", False)]
-            platforms += self.level_manager.get_ground_rects()
-            platforms += self.level_manager.get_obstacle_rects()
-            platforms += [box.rect for box in self.boxes]
+            landing = pygame.Rect(p.rect.left, prev - 10,
+                                  p.rect.width, p.rect.bottom - prev + 11)
+            # Arrows stuck in walls, level geometry, then boxes; the first one hit wins
+            platforms = p.arrow_pool.platforms.query(landing)
+            platforms += self.level_manager.query_rect(landing, "ground")
+            platforms += self.level_manager.query_rect(landing, "obstacle")
+            platforms += self.boxes.platforms.query(landing)
             for plat in platforms:
                 if p.rect.right > plat.left and p.rect.left < plat.right:
                     top = plat.top
@@ -269,24 +340,25 @@ class PlayState(GameState):
                         p.on_ground = True
                         break
         elif p.vel_y < 0:
-            for rect in self.level_manager.get_obstacle_rects():
+            for rect in self.level_manager.query_rect(p.rect, "obstacle"):
                 if p.rect.colliderect(rect):
                     p.rect.top = rect.bottom
                     p.vel_y = 0
 
-        hits = pygame.sprite.spritecollide(
-            p, self.enemies, False, collided=pygame.sprite.collide_mask
-        )
+        contacts = self.broadphase
+        hits = [e for e in contacts.candidates(p, "enemy")
+                if e in self.enemies and pygame.sprite.collide_mask(p, e)]
         for e in hits:
             p.take_damage(getattr(e, "contact_damage", 1), e.rect.centerx)
 
-        collected = pygame.sprite.spritecollide(
-            p, self.items, True, collided=pygame.sprite.collide_mask
-        )
+        collected = [gem for gem in contacts.candidates(p, "item")
+                     if gem in self.items and pygame.sprite.collide_mask(p, gem)]
+        for gem in collected:
+            gem.kill()
         for gem in collected:
             gem.apply(p)
 
-        for box in self.boxes:
+        for box in contacts.candidates(p, "box"):
             if pygame.sprite.collide_mask(p, box) and p.vel_x != 0:
                 box.vel_x = p.vel_x
                 if p.vel_x > 0:
@@ -301,7 +373,7 @@ class PlayState(GameState):
                              self.level_manager.tile_width,
                              self.level_manager.tile_height)
             if p.rect.colliderect(er):
-                portal_mask = pygame.Mask(er.size, fill=True)
+                portal_mask = MaskRegistry.filled(er.size)
                 offset = (er.x - p.rect.x, er.y - p.rect.y)
                 if p.mask.overlap(portal_mask, offset):
                     self._level_finished = True
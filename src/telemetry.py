@@ -0,0 +1,218 @@
+"""
+Per-frame telemetry logs and reports on them.
+
+TelemetryRecorder writes one CSV row per frame: timings per profiler
+section, entity counts, the active state and any state transitions that
+happened during the frame. Turn a log into percentile tables and a list
+of hitches (frames over budget) with:
+
+    python -m src.telemetry telemetry/session.csv --budget 16.7
+"""
+import argparse
+import csv
+import os
+import queue
+import threading
+import time
+
+from src.config import RENDER_FPS, TELEMETRY_FLUSH_ROWS
+from src.profiler import percentile
+
+# Profiler sections logged as <name>_ms columns
+SECTIONS = (
+    "input", "update", "draw", "flip",
+    "player", "arrows", "broadphase", "enemies", "collisions",
+    "map", "sprites", "hud",
+)
+COUNTS = ("enemies", "arrows", "boxes", "stuck_arrows")
+COLUMNS = (
+    ("frame", "t", "state", "frame_ms", "work_ms")
+    + tuple(f"{name}_ms" for name in SECTIONS)
+    + tuple(f"n_{name}" for name in COUNTS)
+    + ("transitions",)
+)
+
+
+class TelemetryRecorder:
+    """
+    Buffers per-frame rows and hands them to a writer thread in batches
+    of TELEMETRY_FLUSH_ROWS, so the game loop never waits on the disk.
+
+    The game reports state changes with transition() as they happen and
+    ends each frame with frame(); section times are the difference in
+    profiler totals since the previous frame.
+    """
+
+    def __init__(self, path: str, profiler):
+        self.path = path
+        self.profiler = profiler
+        self.frames = 0
+        self._rows = []
+        self._transitions = []
+        self._totals = profiler.totals()
+        self._start = time.perf_counter()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w", newline="")
+        self._queue = queue.Queue()
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+        self._thread = threading.Thread(target=self._write, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def transition(self, label: str):
+        self._transitions.append(label)
+
+    def frame(self, state: str, frame_seconds: float, work_seconds: float, counts: dict):
+        totals = self.profiler.totals()
+        sections = [
+            (totals.get(name, 0.0) - self._totals.get(name, 0.0)) * 1000.0
+            for name in SECTIONS
+        ]
+        self._totals = totals
+
+        self._rows.append(
+            [self.frames, f"{time.perf_counter() - self._start:.4f}", state,
+             f"{frame_seconds * 1000.0:.3f}", f"{work_seconds * 1000.0:.3f}"]
+            + [f"{ms:.3f}" for ms in sections]
+            + [counts.get(name, 0) for name in COUNTS]
+            + [";".join(self._transitions)]
+        )
+        self._transitions = []
+        self.frames += 1
+        if len(self._rows) >= TELEMETRY_FLUSH_ROWS:
+            self._queue.put(self._rows)
+            self._rows = []
+
+    def close(self):
+        """ Write out what is buffered and wait for the writer to finish """
+        if self._file is None:
+            return
+        if self._rows:
+            self._queue.put(self._rows)
+            self._rows = []
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._file = None
+
+    def _write(self):
+        while True:
+            rows = self._queue.get()
+            if rows is None:
+                break
+            try:
+                self._writer.writerows(rows)
+                self._file.flush()
+            except OSError as e:
+                print(f"Could not write telemetry to {self.path}: {e}")
+
+
+def load(path: str) -> list:
+    """ Rows of a telemetry log as dicts, numbers converted """
+    rows = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            for key, value in row.items():
+                if key.endswith("_ms") or key == "t":
+                    row[key] = float(value)
+                elif key == "frame" or key.startswith("n_"):
+                    row[key] = int(value)
+            rows.append(row)
+    return rows
+
+
+def summarize(rows: list, columns=None) -> dict:
+    """ {column: {"mean", "p50", "p95", "p99", "max"}} over the frames """
+    if columns is None:
+        columns = ["frame_ms", "work_ms"] + [f"{name}_ms" for name in SECTIONS]
+    table = {}
+    for column in columns:
+        ordered = sorted(row[column] for row in rows)
+        if not ordered:
+            continue
+        table[column] = {
+            "mean": sum(ordered) / len(ordered),
+            "p50": percentile(ordered, 0.50),
+            "p95": percentile(ordered, 0.95),
+            "p99": percentile(ordered, 0.99),
+            "max": ordered[-1],
+        }
+    return table
+
+
+def find_hitches(rows: list, budget_ms: float, window: int = 2) -> list:
+    """
+    Frames whose work took longer than budget_ms, worst first. Each hitch
+    is linked to the most recent state transition at most window frames
+    before it (or in the frame itself), since loading a level or building
+    a menu shows up in the frame that switches state or the one after.
+    """
+    hitches = []
+    last_transition = None
+    for row in rows:
+        if row["transitions"]:
+            last_transition = (row["frame"], row["transitions"])
+        if row["work_ms"] <= budget_ms:
+            continue
+        cause = None
+        if last_transition and row["frame"] - last_transition[0] <= window:
+            cause = last_transition[1]
+        sections = sorted(
+            ((row[f"{name}_ms"], name) for name in SECTIONS
+             if name not in ("update", "draw")),
+            reverse=True,
+        )
+        hitches.append({
+            "frame": row["frame"],
+            "t": row["t"],
+            "state": row["state"],
+            "work_ms": row["work_ms"],
+            "top": [(name, ms) for ms, name in sections[:3] if ms > 0],
+            "transition": cause,
+        })
+    hitches.sort(key=lambda h: h["work_ms"], reverse=True)
+    return hitches
+
+
+def _print_table(title: str, table: dict):
+    print(title)
+    print(f"  {'ms':<14}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for column, s in table.items():
+        print(f"  {column[:-3]:<14}{s['mean']:9.2f}{s['p50']:9.2f}"
+              f"{s['p95']:9.2f}{s['p99']:9.2f}{s['max']:9.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a telemetry log.")
+    parser.add_argument("log")
+    parser.add_argument("--budget", type=float, default=1000.0 / RENDER_FPS,
+                        help="frame budget in ms (default: %(default).1f)")
+    parser.add_argument("--top", type=int, default=20, help="hitches to list")
+    args = parser.parse_args(argv)
+
+    rows = load(args.log)
+    if not rows:
+        print(f"{args.log} has no frames.")
+        return 1
+
+    print(f"{args.log}: {len(rows)} frames over {rows[-1]['t']:.1f}s")
+    _print_table("All frames", summarize(rows))
+    by_state = {}
+    for row in rows:
+        by_state.setdefault(row["state"], []).append(row)
+    for state, state_rows in by_state.items():
+        _print_table(f"{state} ({len(state_rows)} frames)",
+                     summarize(state_rows, ["work_ms"]))
+
+    hitches = find_hitches(rows, args.budget)
+    print(f"Hitches over {args.budget:.1f}ms: {len(hitches)}")
+    for h in hitches[:args.top]:
+        top = ", ".join(f"{name} {ms:.1f}" for name, ms in h["top"])
+        cause = f"  after {h['transition']}" if h["transition"] else ""
+        print(f"  frame {h['frame']:>6} {h['t']:8.2f}s {h['state']:<12}"
+              f"{h['work_ms']:8.1f}ms  [{top}]{cause}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""
+Randomized checks of src/broadphase.py: every real contact is among the
+candidates, on both the Python and the numpy sweep.
+
+    python -m pytest tests
+"""
+import numpy as np
+import pygame
+import pytest
+
+from src.broadphase import Broadphase
+
+SEEDS = range(10)
+INTERACTIONS = (("player", "enemy"), ("arrow", "enemy"), ("player", "gem"))
+# Python sweep below, numpy sweep at and above VECTORIZE_FROM
+SIZES = (20, Broadphase.VECTORIZE_FROM + 40)
+
+
+class Sprite:
+    def __init__(self, x, y, w, h):
+        self.rect = pygame.Rect(x, y, w, h)
+
+
+def random_layers(rng, count):
+    """ (kind, sprites, margins) triples packed closely enough to overlap """
+    kinds = ("player", "enemy", "arrow", "gem")
+    split = np.sort(rng.integers(0, count, 3))
+    layers = []
+    for kind, n in zip(kinds, np.diff(np.concatenate(([0], split, [count])))):
+        sprites = [Sprite(*rng.integers(0, 300, 2), *rng.integers(1, 30, 2)) for _ in range(n)]
+        margins = rng.integers(0, 8, n).tolist() if kind != "gem" else 0
+        layers.append((kind, sprites, margins))
+    return layers
+
+
+def move_within_margins(rng, layers):
+    for _, sprites, margins in layers:
+        if not isinstance(margins, list):
+            margins = [margins] * len(sprites)
+        for sprite, margin in zip(sprites, margins):
+            sprite.rect.move_ip(*rng.integers(-margin, margin + 1, 2))
+
+
+def contacts(layers, kind_a, kind_b):
+    sprites_a = next(sprites for kind, sprites, _ in layers if kind == kind_a)
+    sprites_b = next(sprites for kind, sprites, _ in layers if kind == kind_b)
+    return [(a, b) for a in sprites_a for b in sprites_b if a.rect.colliderect(b.rect)]
+
+
+def build(layers, vectorize_from=None):
+    broadphase = Broadphase(INTERACTIONS)
+    if vectorize_from is not None:
+        broadphase.VECTORIZE_FROM = vectorize_from
+    broadphase.build(layers)
+    return broadphase
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("count", SIZES)
+def test_candidates_include_every_contact(seed, count):
+    rng = np.random.default_rng(seed)
+    layers = random_layers(rng, count)
+    broadphase = build(layers)
+    move_within_margins(rng, layers)
+
+    for kind_a, kind_b in INTERACTIONS:
+        for a, b in contacts(layers, kind_a, kind_b):
+            assert b in list(broadphase.candidates(a, kind_b))
+            assert a in list(broadphase.candidates(b, kind_a))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("count", SIZES)
+def test_python_and_numpy_sweeps_agree(seed, count):
+    layers = random_layers(np.random.default_rng(seed), count)
+    python = build(layers, vectorize_from=count + 1)
+    vectorized = build(layers, vectorize_from=0)
+
+    assert python.pair_count == vectorized.pair_count
+    for kind_a, kind_b in INTERACTIONS:
+        for kind, other in ((kind_a, kind_b), (kind_b, kind_a)):
+            for sprite in next(sprites for name, sprites, _ in layers if name == kind):
+                assert list(python.candidates(sprite, other)) == list(vectorized.candidates(sprite, other))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_candidates_keep_group_order(seed):
+    layers = random_layers(np.random.default_rng(seed), SIZES[1])
+    broadphase = build(layers)
+    for kind, sprites, _ in layers:
+        for other, members, _ in layers:
+            rank = {sprite: i for i, sprite in enumerate(members)}
+            for sprite in sprites:
+                ranks = [rank[partner] for partner in broadphase.candidates(sprite, other)]
+                assert ranks == sorted(ranks)
+
+
+def test_sprite_outside_its_bounds_gets_the_rest_of_the_group():
+    player = Sprite(0, 0, 10, 10)
+    enemies = [Sprite(500 + 40 * i, 0, 10, 10) for i in range(5)]
+    broadphase = build([("player", [player], 2), ("enemy", enemies, 0)])
+    assert list(broadphase.candidates(player, "enemy")) == []
+
+    # Moved further than its margin: every enemy may be a contact now
+    player.rect.x = 540
+    assert list(broadphase.candidates(player, "enemy")) == enemies
@@ -0,0 +1,51 @@
+"""
+Rewards of src/env.py's GameEnv at the end of an episode.
+
+    python -m pytest tests
+"""
+import pytest
+
+from src.env import GameEnv
+
+
+@pytest.fixture
+def env():
+    env = GameEnv(level=1)
+    env.reset()
+    assert len(env.play.enemies) > 0
+    return env
+
+
+def fall_to_death(player, level_manager):
+    player.is_dead = True
+    player.death_ascending = False
+    player.rect.top = level_manager.height + 1
+
+
+def test_death_is_not_rewarded_for_the_enemies_left(env):
+    fall_to_death(env.play.player, env.play.level_manager)
+    _, reward, done, info = env.step(0)
+
+    assert done and info["outcome"] == "death"
+    assert reward == GameEnv.REWARD_DEATH
+
+
+def test_kills_before_a_death_still_count(env):
+    play = env.play
+    update = play.update
+    ticks = []
+
+    def update_then_die(dt):
+        # Kill one enemy on the first tick, fall out of the level on the next
+        ticks.append(dt)
+        if len(ticks) == 1:
+            play.enemies.sprites()[0].kill()
+        else:
+            fall_to_death(play.player, play.level_manager)
+        update(dt)
+
+    play.update = update_then_die
+    _, reward, done, info = env.step(0)
+
+    assert done and info["outcome"] == "death"
+    assert reward == GameEnv.REWARD_KILL + GameEnv.REWARD_DEATH
@@ -0,0 +1,139 @@
+"""
+Randomized checks of src/level/geometry.py: merged tile rects cover
+exactly the solid cells, and the swept-box raycasts match a scalar
+reference in exact arithmetic.
+
+    python -m pytest tests
+"""
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from src.level.geometry import ColumnIndex, merge_tile_rects, sweep
+
+SEEDS = range(20)
+TILE = (16, 8)
+
+
+def random_cells(rng, width=30, height=20):
+    """ Solid tiles with runs, holes and stacked spans of the same width """
+    solid = rng.random((height, width)) < rng.uniform(0.2, 0.9)
+    solid[rng.integers(0, height, 3)] = solid[rng.integers(0, height)]
+    return {(x, y) for y, x in zip(*np.nonzero(solid))}
+
+
+def covered_cells(rect):
+    tw, th = TILE
+    assert rect.x % tw == 0 and rect.y % th == 0 and rect.w % tw == 0 and rect.h % th == 0
+    return [(x, y) for y in range(rect.y // th, rect.bottom // th)
+            for x in range(rect.x // tw, rect.right // tw)]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("vertical", (True, False))
+def test_merged_rects_cover_exactly_the_cells(seed, vertical):
+    cells = random_cells(np.random.default_rng(seed))
+    rects = merge_tile_rects(cells, *TILE, vertical=vertical)
+
+    covered = [cell for rect in rects for cell in covered_cells(rect)]
+    assert len(covered) == len(set(covered)), "rects overlap"
+    assert set(covered) == cells
+    assert [(r.y, r.x) for r in rects] == sorted((r.y, r.x) for r in rects)
+    if not vertical:
+        # One rect per row run: ground keeps every tile top a landing surface
+        assert all(r.h == TILE[1] for r in rects)
+        ends = {(r.right, r.y) for r in rects}
+        assert not any((r.x, r.y) in ends for r in rects), "runs left unmerged"
+
+
+def test_merge_without_cells():
+    assert merge_tile_rects([], *TILE) == []
+
+
+def random_scene(rng, boxes=40, rects=30):
+    """ Small integer coordinates, so shared edges and exact ties are common """
+    box = np.column_stack((rng.integers(-5, 25, (boxes, 2)), rng.integers(1, 5, (boxes, 2))))
+    delta = rng.integers(-15, 16, (boxes, 2))
+    delta[rng.random((boxes, 2)) < 0.25] = 0
+    rect = np.column_stack((rng.integers(0, 20, (rects, 2)), rng.integers(0, 7, (rects, 2))))
+    return box.astype(np.int64), delta.astype(np.int64), rect.astype(np.int64)
+
+
+def axis_times(position, size, delta, low, high):
+    """ Open interval of times the box overlaps [low, high) on one axis """
+    if delta == 0:
+        inside = low - size < position < high
+        return (-float("inf"), float("inf")) if inside else (float("inf"), -float("inf"))
+    a = Fraction(low - size - position, delta)
+    b = Fraction(high - position, delta)
+    return (a, b) if delta > 0 else (b, a)
+
+
+def reference(box, delta, rects):
+    """ First hit of one moving box, checking every rect one by one """
+    best = None
+    for i, (x, y, w, h) in enumerate(rects):
+        if w <= 0 or h <= 0:
+            continue
+        enter_x, leave_x = axis_times(box[0], box[2], delta[0], x, x + w)
+        enter_y, leave_y = axis_times(box[1], box[3], delta[1], y, y + h)
+        enter, leave = max(enter_x, enter_y), min(leave_x, leave_y)
+        if enter < leave and enter < 1 and leave > 0:
+            if best is None or (enter, i) < best[:2]:
+                best = (enter, i, enter_x > enter_y)
+    if best is None:
+        return float("inf"), -1, (0, 0)
+    enter, i, side = best
+    if side:
+        normal = (-int(np.sign(delta[0])), 0)
+    else:
+        normal = (0, 1 if delta[1] < 0 else -1)
+    return float(max(enter, 0)), i, normal
+
+
+def overlaps(box, delta, t, rect):
+    """ colliderect of the box moved to time t, in floats """
+    x, y = box[0] + delta[0] * t, box[1] + delta[1] * t
+    return (x < rect[0] + rect[2] and rect[0] < x + box[2]
+            and y < rect[1] + rect[3] and rect[1] < y + box[3]
+            and rect[2] > 0 and rect[3] > 0)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sweep_matches_reference(seed):
+    boxes, deltas, rects = random_scene(np.random.default_rng(seed))
+    toi, index, normal = sweep(boxes, deltas, rects)
+    for n in range(len(boxes)):
+        expected = reference(boxes[n], deltas[n], rects)
+        assert (toi[n], index[n], tuple(normal[n])) == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sweep_hits_nothing_before_impact(seed):
+    boxes, deltas, rects = random_scene(np.random.default_rng(seed))
+    toi, index, _ = sweep(boxes, deltas, rects)
+    for n in range(len(boxes)):
+        if toi[n] > 0:
+            for t in np.linspace(0, min(toi[n], 1.0), 17)[:-1]:
+                assert not any(overlaps(boxes[n], deltas[n], t, rect) for rect in rects)
+        if index[n] >= 0 and deltas[n].any():
+            # Just after the impact the box is inside the rect it hit
+            assert overlaps(boxes[n], deltas[n], toi[n] + 1e-6, rects[index[n]])
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("column_width", (1, 4, 7, 1024))
+def test_column_index_matches_sweep(seed, column_width):
+    boxes, deltas, rects = random_scene(np.random.default_rng(seed))
+    found = ColumnIndex(rects, column_width).sweep(boxes, deltas)
+    for got, expected in zip(found, sweep(boxes, deltas, rects)):
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_sweep_without_rects():
+    boxes = np.array([[0, 0, 2, 2]], dtype=np.int64)
+    deltas = np.array([[3, 0]], dtype=np.int64)
+    rects = np.zeros((0, 4), dtype=np.int64)
+    for toi, index, normal in (sweep(boxes, deltas, rects), ColumnIndex(rects).sweep(boxes, deltas)):
+        assert toi[0] == float("inf") and index[0] == -1 and tuple(normal[0]) == (0, 0)
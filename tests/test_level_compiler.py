@@ -0,0 +1,107 @@
+"""
+Checks of the compiled level format in src/level/level_compiler.py:
+artifacts read back what was compiled, and stale or damaged ones are
+cache misses.
+
+    python -m pytest tests
+"""
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from src.level.level_compiler import (
+    HEADER, artifact_path, compile_level, load_level_data, read_artifact
+)
+
+ASSETS = os.path.join(os.path.dirname(__file__), os.pardir, "assets")
+LEVELS = [name for name in sorted(os.listdir(os.path.join(ASSETS, "levels"))) if name.endswith(".tmx")]
+
+
+@pytest.fixture
+def level_dir(tmp_path):
+    """ Copy of the shipped levels and tilesets, so artifacts land in tmp_path """
+    for folder in ("levels", "tilesets"):
+        os.makedirs(tmp_path / folder)
+        for name in os.listdir(os.path.join(ASSETS, folder)):
+            if name.endswith((".tmx", ".tsx")):
+                shutil.copy2(os.path.join(ASSETS, folder, name), tmp_path / folder / name)
+    return tmp_path / "levels"
+
+
+def assert_same_level(got, expected):
+    assert got.keys() == expected.keys()
+    for key, value in expected.items():
+        if key == "layers":
+            for layer, expected_layer in zip(got[key], value):
+                assert layer.keys() == expected_layer.keys()
+                for name, field in expected_layer.items():
+                    if name == "rows":
+                        np.testing.assert_array_equal(layer[name], field)
+                    else:
+                        assert layer[name] == field
+        elif isinstance(value, np.ndarray):
+            np.testing.assert_array_equal(got[key], value)
+        else:
+            assert got[key] == value
+
+
+@pytest.mark.parametrize("name", LEVELS)
+def test_artifact_reads_back_the_compiled_level(level_dir, name):
+    tmx = str(level_dir / name)
+    compiled = compile_level(tmx)
+    assert_same_level(read_artifact(tmx), compiled)
+    assert_same_level(load_level_data(tmx), compiled)
+
+
+def test_changed_source_is_a_miss(level_dir):
+    tmx = str(level_dir / LEVELS[0])
+    compile_level(tmx)
+    with open(tmx, "a") as f:
+        f.write("\n")
+    assert read_artifact(tmx) is None
+
+
+def test_touched_source_is_still_a_hit(level_dir):
+    tmx = str(level_dir / LEVELS[0])
+    compile_level(tmx)
+    st = os.stat(tmx)
+    os.utime(tmx, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert read_artifact(tmx) is not None
+
+
+@pytest.mark.parametrize("damage", (
+    lambda raw: b"",
+    lambda raw: raw[:HEADER.size - 1],
+    lambda raw: raw[:-5],
+    lambda raw: raw + b"\0",
+    lambda raw: raw[:HEADER.size] + b"#" + raw[HEADER.size + 1:],
+    lambda raw: b"XXXX" + raw[4:],
+), ids=("empty", "short header", "truncated", "trailing data", "bad metadata", "bad magic"))
+def test_damaged_artifact_is_recompiled(level_dir, damage):
+    tmx = str(level_dir / LEVELS[0])
+    compiled = compile_level(tmx)
+    path = artifact_path(tmx)
+    with open(path, "rb") as f:
+        raw = f.read()
+    with open(path, "wb") as f:
+        f.write(damage(raw))
+
+    assert read_artifact(tmx) is None
+    assert_same_level(load_level_data(tmx), compiled)
+    assert read_artifact(tmx) is not None
+
+
+def test_tile_edits_stay_in_memory(level_dir):
+    tmx = str(level_dir / LEVELS[0])
+    compile_level(tmx)
+    path = artifact_path(tmx)
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    data = read_artifact(tmx)
+    rows = next(layer["rows"] for layer in data["layers"] if layer["kind"] == "tile")
+    rows[0, 0] = rows[0, 0] + 1
+    with open(path, "rb") as f:
+        assert f.read() == raw
@@ -0,0 +1,110 @@
+"""
+Randomized checks of SpatialGrid in src/level/spatial_grid.py against a
+plain list filtered with colliderect, and of PlatformGroup keeping its
+grid in step with its members.
+
+    python -m pytest tests
+"""
+import random
+
+import pygame
+import pytest
+
+from src.level.spatial_grid import PlatformGroup, SpatialGrid
+
+SEEDS = range(20)
+
+
+def random_rect(rng):
+    # Negative corners, zero sizes and rects spanning many cells included
+    return pygame.Rect(rng.randint(-300, 900), rng.randint(-300, 900),
+                       rng.randint(0, 400), rng.randint(0, 400))
+
+
+def brute_force(entries, query):
+    """ Items whose rect overlaps query, in key order """
+    return [item for key, (rect, item) in sorted(entries.items()) if rect.colliderect(query)]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("cell_size", (16, 128, 1000))
+def test_query_matches_brute_force(seed, cell_size):
+    rng = random.Random(seed)
+    grid = SpatialGrid(cell_size)
+    entries = {}
+
+    for step in range(400):
+        action = rng.random()
+        if action < 0.5 or not entries:
+            rect = random_rect(rng)
+            item = object()
+            entries[grid.insert(rect, item)] = (rect, item)
+        elif action < 0.8:
+            key = rng.choice(list(entries))
+            rect = random_rect(rng)
+            grid.move(key, rect)
+            entries[key] = (rect, entries[key][1])
+        else:
+            key = rng.choice(list(entries))
+            grid.remove(key)
+            del entries[key]
+
+        if step % 10 == 0:
+            query = random_rect(rng)
+            found = grid.query(query)
+            expected = brute_force(entries, query)
+            # The grid may return extra near items, in the same order
+            bounds = {id(item): rect for rect, item in entries.values()}
+            assert [item for item in found if bounds[id(item)].colliderect(query)] == expected
+            assert len(found) == len(set(map(id, found)))
+    assert len(grid) == len(entries)
+
+
+def test_caller_keys_set_query_order():
+    grid = SpatialGrid(64)
+    rects = [pygame.Rect(i * 10, 0, 10, 10) for i in range(5)]
+    for key in (3, 0, 4, 1, 2):
+        grid.insert(rects[key], key=key)
+    assert grid.query(pygame.Rect(0, 0, 50, 10)) == rects
+
+
+def test_removed_entries_leave_no_cells():
+    grid = SpatialGrid(32)
+    keys = [grid.insert(pygame.Rect(i * 40, 0, 100, 100)) for i in range(10)]
+    for key in keys:
+        grid.remove(key)
+    assert not grid.cells and len(grid) == 0
+
+
+class Platform(pygame.sprite.Sprite):
+    def __init__(self, x, y, velocity=(0, 0)):
+        super().__init__()
+        self.rect = pygame.Rect(x, y, 32, 32)
+        self.velocity = velocity
+
+    def update(self):
+        self.rect.move_ip(self.velocity)
+
+
+def test_platform_moved_by_update_is_found_at_its_new_cell():
+    moving = Platform(10, 10, velocity=(500, 300))
+    still = Platform(200, 10)
+    group = PlatformGroup(still, moving, cell_size=64)
+    old = pygame.Rect(moving.rect)
+
+    group.update()
+
+    assert group.platforms.query(moving.rect) == [moving.rect]
+    assert group.platforms.query(old) == []
+    assert group.platforms.query(still.rect) == [still.rect]
+
+
+def test_platform_leaving_the_group_leaves_the_grid():
+    platforms = [Platform(40 * i, 0) for i in range(4)]
+    group = PlatformGroup(*platforms, cell_size=64)
+    platforms[1].kill()
+    assert group.platforms.query(pygame.Rect(0, 0, 160, 32)) == [
+        platforms[0].rect, platforms[2].rect, platforms[3].rect
+    ]
+    group.empty()
+    assert not group.platforms.cells